@@ -0,0 +1,103 @@
+"""
+Raw-extract aggregation: serial streaming fold vs the multi-process engine.
+
+    python benchmarks/bench_aggregate.py                       # 1, 2, 4, ... up to every core
+    python benchmarks/bench_aggregate.py --scale 200 --workers 1 8 16 32
+
+A synthetic raw extract is generated by splitting every district x month row
+of the shipped table into `--scale` daily rows (same totals) spread over a
+few pincodes, so the aggregated output (rolled up to districts) can be
+checked against a known answer. Speedup is
+reported against the single-process streaming fold, and every run must
+produce exactly the same table.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pipeline.aggregate import (  # noqa: E402
+    aggregate_district_month, aggregate_stream, derive_state_metrics, state_from_district,
+)
+from pipeline.parallel import aggregate_parallel  # noqa: E402
+from pipeline.reader import iter_raw_chunks  # noqa: E402
+from pipeline.schema import COUNT_COLS, DATA_DIR, DISTRICT_CSV, DISTRICT_KEYS  # noqa: E402
+
+
+def synthetic_raw(scale, out_dir, seed=0):
+    base = pd.read_csv(os.path.join(DATA_DIR, DISTRICT_CSV))
+    rng = np.random.default_rng(seed)
+    raw = base.loc[base.index.repeat(scale)].reset_index(drop=True)
+    for col in COUNT_COLS:
+        # integer split of each monthly total across `scale` rows
+        total = base[col].to_numpy(dtype=np.int64)
+        w = rng.random((len(base), scale))
+        parts = np.floor(w / w.sum(axis=1, keepdims=True) * total[:, None]).astype(np.int64)
+        parts[:, 0] += total - parts.sum(axis=1)
+        raw[col] = parts.ravel().astype(np.float64)
+    days = pd.to_timedelta(rng.integers(0, 28, len(raw)), unit="D")
+    raw["date"] = (pd.to_datetime(raw["month"]) + days).dt.strftime("%Y-%m-%d")
+    # a few pincodes per district, plus some rows without one
+    raw["pincode"] = rng.integers(110000, 110004, len(raw)).astype(np.float64)
+    raw.loc[rng.random(len(raw)) < 0.05, "pincode"] = np.nan
+    raw = raw.sample(frac=1, random_state=seed)
+    path = os.path.join(out_dir, f"raw_x{scale}.csv")
+    raw[["date", "state", "district", "pincode"] + COUNT_COLS].to_csv(path, index=False)
+    return path
+
+
+def canonical(df):
+    """Pincode-level aggregate -> district rows in a fixed order."""
+    df = aggregate_district_month(df)
+    return df.sort_values(DISTRICT_KEYS).reset_index(drop=True)[DISTRICT_KEYS + COUNT_COLS]
+
+
+def timed(fn, repeat):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=50, help="raw rows per district x month row")
+    parser.add_argument("--workers", type=int, nargs="+", help="worker counts to try")
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--min-shard-mb", type=float, default=1.0,
+                        help="smallest shard per process (the pipeline default is 16 MB)")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores} | {cores})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = synthetic_raw(args.scale, tmp)
+        size = os.path.getsize(path) / (1024 * 1024)
+        print(f"raw: {size:,.1f} MB, scale x{args.scale}, {cores} cores")
+
+        t_serial, expected = timed(lambda: aggregate_stream(iter_raw_chunks(path, args.chunksize)), args.repeat)
+        expected = canonical(expected)
+        t_derive, _ = timed(lambda: derive_state_metrics(state_from_district(expected)), args.repeat)
+        print(f"  serial stream   {t_serial:8.2f} s   ({size / t_serial:6.1f} MB/s)")
+        print(f"  derive pass     {t_derive * 1000:8.1f} ms")
+
+        for n in workers:
+            t, got = timed(lambda: aggregate_parallel(
+                path, n, args.chunksize, min_shard_bytes=int(args.min_shard_mb * 1024 * 1024)), args.repeat)
+            same = canonical(got).equals(expected)
+            print(f"  {n:3d} workers     {t:8.2f} s   ({size / t:6.1f} MB/s)   "
+                  f"speedup {t_serial / t:5.2f}x   identical={same}")
+
+
+if __name__ == "__main__":
+    main()
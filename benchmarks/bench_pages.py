@@ -0,0 +1,196 @@
+"""
+Headless render benchmark for the four dashboard pages.
+
+    python benchmarks/bench_pages.py                       # 10x, 100x, 1000x
+    python benchmarks/bench_pages.py --scales 1 10 --json pages.json
+
+For every scale a synthetic copy of data/ is written (the state and district
+tables replicated with suffixed state / district names, so key counts grow
+with the data), and each page of dashboard/app.py is run through
+Streamlit's AppTest in a fresh process pointed at it (UIDAI_DATA_DIR).
+After a warm-up run that builds the store and fills the caches, every
+page is run twice: once for wall time and once under tracemalloc for
+peak memory. A page with lazy sections (views.lazy_expander) gets a
+second, "expanded" pass with every such section open, since the default
+"collapsed" pass renders only the charts above the fold.
+
+Per widget (one row per st.plotly_chart call):
+  prep     wall time since the previous chart (data prep + figure build)
+  render   time inside st.plotly_chart (serialization)
+  peak     tracemalloc peak over the same segment
+  payload  size of the figure JSON sent to the browser
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+APP_PATH = os.path.join(ROOT_DIR, "dashboard", "app.py")
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+
+PAGES = ["🇮🇳 India Overview", "🏙️ State Deep Dive", "📍 District Drilldown", "👥 Age Migration"]
+TABLES = {"state": "dashboard_state_month.csv", "district": "dashboard_district_month.csv"}
+
+MB = 1024 * 1024
+
+
+# -----------------------------
+# Synthetic data
+# -----------------------------
+def write_scaled_data(scale, out_dir):
+    """data/ with both tables replicated `scale` times under suffixed names."""
+    os.makedirs(out_dir, exist_ok=True)
+    for key, name in TABLES.items():
+        base = pd.read_csv(os.path.join(DATA_DIR, name))
+        parts = []
+        for i in range(scale):
+            part = base.copy()
+            if i:
+                part[key] = part[key] + f" #{i}"
+            parts.append(part)
+        pd.concat(parts, ignore_index=True).to_csv(os.path.join(out_dir, name), index=False)
+    return out_dir
+
+
+# -----------------------------
+# Instrumented run (child process)
+# -----------------------------
+class ChartProbe:
+    """Wraps st.plotly_chart and records one row per chart."""
+
+    def __init__(self):
+        import plotly.io as pio
+        import streamlit as st
+        from streamlit.delta_generator import DeltaGenerator
+
+        self.trace_memory = False
+        self.rows = []
+        self.mark = time.perf_counter()
+        orig = DeltaGenerator.plotly_chart
+        probe = self
+
+        def plotly_chart(dg, figure_or_data, *args, **kwargs):
+            t0 = time.perf_counter()
+            peak = tracemalloc.get_traced_memory()[1] if probe.trace_memory else 0
+            out = orig(dg, figure_or_data, *args, **kwargs)
+            t1 = time.perf_counter()
+            title = getattr(getattr(figure_or_data, "layout", None), "title", None)
+            probe.rows.append({
+                "widget": (getattr(title, "text", None) or f"chart {len(probe.rows) + 1}")[:48],
+                "prep_ms": (t0 - probe.mark) * 1000,
+                "render_ms": (t1 - t0) * 1000,
+                "peak_mb": peak / MB,
+                "payload_kb": len(pio.to_json(figure_or_data, validate=False)) / 1024,
+            })
+            if probe.trace_memory:
+                tracemalloc.reset_peak()
+            probe.mark = time.perf_counter()
+            return out
+
+        DeltaGenerator.plotly_chart = plotly_chart
+        st.plotly_chart = lambda *a, **k: plotly_chart(st._main, *a, **k)
+
+    def start(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.rows = []
+        if self.trace_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        self.mark = time.perf_counter()
+
+
+def run_page(probe, page, trace_memory, open_sections=()):
+    """(wall s, peak MB, chart rows, keys of the lazy sections on the page)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=3600)
+    at.session_state["page"] = page
+    for key in open_sections:
+        at.session_state[key] = True
+    probe.start(trace_memory)
+    t0 = time.perf_counter()
+    at.run()
+    wall = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] / MB if trace_memory else 0.0
+    if trace_memory:
+        tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    lazy = [e.key for e in at.expander if (getattr(e, "key", None) or "").startswith("lazy.")]
+    return wall, peak, probe.rows, lazy
+
+
+def measure(probe, page, sections, open_sections=()):
+    """One row of the report, plus the lazy section keys found on the page."""
+    wall, _, rows, lazy = run_page(probe, page, trace_memory=False, open_sections=open_sections)
+    _, peak, mem_rows, _ = run_page(probe, page, trace_memory=True, open_sections=open_sections)
+    for row, mem in zip(rows, mem_rows):
+        row["peak_mb"] = mem["peak_mb"]
+    return {"page": page, "sections": sections, "wall_ms": wall * 1000, "peak_mb": peak, "widgets": rows}, lazy
+
+
+def child(scale):
+    probe = ChartProbe()
+    t0 = time.perf_counter()
+    run_page(probe, PAGES[0], trace_memory=False)     # builds the store, fills caches
+    warmup = time.perf_counter() - t0
+    result = {"scale": scale, "warmup_s": warmup, "pages": []}
+    for page in PAGES:
+        collapsed, lazy = measure(probe, page, "collapsed")
+        result["pages"].append(collapsed)
+        if lazy:
+            run_page(probe, page, trace_memory=False, open_sections=lazy)    # fills their caches
+            result["pages"].append(measure(probe, page, "expanded", lazy)[0])
+    print(json.dumps(result))
+
+
+# -----------------------------
+# Report
+# -----------------------------
+def report(result):
+    print(f"\nx{result['scale']}  (warm-up incl. store build: {result['warmup_s']:.1f} s)")
+    for p in result["pages"]:
+        print(f"  {p['page']:<24} {p['sections']:<9} {p['wall_ms']:9.1f} ms  peak {p['peak_mb']:8.1f} MB")
+        for w in p["widgets"]:
+            print(f"      {w['widget']:<48} prep {w['prep_ms']:8.1f} ms  render {w['render_ms']:7.1f} ms  "
+                  f"peak {w['peak_mb']:7.1f} MB  payload {w['payload_kb']:8.1f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--json", help="also write all results to this file")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child)
+        return
+
+    results = []
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = write_scaled_data(scale, os.path.join(tmp, "data"))
+            env = dict(os.environ, UIDAI_DATA_DIR=data_dir)
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", str(scale)],
+                env=env, check=True, capture_output=True, text=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+        report(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Resident memory per additional dashboard session.
+
+    python benchmarks/bench_sessions.py
+    python benchmarks/bench_sessions.py --sessions 24 --page "📍 District Drilldown"
+    python benchmarks/bench_sessions.py --app /path/to/other/app.py   # A/B against another checkout
+
+Opens `--sessions` AppTest sessions in one process (as the Streamlit server
+does for concurrent users: shared module and cache_resource state, one
+session state each), keeps them all alive, and reports process RSS after
+each session's first run. The first session pays for imports and loading
+the data; what matters is the slope after it.
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+APP_PATH = os.path.join(ROOT_DIR, "dashboard", "app.py")
+sys.path.insert(0, os.path.join(ROOT_DIR, "dashboard"))
+
+from memstats import rss_bytes  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default=APP_PATH)
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--page", default="🇮🇳 India Overview")
+    args = parser.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    sessions, rss = [], []
+    for i in range(args.sessions):
+        at = AppTest.from_file(os.path.abspath(args.app), default_timeout=600)
+        at.session_state["page"] = args.page
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        sessions.append(at)
+        gc.collect()
+        rss.append(rss_bytes())
+        print(f"  session {i + 1:>3}: rss {rss[-1] / 1e6:8.1f} MB")
+
+    steps = [b - a for a, b in zip(rss[1:], rss[2:])]
+    if steps:
+        print(f"first session: {rss[0] / 1e6:.1f} MB; per additional session: "
+              f"median {statistics.median(steps) / 1e6:.2f} MB, "
+              f"mean {(rss[-1] - rss[1]) / len(steps) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
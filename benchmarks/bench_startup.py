@@ -0,0 +1,92 @@
+"""
+Cold start and rerun latency of the dashboard script.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --app /path/to/other/app.py   # A/B against another checkout
+
+For each page, a fresh Python process imports Streamlit's AppTest and runs
+the app once (cold: module imports, CSS / logo setup, cached loaders from a
+warm store, first render). The same session is then rerun `--reruns` times
+(what every widget interaction costs) and switched to the next page once
+(a navigation click). The store is built beforehand, so data loading from
+scratch is not part of the numbers.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+APP_PATH = os.path.join(ROOT_DIR, "dashboard", "app.py")
+
+PAGES = ["🇮🇳 India Overview", "🏙️ State Deep Dive", "📍 District Drilldown", "👥 Age Migration"]
+
+
+def child(app, page, reruns):
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    t_import = time.perf_counter() - t0
+
+    at = AppTest.from_file(app, default_timeout=600)
+    at.session_state["page"] = page
+    t0 = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    times = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+
+    nxt = PAGES[(PAGES.index(page) + 1) % len(PAGES)]
+    at.session_state["page"] = nxt
+    t0 = time.perf_counter()
+    at.run()
+    switch = time.perf_counter() - t0
+
+    print(json.dumps({
+        "page": page, "streamlit_import_s": t_import, "cold_s": cold,
+        "rerun_ms": statistics.median(times) * 1000 if times else None,
+        "switch_to": nxt, "switch_ms": switch * 1000,
+    }))
+
+
+def warm_store(app):
+    # Build the columnar store / geo layers once so every run reads warm caches.
+    subprocess.run([sys.executable, os.path.abspath(__file__), "--app", app, "--child", PAGES[0], "--reruns", "0"],
+                   check=True, capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default=APP_PATH)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    app = os.path.abspath(args.app)
+
+    if args.child:
+        child(app, args.child, args.reruns)
+        return
+
+    warm_store(app)
+    print(f"{app}")
+    print(f"  {'page':<24} {'cold':>9} {'rerun':>10} {'switch':>10}")
+    for page in PAGES:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--app", app, "--child", page, "--reruns", str(args.reruns)],
+            check=True, capture_output=True, text=True,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"  {page:<24} {r['cold_s'] * 1000:7.0f} ms {r['rerun_ms']:7.1f} ms {r['switch_ms']:7.1f} ms"
+              f"   (-> {r['switch_to']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold-load time and resident memory: CSV path vs the columnar store.
+
+    python benchmarks/bench_storage.py              # shipped tables
+    python benchmarks/bench_storage.py --scale 100  # district table x100
+
+Scaled runs replicate the district table with suffixed district names, which
+mimics moving toward pincode-level granularity (more distinct keys, more rows).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+
+from datastore import apply_schema, csv_path  # noqa: E402
+
+
+def old_csv_load(path):
+    # Exactly what load_*_month() did before the store existed.
+    df = pd.read_csv(path)
+    df["month"] = pd.to_datetime(df["month"], errors="coerce")
+    return df
+
+
+def scaled_district_csv(scale, out_dir):
+    base = pd.read_csv(csv_path("district_month"))
+    parts = []
+    for i in range(scale):
+        part = base.copy()
+        if i:
+            part["district"] = part["district"] + f" #{i}"
+        parts.append(part)
+    path = os.path.join(out_dir, f"district_month_x{scale}.csv")
+    pd.concat(parts, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def bench(name, path, out_dir, repeat):
+    pq = os.path.join(out_dir, f"{name}.parquet")
+    apply_schema(name, pd.read_csv(path)).to_parquet(pq, index=False, compression="zstd")
+
+    t_csv, df_csv = timed(lambda: old_csv_load(path), repeat)
+    t_pq, df_pq = timed(lambda: pd.read_parquet(pq), repeat)
+
+    mb = 1024 * 1024
+    mem_csv = df_csv.memory_usage(deep=True).sum() / mb
+    mem_pq = df_pq.memory_usage(deep=True).sum() / mb
+    print(f"{name}: {len(df_csv):,} rows")
+    print(f"  file      csv {os.path.getsize(path) / mb:8.2f} MB   parquet {os.path.getsize(pq) / mb:8.2f} MB")
+    print(f"  load      csv {t_csv * 1000:8.1f} ms   parquet {t_pq * 1000:8.1f} ms   ({t_csv / t_pq:.1f}x)")
+    print(f"  resident  csv {mem_csv:8.2f} MB   parquet {mem_pq:8.2f} MB   ({mem_csv / mem_pq:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="replicate the district table N times")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench("state_month", csv_path("state_month"), tmp, args.repeat)
+        dist = csv_path("district_month") if args.scale == 1 else scaled_district_csv(args.scale, tmp)
+        bench("district_month", dist, tmp, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
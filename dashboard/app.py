@@ -1,11 +1,8 @@
 
+import os
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import json
-import os
-import plotly.express as px
-import plotly.graph_objects as go
 
 # =============================
 # PAGE CONFIG (DO NOT TOUCH)
@@ -17,227 +14,73 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# App shell only: data, sidebar, header and navigation. Each page lives in
+# views/ and is imported on first use; CSS and the logo are built once per
+# process in theme.py.
+from streamlit.runtime.scriptrunner import get_script_run_ctx  # noqa: E402
 
-# =============================
-# STABLE 4K DARK + NEON CSS
-# =============================
-st.markdown("""
-<style>
-
-/* ===== GLOBAL BACKGROUND ===== */
-.stApp{
-    background:
-        radial-gradient(circle at 15% 20%, rgba(0,245,255,0.08), transparent 40%),
-        radial-gradient(circle at 85% 80%, rgba(124,255,0,0.06), transparent 45%),
-        #050810;
-    color: #EAF0FF;
-}
-
-/* ===== MAIN CONTENT ===== */
-.block-container{
-    padding-top: 1rem;
-    padding-bottom: 2rem;
-        
-}
-/* Force sidebar always visible on Streamlit Cloud */
-section[data-testid="stSidebar"] {
-    transform: translateX(0px) !important;
-    visibility: visible !important;
-    opacity: 1 !important;
-}
-
-
-
-/* ===== SIDEBAR (ALWAYS VISIBLE) ===== */
-section[data-testid="stSidebar"]{
-    background: rgba(12,16,28,0.96);
-    border-right: 1px solid rgba(0,245,255,0.15);
-    box-shadow: 6px 0px 28px rgba(0,0,0,0.6);
-    min-width: 320px !important;
-    max-width: 320px !important;
-}
-
-/* ===== SIDEBAR TEXT ===== */
-section[data-testid="stSidebar"] h2{
-    color: #EAF0FF;
-    font-size: 18px;
-}
-section[data-testid="stSidebar"] label{
-    color: rgba(234,240,255,0.8);
-}
-
-/* ===== BUTTONS ===== */
-.stButton > button{
-    background: rgba(255,255,255,0.04);
-    border: 1px solid rgba(0,245,255,0.18);
-    border-radius: 14px;
-    color: #EAF0FF;
-    padding: 0.6rem 1rem;
-    transition: 0.2s ease;
-}
-.stButton > button:hover{
-    border-color: rgba(0,245,255,0.35);
-    box-shadow: 0 0 18px rgba(0,245,255,0.15);
-    transform: translateY(-1px);
-}
-
-/* ===== METRIC CARDS ===== */
-div[data-testid="stMetric"]{
-    background: rgba(255,255,255,0.04);
-    border: 1px solid rgba(255,255,255,0.08);
-    border-radius: 16px;
-    padding: 14px;
-}
-div[data-testid="stMetric"] *{
-    color: #EAF0FF !important;
-}
-
-/* ===== PLOTLY FIX ===== */
-.js-plotly-plot .plotly,
-.js-plotly-plot .plotly div{
-    background: transparent !important;
-}
-
-
-
-
-
-/* -----------------------------
-   FIX: Layout should NOT shift when sidebar collapses
------------------------------ */
-
-/* Remove the extra blank space that appears when sidebar closes */
-section.main > div {
-    padding-left: 2rem !important;
-    padding-right: 2rem !important;
-}
-
-/* Force page width to remain stable */
-.block-container {
-    max-width: 1400px !important;
-    margin: auto !important;
-}
-
-/* Fix sidebar collapse pushing content */
-[data-testid="stSidebar"][aria-expanded="false"] ~ div .block-container {
-    padding-left: 2rem !important;
-    padding-right: 2rem !important;
-}
-
-}
-
-</style>
-""", unsafe_allow_html=True)
-
-
-
-
-
-
-# -----------------------------
-# Load Data (PATH FIXED)
-# -----------------------------
-
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-@st.cache_data
-def load_state_month():
-    path = os.path.join(BASE_DIR, "..", "data", "dashboard_state_month.csv")
-    df = pd.read_csv(path)
-    df["month"] = pd.to_datetime(df["month"], errors="coerce")
-    return df
+from loaders import (  # noqa: E402
+    load_dataset_version, load_figure_cache, load_render_pool, load_session_memory, load_slicers,
+    load_state_cube,
+)
+from perf import configure_logging, finish_run, start_run, timer  # noqa: E402
+from theme import CSS, header_html  # noqa: E402
+from views import DEFAULT_PAGE, PageContext, load_page  # noqa: E402
 
-@st.cache_data
-def load_district_month():
-    path = os.path.join(BASE_DIR, "..", "data", "dashboard_district_month.csv")
-    df = pd.read_csv(path)
-    df["month"] = pd.to_datetime(df["month"], errors="coerce")
-    return df
+# Timings for this rerun (see perf.py); logged as JSON when UIDAI_PERF_LOG is set
+configure_logging()
+run = start_run()
 
-@st.cache_data
-def load_geojson():
-    path = os.path.join(BASE_DIR, "india_states.geojson")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+st.markdown(CSS, unsafe_allow_html=True)
 
+with timer("load"):
+    state_cube = load_state_cube()
+    state_slicer, dist_slicer = load_slicers()
 
-state_df = load_state_month()
-dist_df = load_district_month()
-india_geo = load_geojson()
 
-# -----------------------------
-# Logo Setup (MUST be before header)
-# -----------------------------
-import base64
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-def get_base64(path):
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
-logo_path = os.path.join(BASE_DIR, "..", "assets", "aadhaar_transparent.png")
-logo_base64 = get_base64(logo_path)
-
-# -----------------------------
-# Sidebar Navigation (FINAL)
-# -----------------------------
-chosen_state = None
-chosen_district = None
-# =============================
-# SIDEBAR NAVIGATION (ONLY ONE)
-# =============================
+def set_page(page_name):
+    st.session_state.page = page_name
 
 
+if "page" not in st.session_state:
+    st.session_state.page = DEFAULT_PAGE
 
 # -----------------------------
 # Navigation (Buttons 2x2)
 # -----------------------------
+# on_click runs before the rerun, so the whole script (sidebar filters
+# included) already sees the new page.
 st.sidebar.markdown("## 🧭 Navigation")
 
 row1 = st.sidebar.columns(2)
 row2 = st.sidebar.columns(2)
 
 with row1[0]:
-    india_btn = st.sidebar.button("🇮🇳 India", use_container_width=True)
+    st.sidebar.button("🇮🇳 India", use_container_width=True,
+                      on_click=set_page, args=("🇮🇳 India Overview",))
 
 with row1[1]:
-    state_btn = st.sidebar.button("🏙️ State", use_container_width=True)
+    st.sidebar.button("🏙️ State", use_container_width=True,
+                      on_click=set_page, args=("🏙️ State Deep Dive",))
 
 with row2[0]:
-    dist_btn = st.sidebar.button("📍 District", use_container_width=True)
+    st.sidebar.button("📍 District", use_container_width=True,
+                      on_click=set_page, args=("📍 District Drilldown",))
 
 with row2[1]:
-    age_btn = st.sidebar.button("👥 Age", use_container_width=True)
-
-if "page" not in st.session_state:
-    st.session_state.page = "🇮🇳 India Overview"
-
-if india_btn:
-    st.session_state.page = "🇮🇳 India Overview"
-elif state_btn:
-    st.session_state.page = "🏙️ State Deep Dive"
-elif dist_btn:
-    st.session_state.page = "📍 District Drilldown"
-elif age_btn:
-    st.session_state.page = "👥 Age Migration"
+    st.sidebar.button("👥 Age", use_container_width=True,
+                      on_click=set_page, args=("👥 Age Migration",))
 
 page = st.session_state.page
 st.sidebar.markdown("---")
 
-
-
-
-
-
 # -----------------------------
 # Time Filter (FINAL)
 # -----------------------------
 st.sidebar.markdown("## ⏳ Time Window")
 
-min_m = state_df["month"].min()
-max_m = state_df["month"].max()
+min_m = state_slicer.min_month
+max_m = state_slicer.max_month
 
 preset = st.sidebar.selectbox(
     "Quick Preset",
@@ -264,16 +107,10 @@ time_range = st.sidebar.slider(
 
 st.sidebar.caption(f"📅 **{time_range[0].date()} → {time_range[1].date()}**")
 
-# Apply global filters
-state_df_f = state_df[
-    (state_df["month"] >= pd.to_datetime(time_range[0])) &
-    (state_df["month"] <= pd.to_datetime(time_range[1]))
-].copy()
-
-dist_df_f = dist_df[
-    (dist_df["month"] >= pd.to_datetime(time_range[0])) &
-    (dist_df["month"] <= pd.to_datetime(time_range[1]))
-].copy()
+ctx = PageContext(state_cube, state_slicer, dist_slicer, time_range,
+                  version=load_dataset_version(), figures=load_figure_cache(), pool=load_render_pool())
+with timer("import.page"):
+    view = load_page(page)
 
 st.sidebar.markdown("---")
 
@@ -281,961 +118,71 @@ st.sidebar.markdown("---")
 # Page Specific Filters (FINAL)
 # -----------------------------
 st.sidebar.markdown("## 🎛️ Filters")
-
-if page == "🏙️ State Deep Dive":
-    with st.sidebar.expander("🏙️ State Filter", expanded=True):
-        states = sorted(state_df_f["state"].dropna().unique())
-        chosen_state = st.selectbox("Select State/UT", states)
-
-elif page == "📍 District Drilldown":
-    with st.sidebar.expander("📍 District Filter", expanded=True):
-        states = sorted(dist_df_f["state"].dropna().unique())
-        chosen_state = st.selectbox("Select State/UT", states)
-
-        districts = sorted(
-            dist_df_f[dist_df_f["state"] == chosen_state]["district"].dropna().unique()
-        )
-        chosen_district = st.selectbox("Select District", districts)
-
-elif page == "👥 Age Migration":
-    with st.sidebar.expander("👥 Demographics Filter", expanded=True):
-        states = sorted(state_df_f["state"].dropna().unique())
-        chosen_state = st.selectbox("Select State/UT", ["All India"] + states)
-
+with timer("filters"):
+    view.filters(ctx)
 st.sidebar.markdown("---")
 
 # -----------------------------
 # Sidebar Live Snapshot
 # -----------------------------
 st.sidebar.markdown("## ⚡ Live Snapshot")
-st.sidebar.metric("States/UTs", f"{state_df_f['state'].nunique()}")
-st.sidebar.metric("Total Activity", f"{state_df_f['activity_total'].sum():,.0f}")
+snapshot = state_cube.kpis(ctx.win_lo, ctx.win_hi)
+st.sidebar.metric("States/UTs", f"{snapshot['states_covered']}")
+st.sidebar.metric("Total Activity", f"{snapshot['total_activity']:,.0f}")
 
-# -----------------------------
-# Header
-# -----------------------------
 # -----------------------------
 # HEADER (FINAL CLEAN)
 # -----------------------------
-# -----------------------------
-# HEADER (FINAL CLEAN)
-# -----------------------------
-import base64
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-def get_base64(path):
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
-# ✅ Correct path: assets folder is outside dashboard
-logo_path = os.path.join(BASE_DIR, "..", "assets", "aadhaar_transparent.png")
-
-# ✅ create logo_base64 FIRST
-logo_base64 = get_base64(logo_path)
-
-st.markdown("""
-<style>
-.header-wrap{
-    display:flex;
-    justify-content:center;
-    align-items:center;
-    gap:18px;
-    padding:10px 0px 6px 0px;
-    margin-bottom:10px;
-}
-
-.header-logo img{
-    height:65px;
-    width:auto;
-    background:transparent !important;
-    border:none !important;
-    outline:none !important;
-    box-shadow:none !important;
-    filter: drop-shadow(0px 0px 10px rgba(0,245,255,0.22));
-}
-
-.header-text{
-    display:flex;
-    flex-direction:column;
-    justify-content:center;
-    align-items:flex-start;
-}
-
-.header-title{
-    font-size:48px;
-    font-weight:900;
-    color:#E6EAF2;
-    line-height:1.05;
-    margin:0;
-}
-
-.header-sub{
-    font-size:14px;
-    color:rgba(230,234,242,0.70);
-    margin-top:4px;
-}
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown(f"""
-<div class="header-wrap">
-    <div class="header-logo">
-        <img src="data:image/png;base64,{logo_base64}">
-    </div>
-    <div class="header-text">
-        <div class="header-title">UIDAI Migration & Urbanization Tracker</div>
-        <div class="header-sub">Migration Proxy + Urbanization Hotspots | UIDAI Hackathon 2026</div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
-
+st.markdown(header_html(), unsafe_allow_html=True)
 
 # -----------------------------
 # TOP NAVIGATION BAR (1 x 4 Tiles)
 # -----------------------------
-st.markdown("""
-<style>
-.nav-btn button{
-    width:100%;
-    border-radius:16px !important;
-    border: 1px solid rgba(255,255,255,0.10) !important;
-    background: rgba(255,255,255,0.06) !important;
-    color: rgba(230,234,242,0.92) !important;
-    font-weight: 700 !important;
-    padding: 10px 14px !important;
-    transition: 0.2s ease-in-out;
-}
-
-.nav-btn button:hover{
-    background: rgba(255,255,255,0.10) !important;
-    border: 1px solid rgba(255,255,255,0.18) !important;
-}
-
-.nav-active button{
-    background: rgba(255,255,255,0.14) !important;
-    border: 1px solid rgba(255,255,255,0.22) !important;
-}
-</style>
-""", unsafe_allow_html=True)
-
-# Default page
-if "page" not in st.session_state:
-    st.session_state.page = "🇮🇳 India Overview"
-
 col1, col2, col3, col4 = st.columns(4)
 
+
 def nav_button(label, page_name, col):
     active_class = "nav-active" if st.session_state.page == page_name else ""
     with col:
         st.markdown(f"<div class='nav-btn {active_class}'>", unsafe_allow_html=True)
-        clicked = st.button(label, use_container_width=True)
+        st.button(label, use_container_width=True, on_click=set_page, args=(page_name,))
         st.markdown("</div>", unsafe_allow_html=True)
 
-    if clicked:
-        st.session_state.page = page_name
 
 nav_button("🇮🇳 India Overview", "🇮🇳 India Overview", col1)
 nav_button("🏙️ State Deep Dive", "🏙️ State Deep Dive", col2)
 nav_button("📍 District Drilldown", "📍 District Drilldown", col3)
 nav_button("👥 Age Migration", "👥 Age Migration", col4)
 
-page = st.session_state.page
-
-
-
-
-# ============================
-# 🇮🇳 INDIA OVERVIEW PAGE
-# ============================
-if page == "🇮🇳 India Overview":
-
-    st.markdown("## 🗺️ India Overview: Migration & Urbanization Signals (Proxy)")
-
-    # KPIs
-    total_activity = state_df_f["activity_total"].sum()
-    avg_growth = state_df_f["growth_pct"].mean()
-    states_covered = state_df_f["state"].nunique()
-
-    rank_tmp = (
-        state_df_f.groupby("state", as_index=False)
-        .agg(avg_migration=("migration_index", "mean"))
-    )
-    pos_pct = (rank_tmp["avg_migration"] > 0).mean() * 100
-
-    c1, c2, c3, c4 = st.columns(4)
-    c1.metric("📌 Total Activity", f"{total_activity:,.0f}")
-    c2.metric("📌 States with + Migration Signal", f"{pos_pct:.1f}%")
-    c3.metric("📌 Avg Growth %", f"{avg_growth*100:.2f}%")
-    c4.metric("🗺️ States/UTs Covered", f"{states_covered}")
-
-    st.divider()
-
-    # Ranking table
-    rank = (
-        state_df_f.groupby("state", as_index=False)
-        .agg(
-            avg_migration=("migration_index", "mean"),
-            total_activity=("activity_total", "sum"),
-            avg_growth=("growth_pct", "mean"),
-        )
-        .sort_values("avg_migration", ascending=False)
-    )
-
-    # -----------------------------
-    # GEOJSON FIX (Missing states)
-    # -----------------------------
-    geo_states = set([f["properties"]["NAME_1"] for f in india_geo["features"]])
-    rank["state_map"] = rank["state"]
-
-    fix_map = {
-    # UTs / name variants
-    "Andaman and Nicobar Islands": "Andaman and Nicobar",
-    "Dadra and Nagar Haveli and Daman and Diu": "Dadra and Nagar Haveli",
-    "Puducherry": "Pondicherry",
-    "Pondicherry": "Pondicherry",
-
-    # Delhi variants
-    "Delhi": "Delhi",
-    "NCT of Delhi": "Delhi",
-
-    # Older census naming (common in GeoJSON)
-    "Odisha": "Orissa",
-    "Orissa": "Orissa",
-
-    "Uttarakhand": "Uttaranchal",
-    "Uttaranchal": "Uttaranchal",
-
-    # Some GeoJSONs still have combined/old naming
-    "Jammu & Kashmir": "Jammu and Kashmir",
-    "Jammu and Kashmir": "Jammu and Kashmir",
-    "Ladakh": "Jammu and Kashmir",
-}
-
-
-    rank["state_map"] = rank["state_map"].replace(fix_map)
-
-    missing = sorted(list(set(rank["state_map"].unique()) - geo_states))
-   
-
-    # Choropleth Map
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-    fig_map = px.choropleth(
-        rank,
-        geojson=india_geo,
-        locations="state_map",
-        featureidkey="properties.NAME_1",
-        color="avg_migration",
-        hover_name="state",
-        hover_data={"total_activity":":,.0f", "avg_growth":":.2%"},
-        color_continuous_scale="Turbo",
-        title="India Migration Inflow Signal (Proxy) — State Boundaries"
-    )
-
-    # BLACK outlines
-    fig_map.update_traces(
-        marker_line_width=1.2,
-        marker_line_color="rgba(0,0,0,1)"
-    )
-
-    # Remove white background
-    fig_map.update_geos(
-        fitbounds="locations",
-        visible=False,
-        bgcolor="rgba(0,0,0,0)",
-        showframe=False,
-        showcoastlines=False
-    )
-
-    fig_map.update_layout(
-        height=520,
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        margin=dict(l=0, r=0, t=50, b=0),
-        font=dict(color="#E6EAF2"),
-        coloraxis_colorbar=dict(
-            bgcolor="rgba(0,0,0,0)",
-            outlinecolor="rgba(0,245,255,0.35)"
-        )
-    )
-
-    st.plotly_chart(fig_map, use_container_width=True, config={"scrollZoom": True})
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.divider()
-
-    # Top In vs Out migration
-    left, right = st.columns([0.55, 0.45])
-
-    with left:
-        st.markdown("### 🏆 Top In-Migration States (Proxy)")
-        fig_in = px.bar(
-            rank.head(12),
-            x="avg_migration",
-            y="state",
-            orientation="h",
-            title="Top Positive Migration Index (Z)"
-        )
-        fig_in.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="#E6EAF2"),
-            height=420,
-            margin=dict(l=10, r=10, t=50, b=10)
-        )
-        
-
-
-        st.plotly_chart(fig_in, use_container_width=True)
-
-    with right:
-        st.markdown("### 📉 Top Out-Migration States (Proxy)")
-        fig_out = px.bar(
-            rank.tail(12).sort_values("avg_migration", ascending=True),
-            x="avg_migration",
-            y="state",
-            orientation="h",
-            title="Top Negative Migration Index (Z)"
-        )
-        fig_out.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="#E6EAF2"),
-            height=420,
-            margin=dict(l=10, r=10, t=50, b=10)
-        )
-        
-        st.plotly_chart(fig_out, use_container_width=True)
-
-    st.divider()
-
-    import plotly.graph_objects as go
-
-    st.divider()
-
-    st.markdown("## 🔀 Migration Flow (Proxy): Source → Destination")
-    st.caption(
-    "This Sankey shows a proxy flow model built from migration index signals. "
-    "It does NOT represent actual individual migration routes."
-)
-
-# 1) Prepare state-level migration signal
-    flow_rank = (
-     state_df_f.groupby("state", as_index=False)
-    .agg(mig=("migration_index", "mean"))
-)
-
-# Split into outflow (negative) and inflow (positive)
-    sources = flow_rank[flow_rank["mig"] < 0].copy()
-    targets = flow_rank[flow_rank["mig"] > 0].copy()
-
-# If not enough data
-    if len(sources) < 2 or len(targets) < 2:
-      st.warning("Not enough variation in migration index to generate Sankey flow.")
-    else:
-    # Convert signal strength to positive weights
-     sources["out_strength"] = sources["mig"].abs()
-    targets["in_strength"] = targets["mig"].abs()
+with timer("render"):
+    view.render(ctx)
+    ctx.flush_charts()
 
-    # Take Top-N to keep Sankey clean
-    # Take Top-N to keep Sankey clean (BONUS slider)
-    TOP_N = st.slider("Number of states in flow chart", 5, 15, 10)
+# Per-session memory: session state size and RSS growth (see memstats.py)
+run_ctx = get_script_run_ctx()
+session_id = run_ctx.session_id if run_ctx else None
+session_memory = load_session_memory()
+with timer("memstats"):
+    session_memory.record(session_id, st.session_state)
 
-    sources = sources.sort_values("out_strength", ascending=False).head(TOP_N)
-    targets = targets.sort_values("in_strength", ascending=False).head(TOP_N)
+record = finish_run(run, page=page, session=session_id)
 
-
-    # Normalize weights
-    sources["out_w"] = sources["out_strength"] / sources["out_strength"].sum()
-    targets["in_w"] = targets["in_strength"] / targets["in_strength"].sum()
-
-    # Build proxy flows: each source distributes to each target
-    links = []
-    for _, s in sources.iterrows():
-        for _, t in targets.iterrows():
-            value = float(s["out_w"] * t["in_w"])  # proxy distribution
-            links.append((s["state"], t["state"], value))
-
-    link_df = pd.DataFrame(links, columns=["source", "target", "value"])
-
-    # Scale values for better visualization
-    link_df["value_scaled"] = link_df["value"] * 1000
-
-    # Create Sankey nodes 
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-
-    all_nodes = list(pd.unique(link_df[["source", "target"]].values.ravel()))
-    node_index = {name: i for i, name in enumerate(all_nodes)}
-
-    sankey_source = link_df["source"].map(node_index)
-    sankey_target = link_df["target"].map(node_index)
-    sankey_value = link_df["value_scaled"]
-
-    fig_sankey = go.Figure(
-        data=[
-            go.Sankey(
-                arrangement="snap",
-                node=dict(
-                    pad=18,
-                    thickness=18,
-                    line=dict(color="rgba(0,0,0,0.8)", width=0.6),
-                    label=all_nodes,
-                    color="rgba(0,245,255,0.25)"
-                ),
-                link=dict(
-                    source=sankey_source,
-                    target=sankey_target,
-                    value=sankey_value,
-                    color="rgba(124,255,0,0.18)"
-                ),
-            )
-        ]
-    )
-
-    fig_sankey.update_layout(
-        title="Migration Flow Sankey (Proxy): Outflow → Inflow States",
-        font=dict(color="#E6EAF2"),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        height=650,
-        margin=dict(l=10, r=10, t=60, b=10),
-    )
-    
-    
-    
-    st.plotly_chart(fig_sankey, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # Urbanization Hotspots Scatter
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-
-    st.markdown("### 🌆 Urbanization Hotspots (High Activity + High Migration)")
-    hotspots = rank.copy()
-    hotspots["growth_pct_num"] = hotspots["avg_growth"] * 100
-
-    fig_hot = px.scatter(
-        hotspots,
-        x="total_activity",
-        y="avg_migration",
-        size="total_activity",
-        color="growth_pct_num",
-        hover_name="state",
-        title="Urbanization Hotspots: Activity vs Migration Index",
-        labels={
-            "total_activity": "Total Activity",
-            "avg_migration": "Avg Migration Index (Z)",
-            "growth_pct_num": "Avg Growth %"
-        }
-    )
-
-    fig_hot.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2"),
-        height=520
-    )
-    
-    st.plotly_chart(fig_hot, use_container_width=True)
-    
-
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-    st.divider()
-
-    # India trend
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-
-    st.markdown("### 📆 India Trend")
-    india_trend = (
-        state_df_f.groupby("month", as_index=False)
-        .agg(activity_total=("activity_total", "sum"),
-             migration_index=("migration_index", "mean"))
-    )
-
-    fig3 = px.line(india_trend, x="month", y="activity_total", markers=True)
-    fig3.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2"),
-        title="India-wide Aadhaar Activity Trend"
-    )
-    
-    st.plotly_chart(fig3, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-    st.divider()
-
-    
-
-    # Heatmap
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-
-    st.markdown("### 🌡️ Migration Signal Heatmap (State × Month)")
-    heat_df = state_df_f.groupby(["state", "month"], as_index=False).agg(
-        mig=("migration_index", "mean")
-    )
-
-    heat_pivot = heat_df.pivot(index="state", columns="month", values="mig").fillna(0)
-
-    fig_heat = px.imshow(
-        heat_pivot,
-        aspect="auto",
-        title="Migration Index (Z) Heatmap — State vs Month",
-    )
-
-    fig_heat.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2"),
-        height=650,
-        margin=dict(l=10, r=10, t=60, b=10)
-    )
-    
-
-    st.plotly_chart(fig_heat, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.divider()
-    
-    
-
-
-    # Top Movers
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-    st.markdown("### 🚀 Top Movers (Month-on-Month Change)")
-
-    mom = state_df_f.groupby(["state", "month"], as_index=False).agg(
-        mig=("migration_index", "mean")
-    )
-    mom = mom.sort_values(["state", "month"])
-    mom["mom_change"] = mom.groupby("state")["mig"].diff()
-
-    latest_month = mom["month"].max()
-    mom_latest = mom[mom["month"] == latest_month].dropna(subset=["mom_change"]).copy()
-
-    top_gainers = mom_latest.sort_values("mom_change", ascending=False).head(10)
-    top_losers = mom_latest.sort_values("mom_change", ascending=True).head(10)
-
-    colA, colB = st.columns(2)
-
-    with colA:
-        st.markdown("#### 🟢 Fastest Rising States")
-        fig_gain = px.bar(
-            top_gainers,
-            x="mom_change",
-            y="state",
-            orientation="h",
-            title=f"Top Gainers — {latest_month.date()}",
-        )
-        fig_gain.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="#E6EAF2"),
-            height=420,
-            margin=dict(l=10, r=10, t=60, b=10)
-        )
-        
-        st.plotly_chart(fig_gain, use_container_width=True)
-
-    with colB:
-        st.markdown("#### 🔴 Fastest Falling States")
-        fig_lose = px.bar(
-            top_losers.sort_values("mom_change", ascending=True),
-            x="mom_change",
-            y="state",
-            orientation="h",
-            title=f"Top Losers — {latest_month.date()}",
-        )
-        fig_lose.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="#E6EAF2"),
-            height=420,
-            margin=dict(l=10, r=10, t=60, b=10)
-        )
-        
-        st.plotly_chart(fig_lose, use_container_width=True)
-       
-        st.markdown('</div>', unsafe_allow_html=True)
-
-
-    st.caption("MoM change shows sudden spikes/drops in migration signal (proxy). Useful for detecting emerging hotspots.")
-
-    st.info("⚠️ Migration Index is a proxy based on Aadhaar activity growth patterns (not individual tracking).")
-
-    st.markdown("### ⬇️ Download Clean Data")
-    st.download_button(
-        "Download State-Month CSV",
-        data=state_df.to_csv(index=False),
-        file_name="dashboard_state_month.csv"
-    )
-    st.download_button(
-        "Download District-Month CSV",
-        data=dist_df.to_csv(index=False),
-        file_name="dashboard_district_month.csv"
-    )
-
-# ============================
-# 🏙️ STATE DEEP DIVE
-# ============================
-
-
-
-elif page == "🏙️ State Deep Dive":
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-
-    st.subheader("🏙️ State Deep Dive")
-
-    if chosen_state is None:
-        st.info("Select a state from the sidebar.")
-        st.stop()
-
-    s_df = state_df_f[state_df_f["state"] == chosen_state].copy()
-
-    c1, c2, c3 = st.columns(3)
-    c1.metric("📊 Total Activity", f"{s_df['activity_total'].sum():,.0f}")
-    c2.metric("📌 Avg Migration Index", f"{s_df['migration_index'].mean():.2f}")
-    c3.metric("📈 Avg Growth %", f"{(s_df['growth_pct'].mean()*100):.2f}%")
-
-    st.divider()
-
-    fig = px.line(
-        s_df,
-        x="month",
-        y="activity_total",
-        markers=True,
-        title=f"{chosen_state}: Activity Trend"
-    )
-    fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2")
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-    st.markdown("### 📍 Top Districts by Activity")
-    d_df = dist_df_f[dist_df_f["state"] == chosen_state].copy()
-
-    d_rank = (
-        d_df.groupby("district", as_index=False)
-        .agg(total_activity=("activity_total", "sum"))
-        .sort_values("total_activity", ascending=False)
-        .head(15)
-    )
-
-    fig2 = px.bar(
-        d_rank,
-        x="total_activity",
-        y="district",
-        orientation="h",
-        title="Top Districts (Activity)"
-    )
-    fig2.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2")
-    )
-    
-    st.plotly_chart(fig2, use_container_width=True)
-    
-
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-
-    import plotly.graph_objects as go
-
-    st.divider()
-    st.markdown("### 🔀 State Migration Flow (Proxy)")
-    st.caption(
-        "This Sankey shows a proxy origin/destination flow around the selected state using migration index signals. "
-        "It does NOT represent actual person-level migration routes."
-    )
-
-    flow_rank = (
-        state_df_f.groupby("state", as_index=False)
-        .agg(mig=("migration_index", "mean"))
-    )
-
-    # --- Selected state value ---
-    selected_row = flow_rank[flow_rank["state"] == chosen_state]
-    if selected_row.empty:
-        st.warning("Selected state not found in dataset.")
-        st.stop()
-
-    selected_mig = float(selected_row["mig"].iloc[0])
-
-    # --- Build sources & targets ---
-    sources = flow_rank[flow_rank["mig"] < 0].copy()
-    targets = flow_rank[flow_rank["mig"] > 0].copy()
-
-    TOP_N = st.slider("Number of connected states", 5, 15, 10)
-
-    # --- If all mig values are 0 (or too small) ---
-    if sources.empty and targets.empty:
-        st.warning("⚠️ Sankey cannot be generated because migration_index values are mostly 0 in this time window.")
-        st.info("Try expanding the time range or check if migration_index column has positive/negative values.")
-        st.stop()
-
-    # --- Build link_df ---
-    if selected_mig < 0:
-        # Outflow proxy: selected -> positive states
-        targets = targets.sort_values("mig", ascending=False).head(TOP_N)
-
-        if targets.empty:
-            st.warning("No positive migration states found to connect.")
-            st.stop()
-
-        targets["w"] = targets["mig"].abs()
-        targets["w"] = targets["w"] / targets["w"].sum()
-
-        link_df = pd.DataFrame({
-            "source": [chosen_state] * len(targets),
-            "target": targets["state"].tolist(),
-            "value": (targets["w"] * 1000).tolist()
-        })
-
-        title_flow = f"Outflow Proxy: {chosen_state} → Top Inflow States"
-
-    else:
-        # Inflow proxy: negative states -> selected
-        sources = sources.sort_values("mig", ascending=True).head(TOP_N)
-
-        if sources.empty:
-            st.warning("No negative migration states found to connect.")
-            st.stop()
-
-        sources["w"] = sources["mig"].abs()
-        sources["w"] = sources["w"] / sources["w"].sum()
-
-        link_df = pd.DataFrame({
-            "source": sources["state"].tolist(),
-            "target": [chosen_state] * len(sources),
-            "value": (sources["w"] * 1000).tolist()
-        })
-
-        title_flow = f"Inflow Proxy: Top Outflow States → {chosen_state}"
-
-    # --- Final check ---
-    if link_df.empty:
-        st.warning("Sankey links are empty. Nothing to plot.")
-        st.stop()
-
-    # --- Build Sankey ---
-    nodes = list(pd.unique(link_df[["source", "target"]].values.ravel()))
-    node_index = {name: i for i, name in enumerate(nodes)}
-
-    fig_state_flow = go.Figure(
-    data=[
-        go.Sankey(
-            arrangement="snap",
-            node=dict(
-                pad=18,
-                thickness=18,
-                line=dict(color="rgba(0,0,0,1)", width=0.8),
-                label=nodes,
-
-                # ✅ Neon cyan nodes (like your theme)
-                color="rgba(0,245,255,0.22)",
-            ),
-            link=dict(
-                source=link_df["source"].map(node_index),
-                target=link_df["target"].map(node_index),
-                value=link_df["value"],
-
-                # ✅ Neon green flow (like your theme)
-                color="rgba(124,255,0,0.22)",
+# -----------------------------
+# Performance panel (hidden: open the app with ?perf=1 or set UIDAI_PERF_PANEL=1)
+# -----------------------------
+if st.query_params.get("perf") == "1" or os.environ.get("UIDAI_PERF_PANEL"):
+    with st.sidebar.expander("⚙️ Performance", expanded=False):
+        st.metric("Script run", f"{record['total_ms']:,.0f} ms")
+        st.dataframe(
+            pd.DataFrame(
+                [(name, t["ms"], t["calls"]) for name, t in record["timings"].items()],
+                columns=["timer", "ms", "calls"],
             ),
+            hide_index=True,
+            width="stretch",
         )
-    ]
-    )
-
-    fig_state_flow.update_layout(
-        title=title_flow,
-        font=dict(color="#E6EAF2"),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        height=520,
-        margin=dict(l=10, r=10, t=60, b=10),
-    )
-
-
-    
-    
-    st.plotly_chart(fig_state_flow, use_container_width=True)
-
-
-
-    
-
-# ============================
-# 📍 DISTRICT DRILLDOWN
-# ============================
-elif page == "📍 District Drilldown":
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-
-    st.subheader("📍 District Drilldown (State → District)")
-
-    if chosen_state is None or chosen_district is None:
-        st.info("Select a state and district from the sidebar.")
-        st.stop()
-
-    dd = dist_df_f[
-        (dist_df_f["state"] == chosen_state) &
-        (dist_df_f["district"] == chosen_district)
-    ].copy()
-
-    c1, c2, c3 = st.columns(3)
-    c1.metric("📊 Total Activity", f"{dd['activity_total'].sum():,.0f}")
-    c2.metric("👶 0–5 Total", f"{dd['age_0_5'].sum():,.0f}")
-    c3.metric("🧑 18+ Total", f"{dd['age_18_greater'].sum():,.0f}")
-
-    st.divider()
-
-    fig = px.line(
-        dd,
-        x="month",
-        y="activity_total",
-        markers=True,
-        title=f"{chosen_district}, {chosen_state}: Trend"
-    )
-    fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2")
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-# ============================
-# 👥 AGE MIGRATION
-# ============================
-elif page == "👥 Age Migration":
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-
-
-    st.subheader("👥 Age Activity Insights (Proxy, Not Direct Migration)")
-    st.caption(
-        "This section shows Aadhaar activity by age group. Higher 0–5 does NOT mean kids migrate alone — "
-        "it reflects enrolment/updates linked to family movement & service drives."
-    )
-
-    if chosen_state is None:
-        st.info("Select All India or a state from the sidebar.")
-        st.stop()
-
-    if chosen_state == "All India":
-        temp = state_df_f.groupby("month", as_index=False).agg(
-            age_0_5=("age_0_5", "sum"),
-            age_5_17=("age_5_17", "sum"),
-            age_18_greater=("age_18_greater", "sum"),
-        )
-        title = "India Aadhaar Activity by Age Group (Proxy)"
-    else:
-        temp = (
-            state_df_f[state_df_f["state"] == chosen_state]
-            .groupby("month", as_index=False)
-            .agg(
-                age_0_5=("age_0_5", "sum"),
-                age_5_17=("age_5_17", "sum"),
-                age_18_greater=("age_18_greater", "sum"),
-            )
-        )
-        title = f"{chosen_state} Aadhaar Activity by Age Group (Proxy)"
-
-    long = temp.melt(id_vars="month", var_name="age_group", value_name="count")
-
-    fig = px.line(long, x="month", y="count", color="age_group", markers=True, title=title)
-    fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2"),
-        height=520
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-    st.divider()
-
-    st.markdown("### 🧑‍💼 Working-Age Migration Signal (Proxy)")
-    st.caption("Adult Share % = 18+ / (0–5 + 5–17 + 18+). Higher % suggests stronger working-age movement updates (proxy).")
-
-    temp2 = temp.copy()
-    temp2["total_age_activity"] = temp2["age_0_5"] + temp2["age_5_17"] + temp2["age_18_greater"]
-
-    temp2["adult_share_pct"] = np.where(
-        temp2["total_age_activity"] > 0,
-        (temp2["age_18_greater"] / temp2["total_age_activity"]) * 100,
-        0
-    )
-
-    fig_adult = px.area(
-        temp2,
-        x="month",
-        y="adult_share_pct",
-        markers=True,
-        title="Adult Share % of Aadhaar Activity (18+ / Total) — Migration Proxy"
-    )
-
-    fig_adult.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2"),
-        height=420,
-        yaxis_title="Adult Share (%)",
-        margin=dict(l=10, r=10, t=60, b=10)
-    )
-    
-    st.plotly_chart(fig_adult, use_container_width=True)
-
-    st.divider()
-
-    st.markdown("### 🧩 Age Contribution Share (Proxy)")
-
-    age_totals = {
-        "0–5": float(temp["age_0_5"].sum()),
-        "5–17": float(temp["age_5_17"].sum()),
-        "18+": float(temp["age_18_greater"].sum()),
-    }
-
-    age_share = pd.DataFrame({
-        "age_group": list(age_totals.keys()),
-        "count": list(age_totals.values())
-    })
-
-    fig_age = px.pie(
-        age_share,
-        names="age_group",
-        values="count",
-        hole=0.55,
-        title="Age Group Share in Aadhaar Activity (Proxy)"
-    )
-
-    fig_age.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#E6EAF2"),
-        height=420
-    )
-    
-    st.plotly_chart(fig_age, use_container_width=True)
-    
-
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-    st.success(
-        "Interpretation: Adult Share % rising = stronger working-age movement signal (proxy). "
-        "0–5 spikes often indicate enrolment/service drives + family-linked updates."
-    )
\ No newline at end of file
+        st.json({
+            "counters": record["counters"],
+            "figure_cache": ctx.figures.stats(),
+            "memory": session_memory.stats(session_id),
+        }, expanded=False)
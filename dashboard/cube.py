@@ -0,0 +1,188 @@
+"""
+Precomputed state x month aggregate cube for the India Overview widgets.
+
+Every measure is laid out as a dense (state, month) matrix together with a
+cumulative sum along the month axis (with a leading zero column), so any
+time window [lo, hi) reduces to `cum[:, hi] - cum[:, lo]` per state.
+KPIs, the ranking / choropleth, the Sankey weights, hotspots, trend,
+heatmap and top movers are all read from here instead of re-grouping the
+filtered state table on every rerun.
+
+Means (growth_pct, migration_index and the rolling signals) are kept as a
+sum and a non-null count so they match pandas' NaN-skipping
+`groupby().mean()`.
+"""
+import numpy as np
+import pandas as pd
+
+from perf import timed
+
+
+SUM_COLS = [
+    "activity_total", "enrol_total", "demo_total", "bio_total",
+    "age_0_5", "age_5_17", "age_18_greater",
+]
+MEAN_COLS = ["growth_pct", "migration_index"]
+# Rolling migration-index signals from pipeline/rolling.py; only the ones
+# present in the table get matrices (older exports lack them).
+SIGNAL_COLS = ["mi_roll3", "mi_roll6", "mi_roll12", "mi_ewma", "mi_vol6"]
+
+
+def _cum(mat):
+    out = np.zeros((mat.shape[0], mat.shape[1] + 1), dtype=mat.dtype)
+    np.cumsum(mat, axis=1, out=out[:, 1:])
+    return out
+
+
+class StateMonthCube:
+    def __init__(self, state_df):
+        df = state_df.dropna(subset=["state", "month"])
+
+        self.states = np.array(sorted(df["state"].astype(str).unique()), dtype=object)
+        self.months = np.sort(pd.to_datetime(df["month"]).unique())
+        si = pd.Index(self.states).get_indexer(df["state"].astype(str))
+        mi = pd.Index(self.months).get_indexer(pd.to_datetime(df["month"]))
+        shape = (len(self.states), len(self.months))
+
+        rows = np.zeros(shape, dtype=np.int64)
+        np.add.at(rows, (si, mi), 1)
+        self.rows = rows
+        self.rows_cum = _cum(rows)
+
+        # Index of the latest populated month at or before each month (-1 if none).
+        ar = np.broadcast_to(np.arange(shape[1]), shape)
+        self.last_present = np.maximum.accumulate(np.where(rows > 0, ar, -1), axis=1)
+
+        self.sums, self.sums_cum = {}, {}
+        for col in SUM_COLS:
+            mat = np.zeros(shape, dtype=np.float64)
+            np.add.at(mat, (si, mi), df[col].to_numpy(dtype=np.float64, na_value=0.0))
+            self.sums[col] = mat
+            self.sums_cum[col] = _cum(mat)
+
+        self.mean_sum, self.mean_cnt = {}, {}
+        self.mean_sum_cum, self.mean_cnt_cum = {}, {}
+        self.mean_cols = MEAN_COLS + [c for c in SIGNAL_COLS if c in df.columns]
+        for col in self.mean_cols:
+            vals = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            ok = ~np.isnan(vals)
+            s = np.zeros(shape, dtype=np.float64)
+            c = np.zeros(shape, dtype=np.int64)
+            np.add.at(s, (si[ok], mi[ok]), vals[ok])
+            np.add.at(c, (si[ok], mi[ok]), 1)
+            self.mean_sum[col], self.mean_cnt[col] = s, c
+            self.mean_sum_cum[col], self.mean_cnt_cum[col] = _cum(s), _cum(c)
+
+    # -----------------------------
+    # Window helpers
+    # -----------------------------
+    def window(self, start, end):
+        """Month index range [lo, hi) covering start <= month <= end."""
+        lo = int(np.searchsorted(self.months, np.datetime64(pd.Timestamp(start)), side="left"))
+        hi = int(np.searchsorted(self.months, np.datetime64(pd.Timestamp(end)), side="right"))
+        return lo, max(lo, hi)
+
+    def _range_sum(self, col, lo, hi):
+        cum = self.sums_cum[col]
+        return cum[:, hi] - cum[:, lo]
+
+    def _range_mean(self, col, lo, hi):
+        s = self.mean_sum_cum[col][:, hi] - self.mean_sum_cum[col][:, lo]
+        c = self.mean_cnt_cum[col][:, hi] - self.mean_cnt_cum[col][:, lo]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(c > 0, s / np.maximum(c, 1), np.nan), s, c
+
+    def _covered(self, lo, hi):
+        return (self.rows_cum[:, hi] - self.rows_cum[:, lo]) > 0
+
+    def _cell_mean(self, col, lo, hi):
+        s = self.mean_sum[col][:, lo:hi]
+        c = self.mean_cnt[col][:, lo:hi]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(c > 0, s / np.maximum(c, 1), np.nan)
+
+    # -----------------------------
+    # Widget views
+    # -----------------------------
+    @timed("cube.kpis")
+    def kpis(self, lo, hi):
+        covered = self._covered(lo, hi)
+        mig, _, _ = self._range_mean("migration_index", lo, hi)
+        _, g_sum, g_cnt = self._range_mean("growth_pct", lo, hi)
+        n_covered = int(covered.sum())
+        g_total = int(g_cnt.sum())
+        return {
+            "total_activity": float(self._range_sum("activity_total", lo, hi).sum()),
+            "avg_growth": float(g_sum.sum() / g_total) if g_total else np.nan,
+            "states_covered": n_covered,
+            "pos_pct": float((mig[covered] > 0).mean() * 100) if n_covered else np.nan,
+        }
+
+    @timed("cube.state_summary")
+    def state_summary(self, lo, hi):
+        """One row per state in the window: avg_migration, total_activity, avg_growth."""
+        covered = self._covered(lo, hi)
+        mig, _, _ = self._range_mean("migration_index", lo, hi)
+        growth, _, _ = self._range_mean("growth_pct", lo, hi)
+        return pd.DataFrame({
+            "state": self.states[covered],
+            "avg_migration": mig[covered],
+            "total_activity": self._range_sum("activity_total", lo, hi)[covered],
+            "avg_growth": growth[covered],
+        })
+
+    @timed("cube.trend")
+    def trend(self, lo, hi):
+        """India-wide activity sum and mean migration_index per month."""
+        present = self.rows[:, lo:hi].sum(axis=0) > 0
+        s = self.mean_sum["migration_index"][:, lo:hi].sum(axis=0)
+        c = self.mean_cnt["migration_index"][:, lo:hi].sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mig = np.where(c > 0, s / np.maximum(c, 1), np.nan)
+        out = pd.DataFrame({
+            "month": self.months[lo:hi],
+            "activity_total": self.sums["activity_total"][:, lo:hi].sum(axis=0),
+            "migration_index": mig,
+        })
+        return out[present].reset_index(drop=True)
+
+    @timed("cube.heatmap")
+    def heatmap(self, lo, hi, col="migration_index"):
+        """State x month pivot of the per-cell mean, missing cells as 0."""
+        covered = self._covered(lo, hi)
+        months_present = self.rows[:, lo:hi].sum(axis=0) > 0
+        vals = self._cell_mean(col, lo, hi)[covered][:, months_present]
+        return pd.DataFrame(
+            np.nan_to_num(vals, nan=0.0),
+            index=pd.Index(self.states[covered], name="state"),
+            columns=pd.Index(self.months[lo:hi][months_present], name="month"),
+        )
+
+    @timed("cube.movers")
+    def movers(self, lo, hi, col="migration_index"):
+        """
+        Change in the per-cell mean between the latest month in the window and
+        each state's previous populated month (as groupby().diff() would).
+        """
+        if hi <= lo:
+            return None, pd.DataFrame(columns=["state", "month", "mig", "mom_change"])
+        last = hi - 1
+        cell = self._cell_mean(col, lo, hi)
+        at_last = self.rows[:, last] > 0
+        prev = self.last_present[:, last - 1] if last - 1 >= lo else np.full(len(self.states), -1)
+        has_prev = prev >= lo
+
+        cur = cell[:, last - lo]
+        prev_val = np.full(len(self.states), np.nan)
+        prev_val[has_prev] = cell[has_prev, prev[has_prev] - lo]
+        change = cur - prev_val
+
+        keep = at_last & has_prev & ~np.isnan(change)
+        latest_month = pd.Timestamp(self.months[last])
+        out = pd.DataFrame({
+            "state": self.states[keep],
+            "month": latest_month,
+            "mig": cur[keep],
+            "mom_change": change[keep],
+        })
+        return latest_month, out
@@ -0,0 +1,296 @@
+"""
+Columnar (Parquet) store for the dashboard tables.
+
+The CSVs in data/ stay the source of truth. On first load each CSV is
+converted once into a typed Parquet file under data/store/v<STORE_VERSION>/
+(canonical state/district names as categoricals, counts as int32,
+ratios kept as float64, rows sorted by month so time windows are contiguous)
+and every later load reads the Parquet file instead of re-parsing the CSV. A manifest
+records the size/mtime of the CSV each file was built from, so a
+refreshed CSV triggers a rebuild automatically.
+
+With UIDAI_STORE_FORMAT=arrow the store is kept as uncompressed Arrow IPC
+(Feather v2) files instead, which are memory-mapped on load: numeric
+columns are zero-copy (read-only) views of the file, so loading takes
+milliseconds regardless of table size and all dashboard processes on a
+host share the same page-cache pages rather than each holding a copy.
+
+Run directly to (re)build the store:
+
+    python dashboard/datastore.py
+    python dashboard/datastore.py --format arrow   # before starting replicas
+"""
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa  # pandas needs it for Parquet
+    import pyarrow.ipc  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# UIDAI_DATA_DIR points the dashboard at another copy of data/ (benchmarks)
+DATA_DIR = os.environ.get("UIDAI_DATA_DIR") or os.path.join(BASE_DIR, "..", "data")
+
+# Name canonicalization is shared with the ETL (pipeline/names.py)
+ROOT_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from pipeline.build import derive_district  # noqa: E402
+from pipeline.names import canonical_states, merge_district_variants  # noqa: E402
+
+# Bump when the on-disk schema changes; old stores are simply ignored.
+STORE_VERSION = 3
+STORE_DIR = os.path.join(DATA_DIR, "store", f"v{STORE_VERSION}")
+MANIFEST_PATH = os.path.join(STORE_DIR, "manifest.json")
+
+# "parquet" (compressed, default) or "arrow" (memory-mapped Arrow IPC)
+FORMATS = ("parquet", "arrow")
+STORE_FORMAT = os.environ.get("UIDAI_STORE_FORMAT", "parquet").lower()
+
+COUNT_COLS = [
+    "activity_total", "enrol_total", "demo_total", "bio_total",
+    "age_0_5", "age_5_17", "age_18_greater",
+]
+
+# -----------------------------
+# Table schemas
+# -----------------------------
+TABLES = {
+    "state_month": {
+        "csv": "dashboard_state_month.csv",
+        "keys": ["month", "state"],
+        "categories": ["state"],
+        "counts": COUNT_COLS + ["prev_activity"],
+        "ratios": ["growth_pct", "migration_index",
+                   "mi_roll3", "mi_roll6", "mi_roll12", "mi_ewma", "mi_vol6"],
+    },
+    "district_month": {
+        "csv": "dashboard_district_month.csv",
+        "keys": ["month", "state", "district"],
+        "categories": ["state", "district"],
+        "counts": COUNT_COLS + ["prev_activity"],
+        "ratios": ["growth_pct", "migration_index", "migration_index_national",
+                   "mi_roll3", "mi_roll6", "mi_roll12", "mi_ewma", "mi_vol6"],
+        # Re-derived from the summed counts when spelling variants merge
+        "derive": derive_district,
+    },
+    # Only exported by ETL builds from a raw file with pincodes; optional.
+    "pincode_month": {
+        "csv": "dashboard_pincode_month.csv",
+        "keys": ["month", "state", "district", "pincode"],
+        "categories": ["state", "district"],
+        "codes": ["pincode"],
+        "counts": COUNT_COLS,
+        "ratios": [],
+        "optional": True,
+    },
+    # Anomaly alerts scored by the ETL (pipeline/anomaly.py)
+    "alerts": {
+        "csv": "dashboard_alerts.csv",
+        "keys": ["month", "state"],
+        "categories": ["level", "state", "district", "metric", "kind", "direction"],
+        "counts": [],
+        "ratios": ["value", "baseline", "robust_z", "seasonal_z", "shift_z", "score"],
+        "optional": True,
+    },
+}
+
+
+def csv_path(name):
+    return os.path.join(DATA_DIR, TABLES[name]["csv"])
+
+
+def has_table(name):
+    return os.path.exists(csv_path(name))
+
+
+def parquet_path(name):
+    return os.path.join(STORE_DIR, f"{name}.parquet")
+
+
+def store_path(name, fmt="parquet"):
+    return parquet_path(name) if fmt == "parquet" else os.path.join(STORE_DIR, f"{name}.arrow")
+
+
+def _downcast_count(s):
+    # int32 when every value is a whole number that fits, float32 when that
+    # is lossless (e.g. counts with NaN), otherwise leave as float64.
+    vals = s.to_numpy(dtype="float64", na_value=np.nan)
+    finite = np.isfinite(vals)
+    if finite.all() and (vals == np.round(vals)).all():
+        info = np.iinfo(np.int32)
+        if len(vals) == 0 or (vals.min() >= info.min and vals.max() <= info.max):
+            return pd.Series(vals.astype(np.int32), index=s.index, name=s.name)
+    as32 = vals.astype(np.float32)
+    if np.array_equal(as32.astype(np.float64), vals, equal_nan=True):
+        return pd.Series(as32, index=s.index, name=s.name)
+    return pd.Series(vals, index=s.index, name=s.name)
+
+
+def apply_schema(name, df):
+    """Cast a raw table to the typed in-memory schema of `name`."""
+    spec = TABLES[name]
+    df = df.copy()
+    df["month"] = pd.to_datetime(df["month"], errors="coerce")
+    # Canonical names; district spelling variants are merged and summed.
+    if "district" in spec["keys"]:
+        df = merge_district_variants(df, [c for c in COUNT_COLS if c in df.columns], spec["keys"],
+                                     derive=spec.get("derive"))
+    else:
+        df["state"] = canonical_states(df["state"])
+    for col in spec["categories"]:
+        df[col] = df[col].astype("category")
+    for col in spec.get("codes", []):
+        df[col] = df[col].astype(np.int32)
+    for col in spec["counts"]:
+        if col in df.columns:
+            df[col] = _downcast_count(df[col])
+    # Ratios stay float64: float32 would round the values the ETL exported.
+    for col in spec["ratios"]:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float64)
+    return df.sort_values(spec["keys"], kind="stable").reset_index(drop=True)
+
+
+# -----------------------------
+# Manifest
+# -----------------------------
+def _fingerprint(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": STORE_VERSION, "tables": {}}
+    if manifest.get("version") != STORE_VERSION:
+        return {"version": STORE_VERSION, "tables": {}}
+    return manifest
+
+
+def _write_manifest(manifest):
+    tmp = MANIFEST_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def dataset_version():
+    """Short fingerprint of the source CSVs and store schema (for cache keys)."""
+    parts = [f"v{STORE_VERSION}"]
+    for name in sorted(TABLES):
+        try:
+            fp = _fingerprint(csv_path(name))
+            parts.append(f"{name}:{fp['size']}:{fp['mtime_ns']}")
+        except OSError:
+            parts.append(f"{name}:missing")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+
+def is_fresh(name, fmt="parquet"):
+    if not os.path.exists(store_path(name, fmt)):
+        return False
+    entry = _read_manifest()["tables"].get(name)
+    return (
+        entry is not None
+        and entry.get("source") == _fingerprint(csv_path(name))
+        and fmt in entry.get("formats", ["parquet"])
+    )
+
+
+# -----------------------------
+# Build / load
+# -----------------------------
+def read_csv_typed(name):
+    """The plain CSV path, typed the same way as the store."""
+    return apply_schema(name, pd.read_csv(csv_path(name)))
+
+
+def write_arrow(df, path):
+    # Uncompressed, so the file can be mapped and read in place.
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_arrow(path):
+    """Memory-map an Arrow IPC file; numeric columns stay views of the map."""
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def build_table(name, fmt="parquet"):
+    """Convert one CSV into its store file and record it in the manifest."""
+    source = _fingerprint(csv_path(name))
+    df = read_csv_typed(name)
+
+    os.makedirs(STORE_DIR, exist_ok=True)
+    out = store_path(name, fmt)
+    tmp = out + ".tmp"
+    if fmt == "arrow":
+        write_arrow(df, tmp)
+    else:
+        df.to_parquet(tmp, index=False, compression="zstd")
+    os.replace(tmp, out)
+
+    manifest = _read_manifest()
+    entry = manifest["tables"].get(name)
+    formats = entry.get("formats", ["parquet"]) if entry and entry.get("source") == source else []
+    manifest["tables"][name] = {
+        "source": source,
+        "rows": int(len(df)),
+        "columns": {c: str(t) for c, t in df.dtypes.items()},
+        "formats": sorted(set(formats) | {fmt}),
+    }
+    _write_manifest(manifest)
+    return read_arrow(out) if fmt == "arrow" else df
+
+
+def load_table(name, fmt=None):
+    """
+    Load a dashboard table from the columnar store (format `fmt`, default
+    STORE_FORMAT), (re)building it from the CSV when missing or stale. Falls
+    back to the CSV when pyarrow is unavailable or the data directory is
+    read-only.
+    """
+    fmt = fmt or STORE_FORMAT
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown store format {fmt!r}; expected one of {FORMATS}")
+    if not HAS_PARQUET:
+        return read_csv_typed(name)
+    if is_fresh(name, fmt):
+        return read_arrow(store_path(name, fmt)) if fmt == "arrow" else pd.read_parquet(parquet_path(name))
+    try:
+        return build_table(name, fmt)
+    except OSError:
+        return read_csv_typed(name)
+
+
+def build_all(fmt="parquet"):
+    for name in TABLES:
+        if TABLES[name].get("optional") and not has_table(name):
+            continue
+        df = build_table(name, fmt)
+        print(f"{name}: {len(df):,} rows -> {store_path(name, fmt)}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the dashboard's columnar store.")
+    parser.add_argument("--format", choices=FORMATS, default=STORE_FORMAT)
+    build_all(parser.parse_args().format)
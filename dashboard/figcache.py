@@ -0,0 +1,115 @@
+"""
+Process-wide memo of built Plotly figures.
+
+Building a figure (Plotly Express validation, trace construction, layout
+updates) costs tens of milliseconds per widget and is repeated on every
+rerun, even when nothing the figure depends on has changed. Pages ask for
+a figure by key (widget name, dataset version, time window, selections,
+widget parameters) and only build it on a miss.
+
+The memo is an LRU bounded by both entry count and an approximate memory
+budget: each figure is charged an estimate of the data its traces hold,
+which is what dominates its footprint (the map geometry, large traces).
+The estimate is taken from array nbytes and container lengths rather than
+by serializing the figure. Cached figures are shared between sessions, so
+treat them as read-only.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from plotly.basedatatypes import BasePlotlyType
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ITEMS = 512
+LAYOUT_BYTES = 8 * 1024     # layout + template, roughly the same for every figure
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes if value.dtype != object else sum(_nbytes(v) for v in value.tolist())
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(k) + _nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)) and value:
+        # Numbers, or rows of numbers (GeoJSON rings): counted, not visited
+        first = value[0]
+        if isinstance(first, (int, float)):
+            return 8 * len(value)
+        if isinstance(first, (list, tuple)) and first and isinstance(first[0], (int, float)):
+            return 8 * len(value) * len(first)
+        return sum(_nbytes(v) for v in value)
+    return 8
+
+
+def figure_size(fig):
+    """Approximate memory charge for a figure: the data held by its traces, in bytes."""
+    size = LAYOUT_BYTES
+    for trace in fig.data:
+        for name in trace:
+            value = trace[name]
+            if value is not None and not isinstance(value, BasePlotlyType):
+                size += _nbytes(value)
+    return size
+
+
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_items=DEFAULT_MAX_ITEMS):
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self._items = OrderedDict()     # key -> (fig, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, fig, nbytes=None):
+        nbytes = figure_size(fig) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            return fig
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (fig, nbytes)
+            self._bytes += nbytes
+            while self._items and (self._bytes > self.max_bytes or len(self._items) > self.max_items):
+                _, (_, n) = self._items.popitem(last=False)
+                self._bytes -= n
+                self.evictions += 1
+        return fig
+
+    def get_or_build(self, key, build):
+        fig = self.get(key)
+        if fig is None:
+            fig = self.put(key, build())
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
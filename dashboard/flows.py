@@ -0,0 +1,159 @@
+"""
+Gravity-model flow estimator shared by the India Overview and State Deep
+Dive Sankeys.
+
+The migration index says how strongly a region sends (negative) or
+receives (positive), not where to. GravityFlows spreads those margins
+over source -> target pairs with a doubly-constrained gravity model:
+
+    T_ij = a_i * b_j * f(d_ij),    f(d) = max(d, MIN_KM) ** -DECAY
+
+where d_ij is the great-circle distance between the region centroids.
+A source's outflow margin is |signal| x its activity mass, a target's
+inflow margin likewise, both scaled to `scale`. The balancing factors
+a_i and b_j come from iterative proportional fitting: alternately scale
+the rows and the columns of the seed f(d_ij) until every margin matches
+to TOL. Mass only enters through the margins, since any per-region factor
+in the seed would be absorbed into a_i / b_j. Without coordinates the
+seed is uniform, and IPF returns the outer product of the margins, which
+was the earlier proxy, in a single step.
+
+Each IPF step is two matrix-vector products over the dense
+(sources, targets) matrix. Only the k largest flows of every source and
+every target are kept, in COO form sorted by flow, so the Sankeys show
+the strongest corridors. A per-region top-k contains the n <= k largest
+flows overall, and every source's and target's n largest.
+"""
+import numpy as np
+import pandas as pd
+
+from perf import timed
+
+
+DECAY = 2.0         # distance exponent of the deterrence function
+MIN_KM = 50.0       # distance floor (neighbouring / overlapping centroids)
+TOL = 1e-6          # max relative margin error at convergence
+MAX_ITER = 500
+TOP_K = 10
+EARTH_KM = 6371.0
+
+
+def haversine_km(src_xy, dst_xy):
+    """(sources, targets) great-circle distances between lon/lat points."""
+    lon1, lat1 = np.radians(src_xy).T[:, :, None]
+    lon2, lat2 = np.radians(dst_xy).T[:, None, :]
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def ipf(seed, row_totals, col_totals, tol=TOL, max_iter=MAX_ITER):
+    """
+    (flows, iterations): `seed` scaled as a_i * seed_ij * b_j so its row and
+    column sums match the totals (which must have equal sums).
+    """
+    a = np.ones(seed.shape[0])
+    b = np.ones(seed.shape[1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for it in range(1, max_iter + 1):
+            a = np.where(row_totals > 0, row_totals / (seed @ b), 0.0)
+            b = np.where(col_totals > 0, col_totals / (a @ seed), 0.0)
+            rows = a * (seed @ b)
+            err = np.abs(rows - row_totals).max(initial=0) / max(row_totals.max(initial=0), 1e-300)
+            if err <= tol:
+                break
+    return a[:, None] * seed * b[None, :], it
+
+
+def top_k(mat, k):
+    """Boolean mask of the k largest positive entries of every row and every column."""
+    keep = np.zeros(mat.shape, dtype=bool)
+    for axis in (0, 1):
+        n = mat.shape[axis]
+        if n == 0:
+            continue
+        kk = min(k, n)
+        idx = np.argpartition(-mat, kk - 1, axis=axis).take(np.arange(kk), axis=axis)
+        np.put_along_axis(keep, idx, True, axis=axis)
+    return keep & (mat > 0)
+
+
+class GravityFlows:
+    @timed("flows.fit")
+    def __init__(self, src_names, src_strength, dst_names, dst_strength, src_mass=None, dst_mass=None,
+                 src_xy=None, dst_xy=None, k=TOP_K, scale=1000, decay=DECAY):
+        self.src_names = np.asarray(src_names, dtype=object)
+        self.dst_names = np.asarray(dst_names, dtype=object)
+        out_m = np.abs(np.asarray(src_strength, dtype=np.float64))
+        in_m = np.abs(np.asarray(dst_strength, dtype=np.float64))
+        if src_mass is not None:
+            out_m = out_m * np.asarray(src_mass, dtype=np.float64)
+        if dst_mass is not None:
+            in_m = in_m * np.asarray(dst_mass, dtype=np.float64)
+        out_m = np.nan_to_num(out_m)
+        in_m = np.nan_to_num(in_m)
+        self.outflow = out_m / out_m.sum() * scale if out_m.sum() > 0 else out_m
+        self.inflow = in_m / in_m.sum() * scale if in_m.sum() > 0 else in_m
+
+        shape = (len(self.src_names), len(self.dst_names))
+        if src_xy is None or dst_xy is None:
+            self.distance = np.full(shape, np.nan)
+            seed = np.ones(shape)
+        else:
+            self.distance = haversine_km(np.asarray(src_xy, dtype=np.float64).reshape(-1, 2),
+                                         np.asarray(dst_xy, dtype=np.float64).reshape(-1, 2))
+            seed = np.maximum(self.distance, MIN_KM) ** -decay
+            # Regions without a centroid get the typical deterrence
+            missing = np.isnan(seed)
+            if missing.any():
+                seed[missing] = np.nanmedian(seed) if not missing.all() else 1.0
+
+        flows, self.iterations = ipf(seed, self.outflow, self.inflow)
+        keep = top_k(flows, k)
+        src, dst = np.nonzero(keep)
+        order = np.argsort(-flows[src, dst], kind="stable")
+        self.src, self.dst = src[order], dst[order]
+        self.flow = flows[self.src, self.dst]
+
+    def corridors(self, n=None, source=None, target=None):
+        """Strongest kept corridors (all, or from `source` / into `target`) as a frame."""
+        sel = np.ones(len(self.flow), dtype=bool)
+        if source is not None:
+            sel &= self.src_names[self.src] == source
+        if target is not None:
+            sel &= self.dst_names[self.dst] == target
+        idx = np.flatnonzero(sel)[:n]
+        return pd.DataFrame({
+            "source": self.src_names[self.src[idx]],
+            "target": self.dst_names[self.dst[idx]],
+            "flow": self.flow[idx],
+            "distance_km": self.distance[self.src[idx], self.dst[idx]],
+        })
+
+    def sankey_links(self, n=None, source=None, target=None):
+        """
+        (labels, source, target, value) for go.Sankey over the corridors of
+        corridors(), with sources at node indices [0, n_src) and targets after.
+        """
+        links = self.corridors(n, source, target)
+        src_labels, src_idx = np.unique(links["source"].to_numpy(), return_inverse=True)
+        dst_labels, dst_idx = np.unique(links["target"].to_numpy(), return_inverse=True)
+        labels = src_labels.tolist() + dst_labels.tolist()
+        return labels, src_idx, len(src_labels) + dst_idx, links["flow"].to_numpy()
+
+
+def fit_state_flows(summary, centroids, k=TOP_K):
+    """
+    GravityFlows from the states with avg_migration < 0 to those with > 0
+    in a StateMonthCube.state_summary() frame, massed by total_activity.
+    `centroids` maps state -> (lon, lat).
+    """
+    src = summary[summary["avg_migration"] < 0]
+    dst = summary[summary["avg_migration"] > 0]
+
+    def xy(df):
+        return np.array([centroids.get(s, (np.nan, np.nan)) for s in df["state"]], dtype=np.float64).reshape(-1, 2)
+
+    return GravityFlows(
+        src["state"], src["avg_migration"], dst["state"], dst["avg_migration"],
+        src["total_activity"], dst["total_activity"], xy(src), xy(dst), k=k,
+    )
@@ -0,0 +1,285 @@
+"""
+Pre-simplified GeoJSON layers for the choropleth.
+
+The source boundaries are far more detailed than a 520px map can show, and
+Plotly ships the whole geometry to the browser with every render. This
+module produces topology-preserving simplified copies at a few zoom
+tolerances, keeps only the property the map joins on, rounds coordinates,
+and caches each layer on disk as compact JSON next to the columnar store.
+
+Simplification is arc based (as in TopoJSON / mapshaper): rings are cut at
+every vertex where the set of rings sharing it changes, each arc is
+simplified once with Douglas-Peucker in a canonical direction, and rings
+are reassembled from the shared results. Neighbouring polygons therefore
+get exactly the same border and no gaps or slivers open up between them.
+
+Works for any Polygon/MultiPolygon FeatureCollection, so a district layer
+only needs its own source file and id property.
+"""
+import json
+import os
+
+import numpy as np
+
+from datastore import DATA_DIR
+
+
+GEO_VERSION = 1
+GEO_DIR = os.path.join(DATA_DIR, "store", "geo", f"v{GEO_VERSION}")
+
+# Douglas-Peucker tolerance in degrees (~1.1 km per 0.01 at India's latitudes)
+LEVELS = {
+    "fine": 0.002,
+    "medium": 0.01,
+    "coarse": 0.04,
+}
+
+QUANTUM = 1e-7        # vertex identity grid for detecting shared borders
+PRECISION = 4         # decimals kept in the output (~11 m)
+
+
+# -----------------------------
+# Geometry helpers
+# -----------------------------
+def _polygons(geom):
+    if geom is None:
+        return []
+    if geom["type"] == "Polygon":
+        return [geom["coordinates"]]
+    if geom["type"] == "MultiPolygon":
+        return geom["coordinates"]
+    return []
+
+
+def _open_ring(ring):
+    pts = np.asarray(ring, dtype=np.float64)[:, :2]
+    if len(pts) > 1 and np.array_equal(pts[0], pts[-1]):
+        pts = pts[:-1]
+    return pts
+
+
+def _ring_area(pts):
+    x, y = pts[:, 0], pts[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def douglas_peucker(pts, tol):
+    """Indices-preserving Douglas-Peucker; always keeps both endpoints."""
+    n = len(pts)
+    if n <= 2 or tol <= 0:
+        return pts
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        a, b = pts[i], pts[j]
+        seg = pts[i + 1:j] - a
+        d = b - a
+        length = np.hypot(d[0], d[1])
+        if length == 0:
+            dist = np.hypot(seg[:, 0], seg[:, 1])
+        else:
+            dist = np.abs(d[0] * seg[:, 1] - d[1] * seg[:, 0]) / length
+        k = int(np.argmax(dist))
+        if dist[k] > tol:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    return pts[keep]
+
+
+# -----------------------------
+# Topology-preserving simplification
+# -----------------------------
+def _fixed_vertices(rings, vids):
+    """Vertex ids where arcs must break so shared borders simplify identically."""
+    n_vert = int(max((v.max() for v in vids if len(v)), default=-1)) + 1
+    ring_of = np.concatenate([np.full(len(v), r) for r, v in enumerate(vids)])
+    all_vids = np.concatenate(vids)
+
+    # Signature of the set of rings touching each vertex: count + random hash sum.
+    pairs = np.unique(np.stack([all_vids, ring_of], axis=1), axis=0)
+    ring_hash = np.random.default_rng(0).integers(1, 2**62, size=len(rings), dtype=np.int64)
+    sig = np.zeros(n_vert, dtype=np.int64)
+    np.add.at(sig, pairs[:, 0], ring_hash[pairs[:, 1]])
+    cnt = np.bincount(pairs[:, 0], minlength=n_vert)
+
+    fixed = np.zeros(n_vert, dtype=bool)
+    for v in vids:
+        s, c = sig[v], cnt[v]
+        change = (s != np.roll(s, 1)) | (s != np.roll(s, -1)) | (c != np.roll(c, 1)) | (c != np.roll(c, -1))
+        fixed[v[change]] = True
+
+    # Every ring needs at least three break points so it can't collapse.
+    for pts, v in zip(rings, vids):
+        while fixed[v].sum() < 3 and len(np.unique(v)) >= 3:
+            anchors = np.flatnonzero(fixed[v])
+            if len(anchors) == 0:
+                cand = int(np.lexsort((pts[:, 1], pts[:, 0]))[0])
+            else:
+                d = np.min(np.hypot(*(pts[:, None, :] - pts[anchors][None, :, :]).transpose(2, 0, 1)), axis=1)
+                cand = int(np.argmax(d))
+            fixed[v[cand]] = True
+    return fixed
+
+
+def _simplify_rings(rings, tol):
+    """Simplify a list of open rings, sharing work (and results) across borders."""
+    if not rings:
+        return []
+    allpts = np.concatenate(rings)
+    q = np.round(allpts / QUANTUM).astype(np.int64)
+    _, inv = np.unique(q, axis=0, return_inverse=True)
+    inv = inv.reshape(-1)
+    bounds = np.cumsum([0] + [len(r) for r in rings])
+    vids = [inv[bounds[i]:bounds[i + 1]] for i in range(len(rings))]
+
+    fixed = _fixed_vertices(rings, vids)
+    arc_cache = {}
+    out = []
+    for pts, v in zip(rings, vids):
+        anchors = np.flatnonzero(fixed[v])
+        if len(anchors) < 3:
+            out.append(pts)
+            continue
+        # Rotate so the ring starts on an anchor, then walk anchor to anchor.
+        start = anchors[0]
+        pts_r = np.roll(pts, -start, axis=0)
+        v_r = np.roll(v, -start)
+        anchors_r = np.append(anchors - start, len(pts))
+        pieces = []
+        for a, b in zip(anchors_r[:-1], anchors_r[1:]):
+            idx = np.arange(a, b + 1) % len(pts)
+            arc, arc_v = pts_r[idx], v_r[idx]
+            # Canonical direction, so a border shared by two rings (walked
+            # in opposite directions) hits the same cache entry.
+            flip = arc_v[0] > arc_v[-1] or (arc_v[0] == arc_v[-1] and arc_v[1] > arc_v[-2])
+            key_v = arc_v[::-1] if flip else arc_v
+            key = key_v.tobytes()
+            simp = arc_cache.get(key)
+            if simp is None:
+                simp = douglas_peucker(arc[::-1] if flip else arc, tol)
+                arc_cache[key] = simp
+            pieces.append((simp[::-1] if flip else simp)[:-1])
+        out.append(np.concatenate(pieces))
+    return out
+
+
+def simplify_geojson(geo, tolerance, keep_props=("NAME_1",), precision=PRECISION):
+    """Return a simplified copy of a FeatureCollection with only `keep_props`."""
+    features = geo.get("features", [])
+
+    # Flatten every ring of every feature, remembering where it came from.
+    rings, layout = [], []
+    for feat in features:
+        polys = []
+        for poly in _polygons(feat.get("geometry")):
+            ids = []
+            for ring in poly:
+                pts = _open_ring(ring)
+                if len(pts) >= 3:
+                    ids.append(len(rings))
+                    rings.append(pts)
+            if ids:
+                polys.append(ids)
+        layout.append(polys)
+
+    simplified = _simplify_rings(rings, tolerance)
+
+    out_features = []
+    min_area = tolerance * tolerance
+    for feat, polys in zip(features, layout):
+        coords = []
+        for ids in polys:
+            exterior = simplified[ids[0]]
+            if _ring_area(exterior) < min_area:
+                continue
+            poly = []
+            for rid in ids:
+                r = np.round(simplified[rid], precision)
+                r = r[np.any(r != np.roll(r, 1, axis=0), axis=1)]
+                if len(r) < 3:
+                    continue
+                poly.append(np.vstack([r, r[:1]]).tolist())
+            if poly:
+                coords.append(poly)
+        # Tiny islands are dropped, but a feature always keeps its largest part.
+        if not coords and polys:
+            largest = max(polys, key=lambda ids: _ring_area(rings[ids[0]]))
+            r = np.round(rings[largest[0]], precision)
+            coords.append([np.vstack([r, r[:1]]).tolist()])
+
+        props = feat.get("properties") or {}
+        out_features.append({
+            "type": "Feature",
+            "properties": {k: props.get(k) for k in keep_props},
+            "geometry": (
+                {"type": "Polygon", "coordinates": coords[0]} if len(coords) == 1
+                else {"type": "MultiPolygon", "coordinates": coords}
+            ),
+        })
+    return {"type": "FeatureCollection", "features": out_features}
+
+
+# -----------------------------
+# Disk-cached layers
+# -----------------------------
+def _layer_path(src_path, level):
+    stem = os.path.splitext(os.path.basename(src_path))[0]
+    return os.path.join(GEO_DIR, f"{stem}.{level}.geojson")
+
+
+def _source_tag(src_path, id_prop):
+    st = os.stat(src_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "id_prop": id_prop}
+
+
+def build_layer(src_path, level="medium", id_prop="NAME_1"):
+    with open(src_path, "r", encoding="utf-8") as f:
+        geo = json.load(f)
+    layer = simplify_geojson(geo, LEVELS[level], keep_props=(id_prop,))
+    layer["source"] = _source_tag(src_path, id_prop)
+
+    os.makedirs(GEO_DIR, exist_ok=True)
+    out = _layer_path(src_path, level)
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(layer, f, separators=(",", ":"))
+    os.replace(tmp, out)
+    return layer
+
+
+def load_layer(src_path, level="medium", id_prop="NAME_1"):
+    """Simplified layer for `src_path`, rebuilt when the source file changes."""
+    path = _layer_path(src_path, level)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            layer = json.load(f)
+        if layer.get("source") == _source_tag(src_path, id_prop):
+            return layer
+    except (OSError, ValueError):
+        pass
+    try:
+        return build_layer(src_path, level, id_prop)
+    except OSError:
+        with open(src_path, "r", encoding="utf-8") as f:
+            geo = json.load(f)
+        return simplify_geojson(geo, LEVELS[level], keep_props=(id_prop,))
+
+
+def feature_names(geo, id_prop="NAME_1"):
+    return {f["properties"][id_prop] for f in geo["features"]}
+
+
+if __name__ == "__main__":
+    import sys
+
+    src = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "india_states.geojson")
+    raw = os.path.getsize(src)
+    for lvl in LEVELS:
+        build_layer(src, lvl)
+        print(f"{lvl:>6}: {raw / 1e6:.2f} MB -> {os.path.getsize(_layer_path(src, lvl)) / 1e6:.3f} MB")
@@ -0,0 +1,179 @@
+"""
+Cached loaders shared by every page: typed tables, the state x month cube,
+month slicers, trend series tiers, the state -> district -> pincode rollup
+index, simplified boundaries with their neighbour graphs and centroids,
+the spatial statistics, the CSV downloads and the figure memo.
+
+Each loader body is timed (load.<name>, see perf.py) when it actually runs,
+i.e. on a cache miss; app.py times the calls as a whole.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from cube import StateMonthCube
+from datastore import csv_path, dataset_version, has_table, load_table
+from figcache import DEFAULT_MAX_BYTES, FigureCache
+from geometry import feature_names, load_layer
+from hierarchy import RollupIndex
+from memstats import SessionMemory
+from perf import timed
+from pipeline.aggregate import derive_state_metrics
+from pipeline.names import to_geo_state
+from pipeline.schema import COUNT_COLS, DERIVED_COLS
+from spatial import load_graph, merge_features, score_panel
+from tiers import SeriesTiers
+from timeslice import MonthSlicer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The shared tables below rely on copy-on-write (always on from pandas 3).
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+# Tables come from the typed columnar store (data/store/), which is built
+# from the CSVs on first load. See datastore.py. One frame per process,
+# shared by reference with every session and every structure built on it
+# (cube, slicers, series tiers): st.cache_data would keep a pickled copy
+# and hand each caller its own unpickled one. Treat them as read-only;
+# with pandas copy-on-write, derived frames never write through to them.
+@st.cache_resource
+@timed("load.state_month")
+def load_state_month():
+    return load_table("state_month")
+
+@st.cache_resource
+@timed("load.district_month")
+def load_district_month():
+    return load_table("district_month")
+
+# Precomputed anomaly alerts; None until the ETL has scored them
+@st.cache_resource
+@timed("load.alerts")
+def load_alerts():
+    return load_table("alerts") if has_table("alerts") else None
+
+# One state x month cube per process; every India Overview widget reads
+# its time window from here (see cube.py).
+@st.cache_resource
+@timed("load.state_cube")
+def load_state_cube():
+    return StateMonthCube(load_state_month())
+
+# Month-sorted tables for the global time filter (see timeslice.py)
+@st.cache_resource
+@timed("load.slicers")
+def load_slicers():
+    return MonthSlicer(load_state_month()), MonthSlicer(load_district_month())
+
+# Trend series (India-wide, per state, per district) at every resolution
+# from the tables' own up to quarterly; charts pick a tier with a bounded
+# number of points (see tiers.py).
+@st.cache_resource
+@timed("load.series_tiers")
+def load_series_tiers():
+    state_df, dist_df = load_state_month(), load_district_month()
+    return {
+        "india": SeriesTiers(state_df),
+        "state": SeriesTiers(state_df, keys=["state"]),
+        "district": SeriesTiers(dist_df, keys=["state", "district"]),
+    }
+
+# State -> district -> pincode rollups and drill-downs from precomputed
+# prefix sums (see hierarchy.py). Only the index is kept, not the pincode
+# table; state -> district only when the ETL had no pincodes to export.
+@st.cache_resource
+@timed("load.rollup_index")
+def load_rollup_index():
+    if has_table("pincode_month"):
+        return RollupIndex(load_table("pincode_month"))
+    return RollupIndex(load_district_month())
+
+# Simplified state boundaries, one layer per detail level, loaded once per
+# process (built and cached on disk on first use, see geometry.py).
+@st.cache_resource
+@timed("load.geojson")
+def load_geojson(level="medium"):
+    path = os.path.join(BASE_DIR, "india_states.geojson")
+    return load_layer(path, level, id_prop="NAME_1")
+
+@st.cache_resource
+@timed("load.geo_states")
+def load_geo_states(level="medium"):
+    return feature_names(load_geojson(level), "NAME_1")
+
+# State contiguity graph ("queen" or "rook"), built from the full-detail
+# boundaries and cached on disk like the layers (see spatial.py)
+@st.cache_resource
+@timed("load.state_graph")
+def load_state_graph(rule="queen"):
+    return load_graph(os.path.join(BASE_DIR, "india_states.geojson"), rule, id_prop="NAME_1")
+
+# Dashboard state name -> (lon, lat) boundary centroid, for flow distances
+@st.cache_resource
+@timed("load.state_centroids")
+def load_state_centroids():
+    graph = load_state_graph()
+    states = load_state_month()["state"].dropna().astype(str).unique()
+    idx = graph.index(to_geo_state(states, set(graph.names)))
+    return {s: tuple(graph.centroids[i]) for s, i in zip(states, idx) if i >= 0}
+
+# Local Moran's I / Gi* for every state x month cell, scored once per
+# process and dataset
+@st.cache_resource
+@timed("load.state_spatial")
+def load_state_spatial(rule="queen"):
+    graph = load_state_graph(rule)
+    df = load_state_month()
+    df = df.assign(state_map=to_geo_state(df["state"].astype(str), set(graph.names)).to_numpy())
+    # States sharing one boundary feature (Ladakh and Jammu and Kashmir)
+    # are scored on their summed counts, with growth and the migration
+    # index derived again over the per-feature panel.
+    if df.duplicated(["state_map", "month"]).any():
+        merged = merge_features(df, "state_map", "state", COUNT_COLS)
+        derived = derive_state_metrics(merged.drop(columns="state").rename(columns={"state_map": "state"}))
+        df = merged.merge(
+            derived.rename(columns={"state": "state_map"})[["state_map", "month"] + DERIVED_COLS],
+            on=["state_map", "month"],
+        )
+    return score_panel(graph, df, "state_map", label_col="state")
+
+# Download payloads: the ETL's CSV exactly as exported (not the typed store
+# table, whose names are canonicalized), read once per process.
+@st.cache_resource
+@timed("load.table_csv")
+def table_csv(name):
+    with open(csv_path(name), "rb") as f:
+        return f.read()
+
+# Version of the data the cached tables were loaded from; part of every
+# figure cache key, so a refreshed dataset never serves stale figures.
+@st.cache_resource
+@timed("load.dataset_version")
+def load_dataset_version():
+    return dataset_version()
+
+# Built figures shared by all sessions (see figcache.py). Budget in MB can
+# be set with UIDAI_FIGURE_CACHE_MB.
+@st.cache_resource
+@timed("load.figure_cache")
+def load_figure_cache():
+    mb = os.environ.get("UIDAI_FIGURE_CACHE_MB")
+    return FigureCache(max_bytes=int(float(mb) * 1024 * 1024) if mb else DEFAULT_MAX_BYTES)
+
+# Threads that build deferred figures for all sessions (PageContext.defer_chart).
+# UIDAI_RENDER_WORKERS sets the size (default: one per core, up to 8); 0 or 1
+# builds inline, one by one.
+@st.cache_resource
+def load_render_pool():
+    workers = int(os.environ.get("UIDAI_RENDER_WORKERS", min(8, os.cpu_count() or 1)))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render") if workers > 1 else None
+
+# Per-session memory accounting (see memstats.py)
+@st.cache_resource
+@timed("load.session_memory")
+def load_session_memory():
+    return SessionMemory()
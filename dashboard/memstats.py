@@ -0,0 +1,89 @@
+"""
+Process and per-session memory accounting.
+
+All sessions of a Streamlit server share one process, so the cost of an
+extra analyst is what their session adds on top of the shared state
+(tables, cubes, slicers, figure memo): the objects in their session state
+plus whatever their reruns leave behind. SessionMemory records, per
+session, the process RSS when the session was first seen and the deep
+size of its session state, and estimates the incremental RSS per session
+from the growth since the first session was fully loaded.
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def rss_bytes():
+    """Current resident set size of this process (peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def object_bytes(obj, _seen=None):
+    """Approximate deep size of a session state value."""
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            object_bytes(k, _seen) + object_bytes(v, _seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(object_bytes(v, _seen) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class SessionMemory:
+    def __init__(self, idle_seconds=1800):
+        self.idle_seconds = idle_seconds
+        self._sessions = {}     # session id -> {"first_rss", "state_bytes", "seen"}
+        self._baseline = None   # RSS once the first session finished loading
+        self._lock = threading.Lock()
+
+    def record(self, session_id, session_state):
+        """Call at the end of a run with the session's state mapping."""
+        state_bytes = object_bytes({k: session_state[k] for k in list(session_state.keys())})
+        rss = rss_bytes()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = self._sessions[session_id] = {"first_rss": rss}
+                if self._baseline is None:
+                    self._baseline = rss
+            entry["state_bytes"] = state_bytes
+            entry["seen"] = now
+            for sid in [s for s, e in self._sessions.items() if now - e["seen"] > self.idle_seconds]:
+                del self._sessions[sid]
+
+    def stats(self, session_id=None):
+        rss = rss_bytes()
+        with self._lock:
+            n = len(self._sessions)
+            extra = max(n - 1, 0)
+            out = {
+                "rss": rss,
+                "sessions": n,
+                "baseline_rss": self._baseline,
+                "per_session_rss": (rss - self._baseline) / extra if extra and self._baseline else None,
+                "state_bytes": sum(e["state_bytes"] for e in self._sessions.values()),
+            }
+            if session_id in self._sessions:
+                out["session_state_bytes"] = self._sessions[session_id]["state_bytes"]
+        return out
@@ -0,0 +1,137 @@
+"""
+Per-rerun timing instrumentation.
+
+    with timer("overview.rank"):
+        ...
+
+    @timed("load.state_month")
+    def load_state_month(): ...
+
+    count("figure.builds")
+
+Each script run opens a Run (start_run) that collects the total time and
+call count of every named timer plus simple counters; finish_run closes it
+and emits one structured JSON line on the "uidai.perf" logger. Timers
+outside a run (imports, tests) are no-ops. Work handed to other threads
+records into the same run when submitted with contextvars.copy_context()
+(see PageContext.defer_chart). The cost per timer is two perf_counter
+calls and a locked dict update, so this stays on in production.
+
+Set UIDAI_PERF_LOG to "stderr" or a file path to write the JSON lines
+there; otherwise they go wherever the host application routes logging.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("uidai.perf")
+
+_current = contextvars.ContextVar("uidai_perf_run", default=None)
+
+
+class Run:
+    def __init__(self, **fields):
+        self.fields = fields
+        self.timings = {}       # name -> [seconds, calls]
+        self.counters = {}
+        self.t0 = time.perf_counter()
+        self.total = None
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            entry = self.timings.get(name)
+            if entry is None:
+                self.timings[name] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self):
+        total = self.total if self.total is not None else time.perf_counter() - self.t0
+        with self._lock:
+            timings, counters = dict(self.timings), dict(self.counters)
+        return {
+            **self.fields,
+            "total_ms": round(total * 1000, 3),
+            "timings": {
+                name: {"ms": round(s * 1000, 3), "calls": n}
+                for name, (s, n) in sorted(timings.items(), key=lambda kv: -kv[1][0])
+            },
+            "counters": dict(sorted(counters.items())),
+        }
+
+
+def start_run(**fields):
+    run = Run(**fields)
+    _current.set(run)
+    return run
+
+
+def current_run():
+    return _current.get()
+
+
+def finish_run(run, **fields):
+    """Close `run`, log it as one JSON line and return its dict."""
+    run.total = time.perf_counter() - run.t0
+    run.fields.update(fields)
+    if _current.get() is run:
+        _current.set(None)
+    record = run.as_dict()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": "rerun", **record}, default=str))
+    return record
+
+
+@contextmanager
+def timer(name):
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        run.add(name, time.perf_counter() - t0)
+
+
+def timed(name=None):
+    """Decorator form of timer(); defaults to the function's name."""
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with timer(label):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def count(name, n=1):
+    run = _current.get()
+    if run is not None:
+        run.count(name, n)
+
+
+def configure_logging(target=None):
+    """Route the JSON lines to UIDAI_PERF_LOG ("stderr" or a path), once."""
+    target = target or os.environ.get("UIDAI_PERF_LOG")
+    if not target or logger.handlers:
+        return
+    handler = logging.StreamHandler() if target == "stderr" else logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
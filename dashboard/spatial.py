@@ -0,0 +1,333 @@
+"""
+Spatial neighbour graph, region centroids and local spatial autocorrelation.
+
+contiguity() links two features of a boundary file when their rings share
+a vertex (queen) or a whole border segment (rook). Vertices are matched on
+the QUANTUM grid geometry.py uses for shared borders, and both rules come
+down to one self-join of (vertex or segment id, feature) pairs, so even a
+full-detail file is handled in a single vectorized pass. The graph also
+carries each feature's area-weighted centroid (for distances, see
+flows.py). load_graph() caches both on disk next to the simplified map
+layers and rebuilds them when the source file changes.
+
+SpatialGraph keeps the symmetric neighbour lists in CSR form (indptr,
+indices). A neighbour sum over a whole (regions, months) matrix is a
+gather along `indices` followed by prefix-sum differences at `indptr`,
+i.e. one sparse matrix product for every month at once. local_stats()
+builds on it to score every (region, month) cell:
+
+    moran_i / moran_z   local Moran's I with row-standardized weights and
+                        its z-score under randomization (Anselin 1995)
+    gi_z                Getis-Ord Gi* (binary weights, the region itself
+                        included), which is a z-score already
+    cluster             HH / LL / HL / LH quadrant of a local Moran's I
+                        with p < ALPHA, "ns" otherwise
+
+Regions with no value in a month are left out of that month's mean,
+variance and neighbour weights, so a missing state doesn't count as an
+average one. Regions without neighbours (islands) get NaN.
+
+Works for any Polygon/MultiPolygon FeatureCollection, so a district layer
+only needs its own source file and id property.
+"""
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from geometry import GEO_DIR, QUANTUM, _open_ring, _polygons, _source_tag
+from perf import timed
+from pipeline.anomaly import METRICS
+
+
+RULES = ("queen", "rook")
+ALPHA = 0.05
+CLUSTERS = ["HH", "LL", "HL", "LH", "ns"]
+
+
+# -----------------------------
+# Contiguity
+# -----------------------------
+def _rings(geo, id_prop):
+    """(feature names, open rings, owning feature of each ring, exterior-ring flags)."""
+    names, index, rings, owner, outer = [], {}, [], [], []
+    for feat in geo.get("features", []):
+        name = (feat.get("properties") or {}).get(id_prop)
+        if name is None:
+            continue
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        for poly in _polygons(feat.get("geometry")):
+            for k, ring in enumerate(poly):
+                pts = _open_ring(ring)
+                if len(pts) >= 3:
+                    rings.append(pts)
+                    owner.append(index[name])
+                    outer.append(k == 0)
+    return names, rings, np.asarray(owner, dtype=np.int64), np.asarray(outer, dtype=bool)
+
+
+def contiguity(geo, id_prop="NAME_1", rule="queen"):
+    """(feature names, (i, j) index pairs with i < j) of the neighbouring features of `geo`."""
+    if rule not in RULES:
+        raise ValueError(f"unknown contiguity rule {rule!r}; expected one of {RULES}")
+    names, rings, owner, _ = _rings(geo, id_prop)
+    if not rings:
+        return names, np.empty((0, 2), dtype=np.int64)
+
+    lens = np.array([len(r) for r in rings])
+    q = np.round(np.concatenate(rings) / QUANTUM).astype(np.int64)
+    q -= q.min(axis=0)
+    # One int64 per grid point (fits for any lon/lat box at 1e-7), then hashed
+    vid, _ = pd.factorize(q[:, 0] * (int(q[:, 1].max()) + 1) + q[:, 1])
+    feat = np.repeat(owner, lens)
+
+    if rule == "queen":
+        key = vid
+    else:
+        # Segment k joins vertex k to the next vertex of the same ring,
+        # keyed on its (unordered) vertex pair.
+        bounds = np.concatenate([[0], np.cumsum(lens)])
+        nxt = np.arange(len(vid)) + 1
+        nxt[bounds[1:] - 1] = bounds[:-1]
+        a, b = np.minimum(vid, vid[nxt]), np.maximum(vid, vid[nxt])
+        keep = a != b
+        key, feat = a[keep] * (int(vid.max()) + 1) + b[keep], feat[keep]
+
+    pairs = pd.DataFrame({"key": key, "feat": feat}).drop_duplicates()
+    shared = pairs[pairs.duplicated("key", keep=False)]
+    joined = shared.merge(shared, on="key")
+    joined = joined[joined["feat_x"] < joined["feat_y"]]
+    edges = np.unique(joined[["feat_x", "feat_y"]].to_numpy(dtype=np.int64), axis=0)
+    return names, edges.reshape(-1, 2)
+
+
+def centroids(geo, id_prop="NAME_1"):
+    """(feature names, (n, 2) lon/lat centroids), area-weighted over each feature's exterior rings."""
+    names, rings, owner, outer = _rings(geo, id_prop)
+    sums = np.zeros((len(names), 3))        # area, area * x, area * y
+    for pts, i, is_outer in zip(rings, owner, outer):
+        if not is_outer:
+            continue
+        x, y = pts[:, 0], pts[:, 1]
+        xn, yn = np.roll(x, -1), np.roll(y, -1)
+        cross = x * yn - xn * y
+        area = cross.sum() / 2
+        if area == 0:
+            continue
+        cx = ((x + xn) * cross).sum() / (6 * area)
+        cy = ((y + yn) * cross).sum() / (6 * area)
+        sums[i] += abs(area) * np.array([1.0, cx, cy])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return names, sums[:, 1:] / sums[:, :1]
+
+
+class SpatialGraph:
+    def __init__(self, names, edges, centroids=None):
+        self.names = list(names)
+        self.centroids = (
+            np.full((len(self.names), 2), np.nan) if centroids is None
+            else np.asarray(centroids, dtype=np.float64).reshape(-1, 2)
+        )
+        self._index = {name: i for i, name in enumerate(self.names)}
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        rows = np.concatenate([edges[:, 0], edges[:, 1]])
+        cols = np.concatenate([edges[:, 1], edges[:, 0]])
+        order = np.lexsort((cols, rows))
+        self.indices = cols[order]
+        self.indptr = np.searchsorted(rows[order], np.arange(len(self.names) + 1))
+        self.n_edges = len(edges)
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def index(self, names):
+        """Node index of each name; -1 where the graph has no such feature."""
+        return np.array([self._index.get(n, -1) for n in names], dtype=np.int64)
+
+    def neighbours(self, name):
+        i = self._index.get(name)
+        if i is None:
+            return []
+        return [self.names[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def neighbour_sum(self, mat):
+        """Sum over each node's neighbours of the rows of `mat` (nodes, ...)."""
+        gathered = mat[self.indices]
+        cum = np.zeros((len(gathered) + 1,) + mat.shape[1:])
+        np.cumsum(gathered, axis=0, out=cum[1:])
+        return cum[self.indptr[1:]] - cum[self.indptr[:-1]]
+
+
+# -----------------------------
+# Disk-cached graphs
+# -----------------------------
+def _graph_path(src_path, rule):
+    stem = os.path.splitext(os.path.basename(src_path))[0]
+    return os.path.join(GEO_DIR, f"{stem}.{rule}.graph.json")
+
+
+def build_graph(src_path, rule="queen", id_prop="NAME_1"):
+    with open(src_path, "r", encoding="utf-8") as f:
+        geo = json.load(f)
+    names, edges = contiguity(geo, id_prop, rule)
+    graph = SpatialGraph(names, edges, centroids(geo, id_prop)[1])
+
+    try:
+        os.makedirs(GEO_DIR, exist_ok=True)
+        out = _graph_path(src_path, rule)
+        tmp = out + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "source": _source_tag(src_path, id_prop),
+                "names": names,
+                "edges": edges.tolist(),
+                "centroids": np.round(graph.centroids, 4).tolist(),
+            }, f, separators=(",", ":"))
+        os.replace(tmp, out)
+    except OSError:
+        pass
+    return graph
+
+
+def load_graph(src_path, rule="queen", id_prop="NAME_1"):
+    """Contiguity graph of `src_path`, rebuilt when the source file changes."""
+    try:
+        with open(_graph_path(src_path, rule), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("source") == _source_tag(src_path, id_prop) and "centroids" in cached:
+            return SpatialGraph(cached["names"], cached["edges"], cached["centroids"])
+    except (OSError, ValueError):
+        pass
+    return build_graph(src_path, rule, id_prop)
+
+
+# -----------------------------
+# Local statistics
+# -----------------------------
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+
+
+def two_sided_p(z):
+    return _erfc(np.abs(z) / math.sqrt(2)).astype(np.float64)
+
+
+def local_stats(graph, mat):
+    """
+    Local Moran's I, its z-score, Gi* and the neighbour mean (lag) of the
+    standardized values, for every cell of a (nodes, months) matrix.
+    """
+    ok = ~np.isnan(mat)
+    n = ok.sum(axis=0).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(ok, mat, 0.0).sum(axis=0) / n
+        z = np.where(ok, mat - mean, 0.0)
+        m2 = (z * z).sum(axis=0) / n
+        b2 = (z ** 4).sum(axis=0) / n / (m2 * m2)
+
+        k = graph.neighbour_sum(ok.astype(np.float64))    # neighbours with a value
+        z_sum = graph.neighbour_sum(z)
+        valid = ok & (k > 0) & (m2 > 0)
+
+        # Local Moran's I, row-standardized: sum of weights 1, sum of
+        # squared weights 1 / k.
+        lag = z_sum / k
+        moran_i = z * lag / m2
+        w2 = 1.0 / k
+        var = (
+            w2 * (n - b2) / (n - 1)
+            + (1.0 - w2) * (2 * b2 - n) / ((n - 1) * (n - 2))
+            - 1.0 / (n - 1) ** 2
+        )
+        moran_z = (moran_i + 1.0 / (n - 1)) / np.sqrt(var)
+
+        # Gi*: binary weights over the region and its k neighbours
+        w = k + 1
+        gi_z = (z + z_sum) / (np.sqrt(m2) * np.sqrt((n * w - w * w) / (n - 1)))
+
+        scaled = z / np.sqrt(m2)
+    nan = np.nan
+    return {
+        "z": np.where(valid, scaled, nan),
+        "lag": np.where(valid, lag / np.sqrt(m2), nan),
+        "moran_i": np.where(valid, moran_i, nan),
+        "moran_z": np.where(valid, moran_z, nan),
+        "gi_z": np.where(valid, gi_z, nan),
+    }
+
+
+def clusters(z, lag, p, alpha=ALPHA):
+    """LISA quadrant of each cell, "ns" where p >= alpha or undefined."""
+    sig = p < alpha
+    return np.select(
+        [sig & (z > 0) & (lag > 0), sig & (z < 0) & (lag < 0), sig & (z > 0) & (lag < 0), sig & (z < 0) & (lag > 0)],
+        CLUSTERS[:4],
+        default="ns",
+    )
+
+
+def merge_features(df, node_col, label_col, sum_cols):
+    """
+    One row per (feature, month) of `df`: `sum_cols` summed and the labels
+    of the regions sharing a feature joined ("Jammu and Kashmir + Ladakh").
+    Other columns are dropped; ratios must be re-derived from the sums.
+    """
+    labels = df.groupby(node_col, observed=True)[label_col].agg(
+        lambda s: " + ".join(sorted(set(s.astype(str))))
+    )
+    out = df.groupby([node_col, "month"], as_index=False, observed=True)[sum_cols].sum()
+    out.insert(1, label_col, out[node_col].map(labels).to_numpy())
+    return out
+
+
+@timed("spatial.score")
+def score_panel(graph, df, node_col, label_col=None, metrics=METRICS):
+    """
+    Long table of local statistics for every (node, month, metric) cell of
+    `df`, whose `node_col` holds the graph's feature names, one row per
+    feature and month. Metrics are transformed as in pipeline/anomaly.py
+    (log activity).
+    """
+    nodes = graph.index(df[node_col])
+    df = df[nodes >= 0]
+    nodes = nodes[nodes >= 0]
+    months = np.sort(df["month"].unique())
+    mi = pd.Index(months).get_indexer(df["month"])
+    shape = (len(graph.names), len(months))
+    dup = pd.Series(nodes * len(months) + mi).duplicated().to_numpy()
+    if dup.any():
+        raise ValueError(
+            f"several rows per {node_col} and month (e.g. {df[node_col].iloc[np.flatnonzero(dup)[0]]!r}); "
+            "combine them first, see merge_features()"
+        )
+    rows = np.full(shape, -1, dtype=np.int64)
+    rows[nodes, mi] = np.arange(len(df))
+
+    frames = []
+    r, m = np.nonzero(rows >= 0)
+    for metric, (col, transform) in metrics.items():
+        if col not in df.columns:
+            continue
+        raw = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        mat = np.full(shape, np.nan)
+        mat[nodes, mi] = transform(raw) if transform is not None else raw
+        stats = local_stats(graph, mat)
+        cells = {name: vals[r, m] for name, vals in stats.items()}
+        moran_p = two_sided_p(cells["moran_z"])
+        frames.append(pd.DataFrame({
+            node_col: np.asarray(graph.names, dtype=object)[r],
+            "month": months[m],
+            "metric": metric,
+            "value": raw[rows[r, m]],
+            **cells,
+            "moran_p": moran_p,
+            "gi_p": two_sided_p(cells["gi_z"]),
+            "cluster": clusters(cells["z"], cells["lag"], moran_p),
+        }))
+        if label_col is not None:
+            frames[-1].insert(0, label_col, df[label_col].to_numpy()[rows[r, m]])
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
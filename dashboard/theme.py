@@ -0,0 +1,223 @@
+"""
+Dashboard styling: the dark/neon CSS, the header and the logo.
+
+Everything here is built once per process (module constants and an
+lru_cache'd logo), so a rerun only re-sends one CSS element and the header.
+"""
+import base64
+import os
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGO_PATH = os.path.join(BASE_DIR, "..", "assets", "aadhaar_transparent.png")
+
+
+# =============================
+# STABLE 4K DARK + NEON CSS
+# =============================
+GLOBAL_CSS = """
+<style>
+
+/* ===== GLOBAL BACKGROUND ===== */
+.stApp{
+    background:
+        radial-gradient(circle at 15% 20%, rgba(0,245,255,0.08), transparent 40%),
+        radial-gradient(circle at 85% 80%, rgba(124,255,0,0.06), transparent 45%),
+        #050810;
+    color: #EAF0FF;
+}
+
+/* ===== MAIN CONTENT ===== */
+.block-container{
+    padding-top: 1rem;
+    padding-bottom: 2rem;
+        
+}
+/* Force sidebar always visible on Streamlit Cloud */
+section[data-testid="stSidebar"] {
+    transform: translateX(0px) !important;
+    visibility: visible !important;
+    opacity: 1 !important;
+}
+
+
+
+/* ===== SIDEBAR (ALWAYS VISIBLE) ===== */
+section[data-testid="stSidebar"]{
+    background: rgba(12,16,28,0.96);
+    border-right: 1px solid rgba(0,245,255,0.15);
+    box-shadow: 6px 0px 28px rgba(0,0,0,0.6);
+    min-width: 320px !important;
+    max-width: 320px !important;
+}
+
+/* ===== SIDEBAR TEXT ===== */
+section[data-testid="stSidebar"] h2{
+    color: #EAF0FF;
+    font-size: 18px;
+}
+section[data-testid="stSidebar"] label{
+    color: rgba(234,240,255,0.8);
+}
+
+/* ===== BUTTONS ===== */
+.stButton > button{
+    background: rgba(255,255,255,0.04);
+    border: 1px solid rgba(0,245,255,0.18);
+    border-radius: 14px;
+    color: #EAF0FF;
+    padding: 0.6rem 1rem;
+    transition: 0.2s ease;
+}
+.stButton > button:hover{
+    border-color: rgba(0,245,255,0.35);
+    box-shadow: 0 0 18px rgba(0,245,255,0.15);
+    transform: translateY(-1px);
+}
+
+/* ===== METRIC CARDS ===== */
+div[data-testid="stMetric"]{
+    background: rgba(255,255,255,0.04);
+    border: 1px solid rgba(255,255,255,0.08);
+    border-radius: 16px;
+    padding: 14px;
+}
+div[data-testid="stMetric"] *{
+    color: #EAF0FF !important;
+}
+
+/* ===== PLOTLY FIX ===== */
+.js-plotly-plot .plotly,
+.js-plotly-plot .plotly div{
+    background: transparent !important;
+}
+
+
+
+
+
+/* -----------------------------
+   FIX: Layout should NOT shift when sidebar collapses
+----------------------------- */
+
+/* Remove the extra blank space that appears when sidebar closes */
+section.main > div {
+    padding-left: 2rem !important;
+    padding-right: 2rem !important;
+}
+
+/* Force page width to remain stable */
+.block-container {
+    max-width: 1400px !important;
+    margin: auto !important;
+}
+
+/* Fix sidebar collapse pushing content */
+[data-testid="stSidebar"][aria-expanded="false"] ~ div .block-container {
+    padding-left: 2rem !important;
+    padding-right: 2rem !important;
+}
+
+}
+
+</style>
+"""
+
+# -----------------------------
+# Header
+# -----------------------------
+HEADER_CSS = """
+<style>
+.header-wrap{
+    display:flex;
+    justify-content:center;
+    align-items:center;
+    gap:18px;
+    padding:10px 0px 6px 0px;
+    margin-bottom:10px;
+}
+
+.header-logo img{
+    height:65px;
+    width:auto;
+    background:transparent !important;
+    border:none !important;
+    outline:none !important;
+    box-shadow:none !important;
+    filter: drop-shadow(0px 0px 10px rgba(0,245,255,0.22));
+}
+
+.header-text{
+    display:flex;
+    flex-direction:column;
+    justify-content:center;
+    align-items:flex-start;
+}
+
+.header-title{
+    font-size:48px;
+    font-weight:900;
+    color:#E6EAF2;
+    line-height:1.05;
+    margin:0;
+}
+
+.header-sub{
+    font-size:14px;
+    color:rgba(230,234,242,0.70);
+    margin-top:4px;
+}
+</style>
+"""
+
+# -----------------------------
+# Top navigation bar (1 x 4 tiles)
+# -----------------------------
+NAV_CSS = """
+<style>
+.nav-btn button{
+    width:100%;
+    border-radius:16px !important;
+    border: 1px solid rgba(255,255,255,0.10) !important;
+    background: rgba(255,255,255,0.06) !important;
+    color: rgba(230,234,242,0.92) !important;
+    font-weight: 700 !important;
+    padding: 10px 14px !important;
+    transition: 0.2s ease-in-out;
+}
+
+.nav-btn button:hover{
+    background: rgba(255,255,255,0.10) !important;
+    border: 1px solid rgba(255,255,255,0.18) !important;
+}
+
+.nav-active button{
+    background: rgba(255,255,255,0.14) !important;
+    border: 1px solid rgba(255,255,255,0.22) !important;
+}
+</style>
+"""
+
+CSS = GLOBAL_CSS + HEADER_CSS + NAV_CSS
+
+
+@lru_cache(maxsize=None)
+def logo_base64(path=LOGO_PATH):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+@lru_cache(maxsize=None)
+def header_html():
+    logo = logo_base64()
+    return f"""
+<div class="header-wrap">
+    <div class="header-logo">
+        <img src="data:image/png;base64,{logo}">
+    </div>
+    <div class="header-text">
+        <div class="header-title">UIDAI Migration & Urbanization Tracker</div>
+        <div class="header-sub">Migration Proxy + Urbanization Hotspots | UIDAI Hackathon 2026</div>
+    </div>
+</div>
+"""
@@ -0,0 +1,121 @@
+"""
+Multi-resolution time series for the trend charts.
+
+A SeriesTiers holds one table's series (per state, per district, or one
+India-wide total) at its base resolution, sorted by key then time, with a
+cumulative sum per value column. Any coarser tier (daily -> weekly ->
+monthly -> quarterly) is answered from those prefix sums: bucket
+boundaries inside the requested window are found with one diff over the
+bucket ids, and each bucket's total is `cum[end] - cum[start]`, clipped
+exactly to the window (a quarter cut by the window only counts its
+in-window rows).
+
+`series()` picks the finest tier that stays within `max_points`, so a
+chart's payload stays bounded however long the window or fine the data.
+"""
+import numpy as np
+import pandas as pd
+
+from perf import timed
+
+
+FREQS = ["D", "W", "M", "Q"]
+FREQ_NAMES = {"D": "daily", "W": "weekly", "M": "monthly", "Q": "quarterly"}
+MAX_POINTS = 500
+
+
+def bucket_ids(times, freq):
+    """Integer bucket per timestamp; equal ids share a D/W/M/Q period."""
+    t = pd.DatetimeIndex(times)
+    days = t.to_numpy().astype("datetime64[D]").astype(np.int64)
+    if freq == "D":
+        return days
+    if freq == "W":
+        # weeks start on Monday (1970-01-01 was a Thursday)
+        return (days + 3) // 7
+    if freq == "M":
+        return (t.year * 12 + t.month - 1).to_numpy(dtype=np.int64)
+    if freq == "Q":
+        return (t.year * 4 + (t.month - 1) // 3).to_numpy(dtype=np.int64)
+    raise ValueError(f"unknown frequency {freq!r}")
+
+
+def bucket_start(ids, freq):
+    """Period start timestamps for bucket ids from bucket_ids()."""
+    ids = np.asarray(ids, dtype=np.int64)
+    if freq == "D":
+        return pd.to_datetime(ids, unit="D")
+    if freq == "W":
+        return pd.to_datetime(ids * 7 - 3, unit="D")
+    if freq == "M":
+        return pd.to_datetime({"year": ids // 12, "month": ids % 12 + 1, "day": 1})
+    return pd.to_datetime({"year": ids // 4, "month": (ids % 4) * 3 + 1, "day": 1})
+
+
+class SeriesTiers:
+    def __init__(self, df, keys=(), value_cols=("activity_total",), time_col="month", base=None):
+        self.keys = list(keys)
+        self.value_cols = list(value_cols)
+        self.time_col = time_col
+        self.base = base or ("M" if time_col == "month" else "D")
+        self.freqs = FREQS[FREQS.index(self.base):]
+
+        df = df.dropna(subset=[time_col] + self.keys)
+        times = pd.to_datetime(df[time_col]).to_numpy()
+        if self.keys:
+            codes, uniques = pd.MultiIndex.from_frame(df[self.keys].astype(str)).factorize()
+        else:
+            codes, uniques = np.zeros(len(df), dtype=np.int64), [()]
+        order = np.lexsort((times, codes))
+        codes, times = codes[order], times[order]
+
+        # Collapse duplicate (key, time) rows so every base point is unique.
+        new = np.ones(len(times), dtype=bool)
+        new[1:] = (codes[1:] != codes[:-1]) | (times[1:] != times[:-1])
+        starts = np.flatnonzero(new)
+        self.times = times[starts]
+        key_codes = codes[starts]
+
+        self.cum = {}
+        for col in self.value_cols:
+            vals = df[col].to_numpy(dtype=np.float64, na_value=0.0)[order]
+            cum = np.concatenate([[0.0], np.cumsum(vals)])
+            self.cum[col] = cum[np.append(starts, len(vals))]
+
+        # Row range [lo, hi) of each key inside the sorted arrays
+        bounds = np.searchsorted(key_codes, np.arange(len(uniques) + 1))
+        self._ranges = {
+            (u if isinstance(u, tuple) else (u,)): (int(bounds[i]), int(bounds[i + 1]))
+            for i, u in enumerate(uniques)
+        }
+        self._ids = {f: bucket_ids(self.times, f) for f in self.freqs}
+
+    @timed("tiers.series")
+    def series(self, key=(), start=None, end=None, max_points=MAX_POINTS, freq=None):
+        """
+        (freq, frame) for one key within [start, end], at `freq` or the
+        finest tier with at most `max_points` points. The frame has the time
+        column (bucket start) and one summed column per value column.
+        """
+        key = key if isinstance(key, tuple) else (key,)
+        lo, hi = self._ranges.get(tuple(str(k) for k in key), (0, 0))
+        t = self.times[lo:hi]
+        if start is not None:
+            lo += int(np.searchsorted(t, np.datetime64(pd.Timestamp(start)), side="left"))
+        if end is not None:
+            hi = lo + int(np.searchsorted(self.times[lo:hi], np.datetime64(pd.Timestamp(end)), side="right"))
+
+        candidates = [freq] if freq else self.freqs
+        for f in candidates:
+            ids = self._ids[f][lo:hi]
+            edges = np.flatnonzero(np.diff(ids)) + 1 if len(ids) else np.array([], dtype=np.int64)
+            if len(edges) + (len(ids) > 0) <= max_points or f == candidates[-1]:
+                break
+        first = np.concatenate([[0], edges]) if len(ids) else np.array([], dtype=np.int64)
+        last = np.append(edges, len(ids)) if len(ids) else np.array([], dtype=np.int64)
+
+        out = pd.DataFrame({self.time_col: bucket_start(ids[first], f) if len(ids) else pd.to_datetime([])})
+        for col in self.value_cols:
+            cum = self.cum[col]
+            out[col] = cum[lo + last] - cum[lo + first]
+        return f, out
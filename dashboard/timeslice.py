@@ -0,0 +1,56 @@
+"""
+Time-window slicing for month-sorted tables.
+
+A MonthSlicer holds one table sorted by month and answers the global time
+filter with two binary searches over the month column, returning a
+positional row slice (a view, no copy) instead of building a boolean mask
+over the whole table and copying the result. Windows are memoized by their
+row bounds, so every rerun with the same time range gets the same frame.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class MonthSlicer:
+    def __init__(self, df, max_windows=32):
+        if not df["month"].is_monotonic_increasing:
+            df = df.sort_values("month", kind="stable").reset_index(drop=True)
+        self.df = df
+        self.months = df["month"].to_numpy()
+        self.max_windows = max_windows
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def min_month(self):
+        return pd.Timestamp(self.months[0])
+
+    @property
+    def max_month(self):
+        # NaT sorts last; skip it.
+        valid = self.months[~np.isnat(self.months)]
+        return pd.Timestamp(valid[-1])
+
+    def bounds(self, start, end):
+        """Row range [lo, hi) with start <= month <= end."""
+        lo = int(np.searchsorted(self.months, np.datetime64(pd.Timestamp(start)), side="left"))
+        hi = int(np.searchsorted(self.months, np.datetime64(pd.Timestamp(end)), side="right"))
+        return lo, max(lo, hi)
+
+    def window(self, start, end):
+        """Rows with start <= month <= end. Treat the result as read-only."""
+        key = self.bounds(start, end)
+        with self._lock:
+            frame = self._windows.get(key)
+            if frame is not None:
+                self._windows.move_to_end(key)
+                return frame
+        frame = self.df.iloc[key[0]:key[1]]
+        with self._lock:
+            self._windows[key] = frame
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+        return frame
@@ -0,0 +1,122 @@
+"""
+One module per dashboard page, imported only when the page is first shown.
+
+Each page module provides:
+
+    filters(ctx)   page-specific sidebar widgets; stores selections on ctx
+    render(ctx)    the page body
+
+Python keeps imported modules in sys.modules, so a page's heavy imports
+(plotly) and module-level setup run once per process, not once per rerun.
+
+Pages with several independent charts use ctx.defer_chart(): the chart's
+slot is reserved where the call is made, its figure is built on a shared
+thread pool, and the app fills the slots in page order (flush_charts) once
+the page body has been laid out, so the builds overlap instead of running
+one after another. Sections below the fold go in lazy_expander()s, so
+they are not computed at all until the user opens them.
+"""
+import contextvars
+import importlib
+
+import streamlit as st
+
+from perf import count, timer
+
+PAGES = {
+    "🇮🇳 India Overview": "views.overview",
+    "🏙️ State Deep Dive": "views.state",
+    "📍 District Drilldown": "views.district",
+    "👥 Age Migration": "views.age",
+}
+DEFAULT_PAGE = "🇮🇳 India Overview"
+
+
+class PageContext:
+    """Shared per-rerun state handed to the page modules."""
+
+    def __init__(self, state_cube, state_slicer, dist_slicer, time_range, version=None, figures=None, pool=None):
+        self.state_cube = state_cube
+        self.state_slicer = state_slicer
+        self.dist_slicer = dist_slicer
+        self.time_range = time_range
+        self.version = version
+        self.figures = figures
+        self.pool = pool
+        self._deferred = []     # (widget, slot, future, chart kwargs) in page order
+
+        # Month index range [lo, hi) of the window inside the cube
+        self.win_lo, self.win_hi = state_cube.window(time_range[0], time_range[1])
+
+        # Global time filter (memoized zero-copy views; do not modify in place)
+        with timer("filter.window"):
+            self.state_df_f = state_slicer.window(time_range[0], time_range[1])
+            self.dist_df_f = dist_slicer.window(time_range[0], time_range[1])
+
+        # Set by the page's filters()
+        self.chosen_state = None
+        self.chosen_district = None
+
+    def figure(self, widget, build, **params):
+        """
+        Memoized figure for `widget`: `build()` only runs when no figure is
+        cached for this dataset version, time window, selection and
+        `params` (e.g. top_n). Don't modify the returned figure.
+        """
+        def timed_build():
+            count("figure.builds")
+            with timer(f"build.{widget}"):
+                return build()
+
+        count("figure.requests")
+        if self.figures is None:
+            return timed_build()
+        key = (
+            widget, self.version, tuple(self.time_range), self.chosen_state, self.chosen_district,
+            tuple(sorted(params.items())),
+        )
+        return self.figures.get_or_build(key, timed_build)
+
+    def chart(self, widget, fig, slot=None, **kwargs):
+        """st.plotly_chart (or into `slot`), timed (serialization + delta) as chart.<widget>."""
+        with timer(f"chart.{widget}"):
+            return (slot or st).plotly_chart(fig, **kwargs)
+
+    def defer_chart(self, widget, build, params=None, **kwargs):
+        """
+        Reserve a slot here for ctx.chart(widget, ctx.figure(widget, build,
+        **params), **kwargs) and build the figure on the pool; the chart is
+        sent by flush_charts(). Without a pool it is drawn immediately.
+        Widgets (sliders, selects) must not be created inside `build`.
+        """
+        params = params or {}
+        if self.pool is None:
+            return self.chart(widget, self.figure(widget, build, **params), **kwargs)
+        slot = st.empty()
+        future = self.pool.submit(contextvars.copy_context().run, self.figure, widget, build, **params)
+        self._deferred.append((widget, slot, future, kwargs))
+
+    def flush_charts(self):
+        """Send deferred charts in page order, each as soon as it is built."""
+        deferred, self._deferred = self._deferred, []
+        for widget, slot, future, kwargs in deferred:
+            with timer(f"wait.{widget}"):
+                fig = future.result()
+            self.chart(widget, fig, slot=slot, **kwargs)
+
+
+def lazy_expander(label, key, expanded=False):
+    """
+    (expander, is_open) for a section whose body should only be computed
+    and sent while it is open: opening or closing it reruns the script.
+    On Streamlit versions without lazy expanders the body is always built.
+    """
+    try:
+        box = st.expander(label, expanded=expanded, key=key, on_change="rerun")
+    except TypeError:
+        return st.expander(label, expanded=expanded), True
+    return box, bool(box.open)
+
+
+def load_page(page):
+    return importlib.import_module(PAGES.get(page, PAGES[DEFAULT_PAGE]))
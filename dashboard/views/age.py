@@ -0,0 +1,145 @@
+"""👥 Age Migration: activity by age group, adult share and age mix."""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from perf import timer
+
+
+def filters(ctx):
+    with st.sidebar.expander("👥 Demographics Filter", expanded=True):
+        states = sorted(ctx.state_df_f["state"].dropna().unique())
+        ctx.chosen_state = st.selectbox("Select State/UT", ["All India"] + states)
+
+
+def render(ctx):
+    state_df_f = ctx.state_df_f
+    chosen_state = ctx.chosen_state
+
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+    st.subheader("👥 Age Activity Insights (Proxy, Not Direct Migration)")
+    st.caption(
+        "This section shows Aadhaar activity by age group. Higher 0–5 does NOT mean kids migrate alone — "
+        "it reflects enrolment/updates linked to family movement & service drives."
+    )
+
+    if chosen_state is None:
+        st.info("Select All India or a state from the sidebar.")
+        st.stop()
+
+    with timer("agg.age.by_month"):
+        if chosen_state == "All India":
+            temp = state_df_f.groupby("month", as_index=False).agg(
+                age_0_5=("age_0_5", "sum"),
+                age_5_17=("age_5_17", "sum"),
+                age_18_greater=("age_18_greater", "sum"),
+            )
+            title = "India Aadhaar Activity by Age Group (Proxy)"
+        else:
+            temp = (
+                state_df_f[state_df_f["state"] == chosen_state]
+                .groupby("month", as_index=False)
+                .agg(
+                    age_0_5=("age_0_5", "sum"),
+                    age_5_17=("age_5_17", "sum"),
+                    age_18_greater=("age_18_greater", "sum"),
+                )
+            )
+            title = f"{chosen_state} Aadhaar Activity by Age Group (Proxy)"
+
+    long = temp.melt(id_vars="month", var_name="age_group", value_name="count")
+
+    def build_age_trend():
+        fig = px.line(long, x="month", y="count", color="age_group", markers=True, title=title)
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            height=520
+        )
+        return fig
+
+    fig = ctx.figure("age.age_trend", build_age_trend)
+    ctx.chart("age.age_trend", fig, width="stretch")
+
+    st.divider()
+
+    st.markdown("### 🧑‍💼 Working-Age Migration Signal (Proxy)")
+    st.caption("Adult Share % = 18+ / (0–5 + 5–17 + 18+). Higher % suggests stronger working-age movement updates (proxy).")
+
+    temp2 = temp.copy()
+    temp2["total_age_activity"] = temp2["age_0_5"] + temp2["age_5_17"] + temp2["age_18_greater"]
+
+    temp2["adult_share_pct"] = np.where(
+        temp2["total_age_activity"] > 0,
+        (temp2["age_18_greater"] / temp2["total_age_activity"]) * 100,
+        0
+    )
+
+    def build_adult_share():
+        fig_adult = px.area(
+            temp2,
+            x="month",
+            y="adult_share_pct",
+            markers=True,
+            title="Adult Share % of Aadhaar Activity (18+ / Total) — Migration Proxy"
+        )
+
+        fig_adult.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            height=420,
+            yaxis_title="Adult Share (%)",
+            margin=dict(l=10, r=10, t=60, b=10)
+        )
+        return fig_adult
+
+    fig_adult = ctx.figure("age.adult_share", build_adult_share)
+    ctx.chart("age.adult_share", fig_adult, width="stretch")
+
+    st.divider()
+
+    st.markdown("### 🧩 Age Contribution Share (Proxy)")
+
+    age_totals = {
+        "0–5": float(temp["age_0_5"].sum()),
+        "5–17": float(temp["age_5_17"].sum()),
+        "18+": float(temp["age_18_greater"].sum()),
+    }
+
+    age_share = pd.DataFrame({
+        "age_group": list(age_totals.keys()),
+        "count": list(age_totals.values())
+    })
+
+    def build_age_mix():
+        fig_age = px.pie(
+            age_share,
+            names="age_group",
+            values="count",
+            hole=0.55,
+            title="Age Group Share in Aadhaar Activity (Proxy)"
+        )
+
+        fig_age.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            height=420
+        )
+        return fig_age
+
+    fig_age = ctx.figure("age.age_mix", build_age_mix)
+    ctx.chart("age.age_mix", fig_age, width="stretch")
+    
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+    st.success(
+        "Interpretation: Adult Share % rising = stronger working-age movement signal (proxy). "
+        "0–5 spikes often indicate enrolment/service drives + family-linked updates."
+    )
@@ -0,0 +1,156 @@
+"""📍 District Drilldown: one district's trend, migration signal, age totals and pincodes."""
+import plotly.express as px
+import streamlit as st
+
+from loaders import load_rollup_index, load_series_tiers
+from perf import timer
+from tiers import FREQ_NAMES
+from views import lazy_expander
+
+SIGNALS = {
+    "migration_index": "Within state",
+    "migration_index_national": "National",
+    "mi_roll6": "Within state, 6-month mean",
+}
+
+
+def filters(ctx):
+    dist_df_f = ctx.dist_df_f
+    with st.sidebar.expander("📍 District Filter", expanded=True):
+        states = sorted(dist_df_f["state"].dropna().unique())
+        ctx.chosen_state = st.selectbox("Select State/UT", states)
+
+        districts = sorted(
+            dist_df_f[dist_df_f["state"] == ctx.chosen_state]["district"].dropna().unique()
+        )
+        ctx.chosen_district = st.selectbox("Select District", districts)
+
+
+def render(ctx):
+    dist_df_f = ctx.dist_df_f
+    chosen_state, chosen_district = ctx.chosen_state, ctx.chosen_district
+
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+    st.subheader("📍 District Drilldown (State → District)")
+
+    if chosen_state is None or chosen_district is None:
+        st.info("Select a state and district from the sidebar.")
+        st.stop()
+
+    with timer("agg.district.select"):
+        dd = dist_df_f[
+            (dist_df_f["state"] == chosen_state) &
+            (dist_df_f["district"] == chosen_district)
+        ]
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("📊 Total Activity", f"{dd['activity_total'].sum():,.0f}")
+    c2.metric("👶 0–5 Total", f"{dd['age_0_5'].sum():,.0f}")
+    c3.metric("🧑 18+ Total", f"{dd['age_18_greater'].sum():,.0f}")
+
+    # Derived columns are absent from district CSVs exported before the ETL computed them
+    has_signal = "migration_index" in dd.columns
+    if has_signal:
+        c4, c5, c6 = st.columns(3)
+        c4.metric("📌 Avg Migration Index (within state)", f"{dd['migration_index'].mean():.2f}")
+        c5.metric("🇮🇳 Avg Migration Index (national)", f"{dd['migration_index_national'].mean():.2f}")
+        c6.metric("📈 Avg Growth %", f"{(dd['growth_pct'].mean()*100):.2f}%")
+
+    st.divider()
+
+    tiers = load_series_tiers()["district"]
+    freq, trend = tiers.series((chosen_state, chosen_district), *ctx.time_range)
+    resolution = "" if freq == tiers.base else f" ({FREQ_NAMES[freq]})"
+
+    def build_trend():
+        fig = px.line(
+            trend,
+            x=tiers.time_col,
+            y="activity_total",
+            markers=True,
+            title=f"{chosen_district}, {chosen_state}: Trend{resolution}"
+        )
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2")
+        )
+        return fig
+
+    fig = ctx.figure("district.trend", build_trend, freq=freq)
+    ctx.chart("district.trend", fig, width="stretch")
+
+    if has_signal:
+        def build_signal():
+            signal = dd.sort_values("month").melt(
+                id_vars="month",
+                value_vars=[c for c in SIGNALS if c in dd.columns],
+                var_name="signal",
+            )
+            signal["signal"] = signal["signal"].map(SIGNALS)
+            fig = px.line(
+                signal,
+                x="month",
+                y="value",
+                color="signal",
+                markers=True,
+                title=f"{chosen_district}, {chosen_state}: Migration Index (Z)",
+                labels={"value": "Migration Index (Z)", "signal": ""},
+            )
+            fig.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                font=dict(color="#E6EAF2")
+            )
+            return fig
+
+        fig = ctx.figure("district.signal", build_signal)
+        ctx.chart("district.signal", fig, width="stretch")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    rollup = load_rollup_index()
+    if rollup.depth > 2:
+        box, is_open = lazy_expander("📮 Pincode Breakdown", key="lazy.district.pincodes")
+        with box:
+            if is_open:
+                pincode_section(ctx, rollup)
+
+
+def pincode_section(ctx, rollup):
+    """Top pincodes of the chosen district, drilled down from the rollup index."""
+    with timer("agg.district.pincodes"):
+        pins = rollup.children(
+            (ctx.chosen_state, ctx.chosen_district), *rollup.window(*ctx.time_range),
+            cols=["activity_total", "age_0_5", "age_18_greater"],
+        )
+        pins = pins[pins["activity_total"] > 0].sort_values("activity_total", ascending=False)
+    if pins.empty:
+        st.info("No pincode-level activity for this district in the selected time range.")
+        return
+
+    c1, c2 = st.columns(2)
+    c1.metric("📮 Active Pincodes", f"{len(pins):,}")
+    c2.metric("🏙️ Top 5 Share of Activity", f"{pins['share'].head(5).sum()*100:.1f}%")
+
+    top = pins.head(15).assign(pincode=lambda d: d["pincode"].astype(str))
+
+    def build_pincodes():
+        fig = px.bar(
+            top,
+            x="activity_total",
+            y="pincode",
+            orientation="h",
+            title=f"Top Pincodes (Activity) — {ctx.chosen_district}",
+            labels={"activity_total": "Total Activity", "pincode": "Pincode"},
+        )
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            yaxis=dict(type="category", autorange="reversed"),
+        )
+        return fig
+
+    fig = ctx.figure("district.pincodes", build_pincodes)
+    ctx.chart("district.pincodes", fig, width="stretch")
@@ -0,0 +1,587 @@
+"""🇮🇳 India Overview: KPIs, choropleth, rankings, flow Sankey, hotspots, spatial clusters, trend, heatmap, movers, alerts."""
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from flows import fit_state_flows
+from loaders import (
+    load_alerts, load_geo_states, load_geojson, load_series_tiers, load_state_centroids, load_state_spatial,
+    table_csv,
+)
+from perf import timer
+from pipeline.names import to_geo_state
+from tiers import FREQ_NAMES
+from views import lazy_expander
+
+# Migration signals selectable in the heatmap and movers (pipeline/rolling.py)
+SIGNALS = {
+    "migration_index": "Migration Index (Z)",
+    "mi_roll3": "3-month Mean",
+    "mi_roll6": "6-month Mean",
+    "mi_roll12": "12-month Mean",
+    "mi_ewma": "EWMA (span 6)",
+    "mi_vol6": "6-month Volatility",
+}
+
+
+def signal_select(ctx, key):
+    """Selectbox over the signals the loaded state table provides."""
+    options = [c for c in SIGNALS if c in ctx.state_cube.mean_cols]
+    return st.selectbox("Signal", options, format_func=SIGNALS.get, key=key)
+
+
+def filters(ctx):
+    pass
+
+
+def render(ctx):
+    state_cube, win_lo, win_hi = ctx.state_cube, ctx.win_lo, ctx.win_hi
+
+    st.markdown("## 🗺️ India Overview: Migration & Urbanization Signals (Proxy)")
+
+    # KPIs
+    kpis = state_cube.kpis(win_lo, win_hi)
+    total_activity = kpis["total_activity"]
+    avg_growth = kpis["avg_growth"]
+    states_covered = kpis["states_covered"]
+    pos_pct = kpis["pos_pct"]
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("📌 Total Activity", f"{total_activity:,.0f}")
+    c2.metric("📌 States with + Migration Signal", f"{pos_pct:.1f}%")
+    c3.metric("📌 Avg Growth %", f"{avg_growth*100:.2f}%")
+    c4.metric("🗺️ States/UTs Covered", f"{states_covered}")
+
+    st.divider()
+
+    # Ranking table
+    state_summary = state_cube.state_summary(win_lo, win_hi)
+    rank = state_summary.sort_values("avg_migration", ascending=False)
+
+    # -----------------------------
+    # GEOJSON FIX (Missing states)
+    # -----------------------------
+    india_geo = load_geojson()
+    geo_states = load_geo_states()
+    # Dashboard names -> boundary-file NAME_1 (Odisha -> Orissa, ...),
+    # see pipeline/names.py
+    with timer("agg.overview.geo_names"):
+        rank["state_map"] = to_geo_state(rank["state"].astype(str), geo_states).to_numpy()
+
+    # Choropleth Map
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+    def build_map():
+        fig_map = px.choropleth(
+            rank,
+            geojson=india_geo,
+            locations="state_map",
+            featureidkey="properties.NAME_1",
+            color="avg_migration",
+            hover_name="state",
+            hover_data={"total_activity":":,.0f", "avg_growth":":.2%"},
+            color_continuous_scale="Turbo",
+            title="India Migration Inflow Signal (Proxy) — State Boundaries"
+        )
+
+        # BLACK outlines
+        fig_map.update_traces(
+            marker_line_width=1.2,
+            marker_line_color="rgba(0,0,0,1)"
+        )
+
+        # Remove white background
+        fig_map.update_geos(
+            fitbounds="locations",
+            visible=False,
+            bgcolor="rgba(0,0,0,0)",
+            showframe=False,
+            showcoastlines=False
+        )
+
+        fig_map.update_layout(
+            height=520,
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            margin=dict(l=0, r=0, t=50, b=0),
+            font=dict(color="#E6EAF2"),
+            coloraxis_colorbar=dict(
+                bgcolor="rgba(0,0,0,0)",
+                outlinecolor="rgba(0,245,255,0.35)"
+            )
+        )
+        return fig_map
+
+    ctx.defer_chart("overview.map", build_map, width="stretch", config={"scrollZoom": True})
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    st.divider()
+
+    # Top In vs Out migration
+    left, right = st.columns([0.55, 0.45])
+
+    with left:
+        st.markdown("### 🏆 Top In-Migration States (Proxy)")
+        def build_top_in():
+            fig_in = px.bar(
+                rank.head(12),
+                x="avg_migration",
+                y="state",
+                orientation="h",
+                title="Top Positive Migration Index (Z)"
+            )
+            fig_in.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                font=dict(color="#E6EAF2"),
+                height=420,
+                margin=dict(l=10, r=10, t=50, b=10)
+            )
+            return fig_in
+
+        ctx.defer_chart("overview.top_in", build_top_in, width="stretch")
+
+    with right:
+        st.markdown("### 📉 Top Out-Migration States (Proxy)")
+        def build_top_out():
+            fig_out = px.bar(
+                rank.tail(12).sort_values("avg_migration", ascending=True),
+                x="avg_migration",
+                y="state",
+                orientation="h",
+                title="Top Negative Migration Index (Z)"
+            )
+            fig_out.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                font=dict(color="#E6EAF2"),
+                height=420,
+                margin=dict(l=10, r=10, t=50, b=10)
+            )
+            return fig_out
+
+        ctx.defer_chart("overview.top_out", build_top_out, width="stretch")
+
+    st.divider()
+
+
+    st.divider()
+
+    # Below the fold: each section is computed and sent only while its
+    # expander is open (see views.lazy_expander).
+    box, is_open = lazy_expander("🔀 Migration Flow (Proxy): Source → Destination", key="lazy.overview.sankey")
+    with box:
+        if is_open:
+            sankey_section(ctx, state_summary)
+
+    box, is_open = lazy_expander("🌆 Urbanization Hotspots (High Activity + High Migration)",
+                                 key="lazy.overview.hotspots")
+    with box:
+        if is_open:
+            hotspots_section(ctx, rank)
+
+    box, is_open = lazy_expander("🧩 Spatial Clusters (Local Moran's I / Getis-Ord Gi*)",
+                                 key="lazy.overview.clusters")
+    with box:
+        if is_open:
+            clusters_section(ctx)
+
+    st.divider()
+
+    # India trend
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+    st.markdown("### 📆 India Trend")
+    tiers = load_series_tiers()["india"]
+    freq, india_trend = tiers.series((), *ctx.time_range)
+    resolution = "" if freq == tiers.base else f" ({FREQ_NAMES[freq]})"
+
+    def build_trend():
+        fig3 = px.line(india_trend, x=tiers.time_col, y="activity_total", markers=True)
+        fig3.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            title=f"India-wide Aadhaar Activity Trend{resolution}"
+        )
+        return fig3
+
+    ctx.defer_chart("overview.trend", build_trend, params=dict(freq=freq), width="stretch")
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.divider()
+
+    box, is_open = lazy_expander("🌡️ Migration Signal Heatmap (State × Month)", key="lazy.overview.heatmap")
+    with box:
+        if is_open:
+            heatmap_section(ctx)
+
+    box, is_open = lazy_expander("🚀 Top Movers (Month-on-Month Change)", key="lazy.overview.movers")
+    with box:
+        if is_open:
+            movers_section(ctx)
+
+    alerts = load_alerts()
+    if alerts is not None:
+        box, is_open = lazy_expander("🚨 Anomaly Alerts (Emerging Hotspots)", key="lazy.overview.alerts")
+        with box:
+            if is_open:
+                alerts_section(ctx, alerts)
+
+    st.info("⚠️ Migration Index is a proxy based on Aadhaar activity growth patterns (not individual tracking).")
+
+    st.markdown("### ⬇️ Download Clean Data")
+    st.download_button(
+        "Download State-Month CSV",
+        data=table_csv("state_month"),
+        file_name="dashboard_state_month.csv"
+    )
+    st.download_button(
+        "Download District-Month CSV",
+        data=table_csv("district_month"),
+        file_name="dashboard_district_month.csv"
+    )
+
+
+# Sankey section as a fragment: moving its TOP_N slider reruns only this
+# section, not the rest of the page.
+@st.fragment
+def sankey_section(ctx, state_summary):
+    st.caption(
+        "This Sankey shows a proxy flow model built from migration index signals: outflow states send to "
+        "inflow states in proportion to signal x activity, decaying with distance (gravity model). "
+        "It does NOT represent actual individual migration routes."
+    )
+
+    # 1) Prepare state-level migration signal
+    flow_rank = state_summary[["state", "avg_migration"]].rename(columns={"avg_migration": "mig"})
+
+    # Split into outflow (negative) and inflow (positive)
+    sources = flow_rank[flow_rank["mig"] < 0]
+    targets = flow_rank[flow_rank["mig"] > 0]
+
+    # If not enough data
+    if len(sources) < 2 or len(targets) < 2:
+        st.warning("Not enough variation in migration index to generate Sankey flow.")
+    else:
+        # Top-N corridors keep the Sankey readable (BONUS slider)
+        TOP_N = st.slider("Number of corridors in flow chart", 5, 40, 15)
+
+        # Gravity flows fitted to every state's margins, top corridors kept
+        with timer("agg.overview.flows"):
+            flows = fit_state_flows(state_summary, load_state_centroids(), k=TOP_N)
+            all_nodes, sankey_source, sankey_target, sankey_value = flows.sankey_links(TOP_N)
+
+        # Create Sankey nodes
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+        def build_sankey():
+            fig_sankey = go.Figure(
+                data=[
+                    go.Sankey(
+                        arrangement="snap",
+                        node=dict(
+                            pad=18,
+                            thickness=18,
+                            line=dict(color="rgba(0,0,0,0.8)", width=0.6),
+                            label=all_nodes,
+                            color="rgba(0,245,255,0.25)"
+                        ),
+                        link=dict(
+                            source=sankey_source,
+                            target=sankey_target,
+                            value=sankey_value,
+                            color="rgba(124,255,0,0.18)"
+                        ),
+                    )
+                ]
+            )
+
+            fig_sankey.update_layout(
+                title="Migration Flow Sankey (Proxy): Top Outflow → Inflow Corridors",
+                font=dict(color="#E6EAF2"),
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                height=650,
+                margin=dict(l=10, r=10, t=60, b=10),
+            )
+            return fig_sankey
+
+        # Fragment reruns have no flush_charts(), so draw directly
+        fig_sankey = ctx.figure("overview.sankey", build_sankey, top_n=TOP_N)
+        ctx.chart("overview.sankey", fig_sankey, width="stretch")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def hotspots_section(ctx, rank):
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+    def build_hotspots():
+        hotspots = rank.copy()
+        hotspots["growth_pct_num"] = hotspots["avg_growth"] * 100
+
+        fig_hot = px.scatter(
+            hotspots,
+            x="total_activity",
+            y="avg_migration",
+            size="total_activity",
+            color="growth_pct_num",
+            hover_name="state",
+            title="Urbanization Hotspots: Activity vs Migration Index",
+            labels={
+                "total_activity": "Total Activity",
+                "avg_migration": "Avg Migration Index (Z)",
+                "growth_pct_num": "Avg Growth %"
+            }
+        )
+
+        fig_hot.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            height=520
+        )
+        return fig_hot
+
+    ctx.defer_chart("overview.hotspots", build_hotspots, width="stretch")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+# LISA quadrants (spatial.py): value vs neighbourhood, "ns" = not significant
+CLUSTER_LABELS = {
+    "HH": "High-High (hotspot)",
+    "LL": "Low-Low (coldspot)",
+    "HL": "High-Low (outlier)",
+    "LH": "Low-High (outlier)",
+    "ns": "Not significant",
+}
+CLUSTER_COLORS = {
+    "High-High (hotspot)": "#FF3B3B",
+    "Low-Low (coldspot)": "#2F7BFF",
+    "High-Low (outlier)": "#FF9F1C",
+    "Low-High (outlier)": "#7FDBFF",
+    "Not significant": "rgba(120,130,150,0.35)",
+}
+SPATIAL_METRICS = {"migration": "Migration Index", "activity": "Aadhaar Activity (log)"}
+
+
+def clusters_section(ctx):
+    start, end = ctx.time_range
+    c1, c2 = st.columns(2)
+    metric = c1.radio("Signal", list(SPATIAL_METRICS), format_func=SPATIAL_METRICS.get, horizontal=True,
+                      key="overview.clusters.metric")
+    rule = c2.radio("Neighbours", ["queen", "rook"], format_func=lambda r: f"{r.title()} contiguity",
+                    horizontal=True, key="overview.clusters.rule")
+
+    stats = load_state_spatial(rule)
+    with timer("agg.overview.clusters"):
+        window = stats[(stats["metric"] == metric) & (stats["month"] >= start) & (stats["month"] <= end)]
+    if window.empty:
+        st.info("No months in the selected window.")
+        return
+    months = sorted(window["month"].unique(), reverse=True)
+    month = st.selectbox("Month", months, format_func=lambda m: f"{m:%b %Y}", key="overview.clusters.month")
+    cells = window[window["month"] == month].assign(
+        cluster_label=lambda d: d["cluster"].map(CLUSTER_LABELS)
+    )
+
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    india_geo = load_geojson("medium")
+
+    def build_clusters():
+        fig_clusters = px.choropleth(
+            cells,
+            geojson=india_geo,
+            locations="state_map",
+            featureidkey="properties.NAME_1",
+            color="cluster_label",
+            color_discrete_map=CLUSTER_COLORS,
+            category_orders={"cluster_label": list(CLUSTER_COLORS)},
+            hover_name="state",
+            hover_data={"state_map": False, "moran_i": ":.2f", "moran_p": ":.3f", "gi_z": ":.2f"},
+            labels={"cluster_label": "Cluster", "moran_i": "Local Moran's I", "moran_p": "p", "gi_z": "Gi* (z)"},
+            title=f"{SPATIAL_METRICS[metric]} Clusters — {month:%b %Y}",
+        )
+        fig_clusters.update_traces(marker_line_width=1.0, marker_line_color="rgba(0,0,0,1)")
+        fig_clusters.update_geos(fitbounds="locations", visible=False, bgcolor="rgba(0,0,0,0)")
+        fig_clusters.update_layout(
+            height=520,
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            margin=dict(l=0, r=0, t=50, b=0),
+            font=dict(color="#E6EAF2"),
+        )
+        return fig_clusters
+
+    ctx.defer_chart("overview.clusters", build_clusters, params=dict(metric=metric, rule=rule, month=str(month)),
+                    width="stretch")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    hot = cells[cells["gi_p"] < 0.05].sort_values("gi_z", ascending=False)
+    if hot.empty:
+        st.info("No significant Gi* hot or cold spots this month.")
+    else:
+        st.dataframe(
+            hot[["state", "value", "gi_z", "gi_p", "cluster_label"]].rename(columns={
+                "value": SPATIAL_METRICS[metric].replace(" (log)", ""),
+                "gi_z": "Gi* (z)", "gi_p": "p", "cluster_label": "Cluster",
+            }),
+            hide_index=True,
+            width="stretch",
+        )
+    st.caption(
+        "Gi* > 0: the state and its neighbours are jointly high (a hotspot); < 0: jointly low. "
+        "Clusters mark states whose local Moran's I is significant (p < 0.05); islands have no neighbours "
+        "and are not scored. Significance is not adjusted for testing every state."
+    )
+
+
+def heatmap_section(ctx):
+    state_cube, win_lo, win_hi = ctx.state_cube, ctx.win_lo, ctx.win_hi
+
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    signal = signal_select(ctx, "overview.heatmap.signal")
+
+    def build_heatmap():
+        heat_pivot = state_cube.heatmap(win_lo, win_hi, col=signal)
+        fig_heat = px.imshow(
+            heat_pivot,
+            aspect="auto",
+            title=f"{SIGNALS[signal]} Heatmap — State vs Month",
+        )
+
+        fig_heat.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            height=650,
+            margin=dict(l=10, r=10, t=60, b=10)
+        )
+        return fig_heat
+
+    ctx.defer_chart("overview.heatmap", build_heatmap, params=dict(signal=signal), width="stretch")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def movers_section(ctx):
+    state_cube, win_lo, win_hi = ctx.state_cube, ctx.win_lo, ctx.win_hi
+
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    signal = signal_select(ctx, "overview.movers.signal")
+
+    latest_month, mom_latest = state_cube.movers(win_lo, win_hi, col=signal)
+
+    top_gainers = mom_latest.sort_values("mom_change", ascending=False).head(10)
+    top_losers = mom_latest.sort_values("mom_change", ascending=True).head(10)
+
+    colA, colB = st.columns(2)
+
+    with colA:
+        st.markdown("#### 🟢 Fastest Rising States")
+        def build_gainers():
+            fig_gain = px.bar(
+                top_gainers,
+                x="mom_change",
+                y="state",
+                orientation="h",
+                title=f"Top Gainers — {SIGNALS[signal]}, {latest_month.date()}",
+            )
+            fig_gain.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                font=dict(color="#E6EAF2"),
+                height=420,
+                margin=dict(l=10, r=10, t=60, b=10)
+            )
+            return fig_gain
+
+        ctx.defer_chart("overview.gainers", build_gainers, params=dict(signal=signal), width="stretch")
+
+    with colB:
+        st.markdown("#### 🔴 Fastest Falling States")
+        def build_losers():
+            fig_lose = px.bar(
+                top_losers.sort_values("mom_change", ascending=True),
+                x="mom_change",
+                y="state",
+                orientation="h",
+                title=f"Top Losers — {SIGNALS[signal]}, {latest_month.date()}",
+            )
+            fig_lose.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                font=dict(color="#E6EAF2"),
+                height=420,
+                margin=dict(l=10, r=10, t=60, b=10)
+            )
+            return fig_lose
+
+        ctx.defer_chart("overview.losers", build_losers, params=dict(signal=signal), width="stretch")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    st.caption("MoM change shows sudden spikes/drops in migration signal (proxy). Useful for detecting emerging hotspots.")
+
+
+# Alert kinds from pipeline/anomaly.py
+ALERT_KINDS = {
+    "robust": "Spike vs 12-month median",
+    "seasonal": "Unusual year-over-year change",
+    "shift": "Level shift (last 3 months)",
+}
+
+
+def alerts_section(ctx, alerts):
+    start, end = ctx.time_range
+    level = st.radio("Level", ["state", "district"], format_func=str.title, horizontal=True,
+                     key="overview.alerts.level")
+    with timer("agg.overview.alerts"):
+        window = alerts[
+            (alerts["level"] == level) & (alerts["month"] >= start) & (alerts["month"] <= end)
+        ]
+
+    if window.empty:
+        st.info("No anomalies flagged in the selected window.")
+        return
+
+    latest = window["month"].max()
+    latest_alerts = window[window["month"] == latest]
+    c1, c2, c3 = st.columns(3)
+    c1.metric("🚨 Alerts in Window", f"{len(window):,}")
+    c2.metric(f"📅 Alerts in {latest.date()}", f"{len(latest_alerts):,}")
+    c3.metric("📈 Rising / 📉 Falling", f"{(window['direction'] == 'up').sum()} / {(window['direction'] == 'down').sum()}")
+
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+    def build_alert_counts():
+        counts = (
+            window.groupby(["month", "kind"], observed=True).size()
+            .rename("alerts").reset_index()
+        )
+        counts["kind"] = counts["kind"].astype(str).map(ALERT_KINDS)
+        fig_alerts = px.bar(
+            counts, x="month", y="alerts", color="kind",
+            title=f"Flagged {level.title()} × Month Cells by Test",
+        )
+        fig_alerts.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2"),
+            height=380,
+            margin=dict(l=10, r=10, t=60, b=10),
+        )
+        return fig_alerts
+
+    ctx.defer_chart("overview.alerts", build_alert_counts, params=dict(level=level), width="stretch")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    cols = ["month", "state", "district", "metric", "kind", "direction", "value", "baseline", "score"]
+    if level == "state":
+        cols.remove("district")
+    top = window.sort_values(["score", "month"], ascending=False).head(25)[cols]
+    st.dataframe(top, hide_index=True, width="stretch")
+    st.caption(
+        "Each cell is scored against its own history: robust z vs the trailing 12-month median/MAD, "
+        "year-over-year change vs its usual seasonal swing, and a 3-month mean-shift test. "
+        "Score = strongest |z| / threshold (3.5); rebuilt by `python -m pipeline alerts`."
+    )
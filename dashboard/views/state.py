@@ -0,0 +1,191 @@
+"""🏙️ State Deep Dive: one state's trend, top districts and proxy flow."""
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from flows import fit_state_flows
+from loaders import load_rollup_index, load_series_tiers, load_state_centroids
+from perf import timer
+from tiers import FREQ_NAMES
+
+
+def filters(ctx):
+    with st.sidebar.expander("🏙️ State Filter", expanded=True):
+        states = sorted(ctx.state_df_f["state"].dropna().unique())
+        ctx.chosen_state = st.selectbox("Select State/UT", states)
+
+
+def render(ctx):
+    state_cube, win_lo, win_hi = ctx.state_cube, ctx.win_lo, ctx.win_hi
+    state_df_f = ctx.state_df_f
+    chosen_state = ctx.chosen_state
+
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+
+    st.subheader("🏙️ State Deep Dive")
+
+    if chosen_state is None:
+        st.info("Select a state from the sidebar.")
+        st.stop()
+
+    with timer("agg.state.select"):
+        s_df = state_df_f[state_df_f["state"] == chosen_state]
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("📊 Total Activity", f"{s_df['activity_total'].sum():,.0f}")
+    c2.metric("📌 Avg Migration Index", f"{s_df['migration_index'].mean():.2f}")
+    c3.metric("📈 Avg Growth %", f"{(s_df['growth_pct'].mean()*100):.2f}%")
+
+    st.divider()
+
+    tiers = load_series_tiers()["state"]
+    freq, trend = tiers.series(chosen_state, *ctx.time_range)
+    resolution = "" if freq == tiers.base else f" ({FREQ_NAMES[freq]})"
+
+    def build_trend():
+        fig = px.line(
+            trend,
+            x=tiers.time_col,
+            y="activity_total",
+            markers=True,
+            title=f"{chosen_state}: Activity Trend{resolution}"
+        )
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2")
+        )
+        return fig
+
+    fig = ctx.figure("state.trend", build_trend, freq=freq)
+    ctx.chart("state.trend", fig, width="stretch")
+
+    st.markdown("### 📍 Top Districts by Activity")
+    with timer("agg.state.top_districts"):
+        rollup = load_rollup_index()
+        d_rank = (
+            rollup.children((chosen_state,), *rollup.window(*ctx.time_range), cols=["activity_total"])
+            .rename(columns={"activity_total": "total_activity"})
+            .query("total_activity > 0")
+            .sort_values("total_activity", ascending=False)
+            .head(15)
+        )
+
+    def build_top_districts():
+        fig2 = px.bar(
+            d_rank,
+            x="total_activity",
+            y="district",
+            orientation="h",
+            title="Top Districts (Activity)"
+        )
+        fig2.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#E6EAF2")
+        )
+        return fig2
+
+    fig2 = ctx.figure("state.top_districts", build_top_districts)
+    ctx.chart("state.top_districts", fig2, width="stretch")
+    
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+
+
+    st.divider()
+    st.markdown("### 🔀 State Migration Flow (Proxy)")
+    st.caption(
+        "This Sankey shows a proxy origin/destination flow around the selected state using migration index signals, "
+        "from a gravity model of all states (signal x activity, decaying with distance). "
+        "It does NOT represent actual person-level migration routes."
+    )
+
+    state_summary = state_cube.state_summary(win_lo, win_hi)
+    flow_rank = state_summary[["state", "avg_migration"]].rename(columns={"avg_migration": "mig"})
+
+    # --- Selected state value ---
+    selected_row = flow_rank[flow_rank["state"] == chosen_state]
+    if selected_row.empty:
+        st.warning("Selected state not found in dataset.")
+        st.stop()
+
+    selected_mig = float(selected_row["mig"].iloc[0])
+
+    # --- Build sources & targets ---
+    sources = flow_rank[flow_rank["mig"] < 0]
+    targets = flow_rank[flow_rank["mig"] > 0]
+
+    TOP_N = st.slider("Number of connected states", 5, 30, 10)
+
+    # --- If all mig values are 0 (or too small) ---
+    if sources.empty and targets.empty:
+        st.warning("⚠️ Sankey cannot be generated because migration_index values are mostly 0 in this time window.")
+        st.info("Try expanding the time range or check if migration_index column has positive/negative values.")
+        st.stop()
+
+    # --- Build links: the selected state's row / column of the national fit ---
+    with timer("agg.state.flows"):
+        flows = fit_state_flows(state_summary, load_state_centroids(), k=TOP_N)
+    if selected_mig < 0:
+        # Outflow proxy: selected -> positive states
+        if targets.empty:
+            st.warning("No positive migration states found to connect.")
+            st.stop()
+
+        nodes, flow_source, flow_target, flow_value = flows.sankey_links(TOP_N, source=chosen_state)
+        title_flow = f"Outflow Proxy: {chosen_state} → Top Inflow States"
+
+    else:
+        # Inflow proxy: negative states -> selected
+        if sources.empty:
+            st.warning("No negative migration states found to connect.")
+            st.stop()
+        if not selected_mig > 0:
+            st.warning("Selected state has no migration signal in this time window.")
+            st.stop()
+
+        nodes, flow_source, flow_target, flow_value = flows.sankey_links(TOP_N, target=chosen_state)
+        title_flow = f"Inflow Proxy: Top Outflow States → {chosen_state}"
+
+    # --- Build Sankey ---
+    def build_flow():
+        fig_state_flow = go.Figure(
+        data=[
+            go.Sankey(
+                arrangement="snap",
+                node=dict(
+                    pad=18,
+                    thickness=18,
+                    line=dict(color="rgba(0,0,0,1)", width=0.8),
+                    label=nodes,
+
+                    # ✅ Neon cyan nodes (like your theme)
+                    color="rgba(0,245,255,0.22)",
+                ),
+                link=dict(
+                    source=flow_source,
+                    target=flow_target,
+                    value=flow_value,
+
+                    # ✅ Neon green flow (like your theme)
+                    color="rgba(124,255,0,0.22)",
+                ),
+            )
+        ]
+        )
+
+        fig_state_flow.update_layout(
+            title=title_flow,
+            font=dict(color="#E6EAF2"),
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            height=520,
+            margin=dict(l=10, r=10, t=60, b=10),
+        )
+        return fig_state_flow
+
+    fig_state_flow = ctx.figure("state.flow", build_flow, top_n=TOP_N)
+    ctx.chart("state.flow", fig_state_flow, width="stretch")
@@ -0,0 +1,50 @@
+"""
+ETL for the dashboard tables.
+
+Turns the raw merged UIDAI extract (uidai_merged_clean.csv) into the
+state x month, district x month and pincode x month tables the dashboard
+reads. Replaces the aggregation cells of
+notebook/UIDAI_Migration_Urbanization_Analysis.ipynb.
+
+    python -m pipeline build  --raw uidai_merged_clean.csv
+    python -m pipeline append --raw uidai_2026_01.csv
+    python -m pipeline build  --raw uidai_merged_clean.csv --workers 0   # every core
+    python -m pipeline verify     # incremental state metrics == full rebuild
+    python -m pipeline alerts     # rescore the anomaly alerts table
+
+Aggregates are kept as per-month partitions under data/partitions/, so a
+new month only aggregates its own raw rows; the dashboard CSVs are then
+re-exported from the partitions.
+"""
+from pipeline.aggregate import (
+    aggregate_district_month, aggregate_pincode_month, aggregate_stream, derive_district_metrics,
+    derive_state_metrics, state_from_district, update_state_metrics,
+)
+from pipeline.anomaly import build_alerts
+from pipeline.build import append, build, export, verify_state_metrics, write_alerts
+from pipeline.clean import clean_names, clean_raw
+from pipeline.parallel import aggregate_parallel
+from pipeline.reader import iter_raw_chunks
+from pipeline.rolling import ROLLING_COLS, derive_rolling
+
+__all__ = [
+    "ROLLING_COLS",
+    "aggregate_district_month",
+    "aggregate_parallel",
+    "aggregate_pincode_month",
+    "aggregate_stream",
+    "append",
+    "build",
+    "build_alerts",
+    "clean_names",
+    "clean_raw",
+    "derive_district_metrics",
+    "derive_rolling",
+    "derive_state_metrics",
+    "export",
+    "iter_raw_chunks",
+    "state_from_district",
+    "update_state_metrics",
+    "verify_state_metrics",
+    "write_alerts",
+]
@@ -0,0 +1,148 @@
+"""Group-by aggregation and the derived migration columns."""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pipeline.schema import COUNT_COLS, DISTRICT_KEYS, PINCODE_KEYS, STATE_KEYS
+
+AGG = {c: (c, "sum") for c in COUNT_COLS}
+
+
+def aggregate_pincode_month(df):
+    """Raw rows (or partial sums) -> month x state x district x pincode sums."""
+    return df.groupby(PINCODE_KEYS, as_index=False).agg(**AGG)
+
+
+def aggregate_district_month(df):
+    """Raw rows (or pincode sums) -> month x state x district sums."""
+    return df.groupby(DISTRICT_KEYS, as_index=False).agg(**AGG)
+
+
+def fold_partial(running, partial):
+    """Merge two partial month x state x district x pincode sum tables."""
+    if running is None:
+        return partial
+    return aggregate_pincode_month(pd.concat([running, partial], ignore_index=True))
+
+
+def aggregate_stream(chunks):
+    """
+    Fold per-chunk partial sums into one running pincode-level aggregate.
+    Only the current chunk and the running table (one row per
+    month/state/district/pincode key) are held, so memory is bounded by the
+    number of keys, not by input size. Counts are whole numbers, so the
+    result equals a one-shot groupby.
+    """
+    running = None
+    for chunk in chunks:
+        running = fold_partial(running, aggregate_pincode_month(chunk))
+    if running is None:
+        return pd.DataFrame(columns=PINCODE_KEYS + COUNT_COLS)
+    return running
+
+
+def state_from_district(district_month):
+    """District sums -> month x state sums (counts are whole numbers, so exact)."""
+    return district_month.groupby(STATE_KEYS, as_index=False).agg(**AGG)
+
+
+def safe_zscore(s):
+    with warnings.catch_warnings():
+        # all-NaN months (e.g. the first one) are expected
+        warnings.simplefilter("ignore", RuntimeWarning)
+        std = np.nanstd(s)
+    if std == 0 or np.isnan(std):
+        return np.nan
+    return (s - np.nanmean(s)) / std
+
+
+def derive_state_metrics(state_month):
+    """
+    Add prev_activity, growth_pct and migration_index exactly as the notebook
+    does: previous row per state (months sorted), growth vs that row, and a
+    per-month z-score of growth across states.
+    """
+    sm = state_month[STATE_KEYS + COUNT_COLS].sort_values(["state", "month"]).copy()
+    sm["prev_activity"] = sm.groupby("state")["activity_total"].shift(1)
+    sm["growth_pct"] = np.where(
+        sm["prev_activity"] > 0,
+        (sm["activity_total"] - sm["prev_activity"]) / sm["prev_activity"],
+        np.nan,
+    )
+    sm["migration_index"] = sm.groupby("month")["growth_pct"].transform(safe_zscore)
+    return sm
+
+
+def update_state_metrics(derived, new_sums):
+    """
+    Incremental derive_state_metrics. `derived` is the stored state table
+    (sums + derived columns), `new_sums` the month x state sums of the
+    months being added or replaced. Returns the derived rows of only the
+    months whose values can change: the new months, plus every month that
+    holds a state's next row after one of them (its prev_activity moves).
+    Older rows are not recomputed; the rows returned equal those of
+    derive_state_metrics on the combined sums, bit for bit.
+    """
+    touched = set(new_sums["month"].unique())
+    old = derived[~derived["month"].isin(touched)] if len(derived) else derived
+    sums = pd.concat(
+        [old[STATE_KEYS + COUNT_COLS] if len(old) else None, new_sums[STATE_KEYS + COUNT_COLS]],
+        ignore_index=True,
+    ).sort_values(["state", "month"], ignore_index=True)
+
+    # Each state's previous row (in month order) before and after the update
+    after = sums.groupby("state")["month"].shift(1)
+    affected = touched | set(sums.loc[after.isin(touched), "month"])
+    if len(derived):
+        before = derived[STATE_KEYS].sort_values(["state", "month"])
+        prev_before = before.groupby("state")["month"].shift(1)
+        affected |= set(before.loc[prev_before.isin(touched), "month"]) - touched
+
+    # Derive only the affected months, from their rows and each row's predecessor
+    sm = sums[STATE_KEYS + COUNT_COLS].copy()
+    sm["prev_activity"] = sm.groupby("state")["activity_total"].shift(1)
+    sm = sm[sm["month"].isin(affected)].copy()
+    sm["growth_pct"] = np.where(
+        sm["prev_activity"] > 0,
+        (sm["activity_total"] - sm["prev_activity"]) / sm["prev_activity"],
+        np.nan,
+    )
+    # Same state order within each month as the full derivation, so the
+    # z-score sums run in the same order.
+    sm["migration_index"] = sm.groupby("month")["growth_pct"].transform(safe_zscore)
+    return sm
+
+
+def group_zscore(df, col, by):
+    """
+    safe_zscore of `col` within each `by` group, with cythonized group
+    means and (population) standard deviations instead of a Python call per
+    group. Groups with a zero or undefined spread give NaN.
+    """
+    grouped = df.groupby(by, observed=True, sort=False)[col]
+    mean = grouped.transform("mean").to_numpy(dtype=np.float64, na_value=np.nan)
+    std = grouped.transform("std", ddof=0).to_numpy(dtype=np.float64, na_value=np.nan)
+    vals = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(std > 0, (vals - mean) / std, np.nan)
+
+
+def derive_district_metrics(district_month):
+    """
+    District counterpart of derive_state_metrics, in one grouped pass:
+    prev_activity and growth_pct per district (previous row in month
+    order), migration_index as the per-month z-score of growth across the
+    districts of the same state, and migration_index_national across all
+    districts.
+    """
+    dm = district_month[DISTRICT_KEYS + COUNT_COLS].sort_values(["state", "district", "month"], ignore_index=True)
+    dm["prev_activity"] = dm.groupby(["state", "district"], observed=True)["activity_total"].shift(1)
+    dm["growth_pct"] = np.where(
+        dm["prev_activity"] > 0,
+        (dm["activity_total"] - dm["prev_activity"]) / dm["prev_activity"],
+        np.nan,
+    )
+    dm["migration_index"] = group_zscore(dm, "growth_pct", ["month", "state"])
+    dm["migration_index_national"] = group_zscore(dm, "growth_pct", ["month"])
+    return dm
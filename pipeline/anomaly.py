@@ -0,0 +1,205 @@
+"""
+Batch anomaly / hotspot scoring over the state x month and district x month
+panels.
+
+Each metric (log activity, migration index) is laid out as a dense
+(region, month) matrix, NaN where a region has no row, and every cell is
+scored at once:
+
+    robust_z     against the median / MAD of the region's previous 12 months
+    seasonal_z   year-over-year change against the region's previous 12
+                 year-over-year changes, scored the same way
+    shift_z      mean of the last 3 months against the median of the 12
+                 months before them (a two-window mean-shift change-point
+                 statistic)
+
+Trailing windows come from sliding_window_view over the month axis, and
+medians are read from the sorted windows (NaN sorts last) instead of
+np.nanmedian, so a whole panel is a handful of NumPy sorts and reductions.
+Each region's MAD is shrunk towards that month's cross-sectional median
+scale, and the z denominators include the baseline median's own variance,
+so short, noisy histories don't raise false alarms. No window reaches past
+the cell being scored, so a cell scores the same whether or not newer months
+exist. A cell is an alert when any |z| reaches its threshold; `score` is
+the largest |z| / threshold and `kind` the test that produced it.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+HISTORY = 12        # months in the robust baseline
+MIN_HISTORY = 6     # non-NaN months needed for a baseline
+PRIOR = 12          # weight (in months) of the cross-sectional scale
+SEASON = 12
+SHIFT_RECENT = 3
+THRESHOLDS = {"robust": 3.5, "seasonal": 3.5, "shift": 3.5}
+
+# metric -> (source column, transform)
+METRICS = {
+    "activity": ("activity_total", np.log1p),
+    "migration": ("migration_index", None),
+}
+
+ALERT_COLS = [
+    "level", "state", "district", "month", "metric", "value", "baseline",
+    "robust_z", "seasonal_z", "shift_z", "score", "kind", "direction",
+]
+
+
+def panel(df, keys):
+    """(region keys frame, months, (row -> region, row -> month)) of a long table."""
+    codes = df.groupby(keys, sort=True, observed=True).ngroup().to_numpy()
+    first = np.unique(codes, return_index=True)[1]
+    regions = df[keys].iloc[first].astype(str).reset_index(drop=True)
+    months = np.sort(df["month"].unique())
+    return regions, months, (codes, pd.Index(months).get_indexer(df["month"]))
+
+
+def matrix(df, col, shape, cells, transform=None):
+    """Dense (regions, months) matrix of `col`, NaN where a region has no row."""
+    mat = np.full(shape, np.nan)
+    vals = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    mat[cells] = transform(vals) if transform is not None else vals
+    return mat
+
+
+def _rows(cells, shape):
+    """(regions, months) matrix of the table row behind each cell."""
+    rows = np.zeros(shape, dtype=np.int64)
+    rows[cells] = np.arange(len(cells[0]))
+    return rows
+
+
+def trailing(mat, width, lag=1):
+    """(regions, months, width) view of each cell's `width` months ending `lag` months before it."""
+    pad = np.full((mat.shape[0], width + lag - 1), np.nan)
+    padded = np.concatenate([pad, mat], axis=1)
+    return sliding_window_view(padded, width, axis=1)[:, :mat.shape[1]]
+
+
+def _median(win, n):
+    """Median over the last axis of `win`, whose rows hold `n` non-NaN values."""
+    srt = np.sort(win, axis=-1)   # NaN sorts last
+    lo = np.maximum(n - 1, 0) // 2
+    hi = np.maximum(n // 2, lo)
+    pick = np.take_along_axis(srt, np.stack([lo, hi], axis=-1), axis=-1)
+    return np.where(n > 0, pick.mean(axis=-1), np.nan)
+
+
+def robust_baseline(win, min_count=MIN_HISTORY):
+    """
+    (median, robust scale, count) of each trailing window; median and scale
+    are NaN when fewer than `min_count` values or no spread.
+
+    A MAD from a dozen points is itself noisy, so each region's scale is
+    shrunk towards the median scale of all regions that month:
+    sqrt((n * s**2 + PRIOR * pooled**2) / (n + PRIOR)).
+    """
+    ok = ~np.isnan(win)
+    n = ok.sum(axis=-1)
+    med = _median(win, n)
+    dev = np.abs(win - med[..., None])
+    # n / (n - 0.8): small-sample consistency factor of the MAD
+    scale = 1.4826 * _median(dev, n) * n / np.maximum(n - 0.8, 0.2)
+    mean_dev = np.where(ok, dev, 0.0).sum(axis=-1) / np.maximum(n, 1)
+    scale = np.where(scale > 0, scale, 1.2533 * mean_dev)
+    good = (n >= min_count) & (scale > 0)
+    scale = np.where(good, scale, np.nan)
+
+    valid = ~np.isnan(scale)
+    pooled = _median(np.where(valid, scale, np.nan).T, valid.sum(axis=0))[None, :]
+    scale = np.sqrt((n * scale ** 2 + PRIOR * pooled ** 2) / (n + PRIOR))
+    return np.where(good, med, np.nan), scale, n
+
+
+def _lag(a, k):
+    """`a` shifted k months later along the month axis (NaN / 0 where undefined)."""
+    out = np.full(a.shape, np.nan if a.dtype.kind == "f" else 0, dtype=a.dtype)
+    out[:, k:] = a[:, :a.shape[1] - k]
+    return out
+
+
+def _z(x, med, scale, n):
+    """(x - med) / standard error, counting the baseline median's own variance (~ pi/2 * s**2 / n)."""
+    return (x - med) / (scale * np.sqrt(1.0 + (np.pi / 2) / np.maximum(n, 1)))
+
+
+def score_matrix(mat):
+    """Per-cell (baseline, robust_z, seasonal_z, shift_z) for one metric panel."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        med, scale, n = robust_baseline(trailing(mat, HISTORY))
+        robust_z = _z(mat, med, scale, n)
+
+        # Year-over-year change; skipped where last year's value was itself
+        # an outlier, which would otherwise echo as a seasonal alert.
+        last_year = np.full(mat.shape, np.nan)
+        last_year[:, SEASON:] = np.where(
+            np.abs(robust_z[:, :-SEASON]) >= THRESHOLDS["robust"], np.nan, mat[:, :-SEASON]
+        )
+        yoy = mat - last_year
+        y_med, y_scale, y_n = robust_baseline(trailing(yoy, HISTORY))
+        seasonal_z = _z(yoy, y_med, y_scale, y_n)
+
+        # Mean of the last SHIFT_RECENT months against the median of the
+        # HISTORY months before them, which is the robust baseline of the
+        # first of those months.
+        recent = trailing(mat, SHIFT_RECENT, lag=0)
+        ok = ~np.isnan(recent)
+        n_recent = ok.sum(axis=-1)
+        recent_mean = np.where(ok, recent, 0.0).sum(axis=-1) / np.maximum(n_recent, 1)
+        b_med, b_scale, n_base = (_lag(a, SHIFT_RECENT - 1) for a in (med, scale, n))
+        se = b_scale * np.sqrt(1.0 / np.maximum(n_recent, 1) + (np.pi / 2) / np.maximum(n_base, 1))
+        shift_z = np.where(n_recent >= 2, (recent_mean - b_med) / se, np.nan)
+    return med, robust_z, seasonal_z, shift_z
+
+
+def detect(df, keys, level):
+    """Alert rows (ALERT_COLS) for every flagged (region, month, metric) of one panel."""
+    df = df.dropna(subset=keys + ["month"]).reset_index(drop=True)
+    frames = []
+    tests = list(THRESHOLDS)
+    limits = np.array([THRESHOLDS[t] for t in tests])
+    regions, months, cells = panel(df, keys)
+    for metric, (col, transform) in METRICS.items():
+        if col not in df.columns:
+            continue
+        mat = matrix(df, col, (len(regions), len(months)), cells, transform)
+        baseline, robust_z, seasonal_z, shift_z = score_matrix(mat)
+
+        z = np.stack([robust_z, seasonal_z, shift_z])            # (tests, regions, months)
+        ratio = np.abs(z) / limits[:, None, None]
+        ratio[np.isnan(ratio)] = -np.inf
+        score = ratio.max(axis=0)
+        r, m = np.nonzero(score >= 1)
+        if not len(r):
+            continue
+        best = ratio.argmax(axis=0)[r, m]
+        value = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[_rows(cells, mat.shape)[r, m]]
+        base = baseline[r, m] if transform is None else np.expm1(baseline[r, m])
+        frames.append(pd.DataFrame({
+            "level": level,
+            "state": regions["state"].to_numpy()[r],
+            "district": regions["district"].to_numpy()[r] if "district" in regions else None,
+            "month": months[m],
+            "metric": metric,
+            "value": value,
+            "baseline": base,
+            "robust_z": robust_z[r, m],
+            "seasonal_z": seasonal_z[r, m],
+            "shift_z": shift_z[r, m],
+            "score": score[r, m],
+            "kind": np.array(tests)[best],
+            "direction": np.where(z[best, r, m] > 0, "up", "down"),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=ALERT_COLS)
+    return pd.concat(frames, ignore_index=True)[ALERT_COLS]
+
+
+def build_alerts(state_month, district_month):
+    """The alerts table for both panels, strongest first within each month."""
+    alerts = pd.concat(
+        [detect(state_month, ["state"], "state"), detect(district_month, ["state", "district"], "district")],
+        ignore_index=True,
+    )
+    return alerts.sort_values(["month", "score"], ascending=[True, False], ignore_index=True)
@@ -0,0 +1,220 @@
+"""Full and incremental builds of the partitioned tables + CSV export."""
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipeline import partitions
+from pipeline.aggregate import (
+    aggregate_district_month, aggregate_pincode_month, aggregate_stream, derive_district_metrics,
+    derive_state_metrics, state_from_district, update_state_metrics,
+)
+from pipeline.anomaly import build_alerts
+from pipeline.clean import to_month
+from pipeline.names import merge_district_variants
+from pipeline.parallel import aggregate_parallel
+from pipeline.reader import DEFAULT_CHUNKSIZE, iter_raw_chunks
+from pipeline.rolling import ROLLING_COLS, derive_rolling
+from pipeline.schema import (
+    ALERTS_CSV, COUNT_COLS, DATA_DIR, DERIVED_COLS, DISTRICT_CSV, DISTRICT_DERIVED_COLS, DISTRICT_KEYS, PINCODE_CSV,
+    PINCODE_KEYS, STATE_CSV, STATE_KEYS,
+)
+
+PINCODE = "pincode_month"
+DISTRICT = "district_month"
+STATE = "state_month"
+
+
+def _aggregate_raw(raw_path, chunksize, months=None, date_format=None, streaming=True, workers=1):
+    """
+    Raw file -> month x state x district x pincode sums. Streaming folds
+    chunk partials with bounded memory, across `workers` processes when more
+    than one; otherwise all rows are loaded and grouped at once.
+    """
+    if streaming and workers != 1:
+        return aggregate_parallel(raw_path, workers, chunksize, months=months, date_format=date_format)
+    chunks = iter_raw_chunks(raw_path, chunksize, months=months, date_format=date_format)
+    if streaming:
+        return aggregate_stream(chunks)
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame(columns=PINCODE_KEYS + COUNT_COLS)
+    return aggregate_pincode_month(pd.concat(chunks, ignore_index=True))
+
+
+def _write_months(data_dir, table, df, months):
+    for m in months:
+        part = df[df["month"] == m]
+        partitions.write_partition(data_dir, table, m, part.reset_index(drop=True))
+
+
+def derive_state(state_sums):
+    """Month x state sums -> the full state table (derived + rolling columns)."""
+    return derive_rolling(derive_state_metrics(state_sums), ["state"])
+
+
+def derive_district(district_month):
+    """Merged month x state x district sums -> the district table with derived + rolling columns."""
+    return derive_rolling(derive_district_metrics(district_month), ["state", "district"])
+
+
+def _refresh_state(data_dir, touched):
+    """
+    Update the state table after `touched` months changed: derive growth and
+    migration_index only for the touched months and, per state, the next
+    month after one (whose prev_activity moves), then step the rolling
+    columns forward from the earliest of those. Appending a new latest
+    month therefore rewrites just that month's partition.
+    """
+    stored = partitions.read_partitions(data_dir, STATE)
+    new_sums = state_from_district(partitions.read_partitions(data_dir, DISTRICT, touched))
+    derived = update_state_metrics(stored, new_sums)
+
+    start = min(set(derived["month"]) | set(touched))
+    if len(stored) and not set(ROLLING_COLS) <= set(stored.columns):
+        start = min(start, stored["month"].min())   # partitions from before the rolling columns
+    history = stored[stored["month"] < start] if len(stored) else None
+    later = stored[(stored["month"] >= start) & ~stored["month"].isin(derived["month"])] if len(stored) else None
+    rows = pd.concat([later, derived], ignore_index=True) if later is not None else derived
+    rows = derive_rolling(rows[STATE_KEYS + COUNT_COLS + DERIVED_COLS], ["state"], history=history)
+
+    dirty = sorted(set(rows["month"]) | set(touched))
+    _write_months(data_dir, STATE, rows, dirty)
+    return dirty
+
+
+def verify_state_metrics(data_dir=DATA_DIR):
+    """
+    Compare the stored state partitions (derived and rolling columns) with a
+    full re-derivation from the district partitions. Returns the months whose derived columns differ in
+    any bit (an empty list when the incremental updates match).
+    """
+    stored = partitions.read_partitions(data_dir, STATE)
+    full = derive_state(state_from_district(partitions.read_partitions(data_dir, DISTRICT)))
+    cmp = full.merge(stored, on=STATE_KEYS, how="outer", suffixes=("", "_stored"), indicator=True)
+    bad = set(cmp.loc[cmp["_merge"] != "both", "month"])
+    cmp = cmp[cmp["_merge"] == "both"]
+    for col in DERIVED_COLS + ROLLING_COLS:
+        a = cmp[col].to_numpy(dtype=np.float64)
+        b = cmp[f"{col}_stored"].to_numpy(dtype=np.float64)
+        bad.update(cmp.loc[a.view(np.int64) != b.view(np.int64), "month"])
+    return sorted(bad)
+
+
+def build(raw_path, data_dir=DATA_DIR, chunksize=DEFAULT_CHUNKSIZE, date_format=None, streaming=True,
+          workers=1):
+    """
+    Rebuild every partition from the full raw file, then export the CSVs.
+    `workers` > 1 (or None for every core) shards the raw file across
+    processes.
+    """
+    pincode_month = _aggregate_raw(
+        raw_path, chunksize, date_format=date_format, streaming=streaming, workers=workers
+    )
+    district_month = aggregate_district_month(pincode_month)
+    months = sorted(district_month["month"].unique())
+
+    for table in (PINCODE, DISTRICT, STATE):
+        partitions.clear(data_dir, table)
+    _write_months(data_dir, PINCODE, pincode_month, months)
+    _write_months(data_dir, DISTRICT, district_month, months)
+    _write_months(data_dir, STATE, derive_state(state_from_district(district_month)), months)
+    export(data_dir)
+    return months
+
+
+def append(raw_path, data_dir=DATA_DIR, months=None, chunksize=DEFAULT_CHUNKSIZE, date_format=None,
+           streaming=True, workers=1):
+    """
+    Aggregate only the months present in `raw_path` (or just `months`),
+    replace those partitions, refresh the dependent state columns and
+    re-export the CSVs. Seeds the partitions from the current CSVs first
+    if none exist yet. Raises ValueError, before writing anything, when a
+    requested month has no rows in `raw_path`.
+    """
+    if not partitions.list_months(data_dir, DISTRICT):
+        seed_from_csv(data_dir)
+
+    months = None if months is None else list(to_month(months))
+    pincode_month = _aggregate_raw(
+        raw_path, chunksize, months=months, date_format=date_format, streaming=streaming, workers=workers
+    )
+    district_month = aggregate_district_month(pincode_month)
+    touched = sorted(district_month["month"].unique())
+    # An empty partition would silently replace the stored month
+    missing = sorted(set(months) - set(touched)) if months is not None else []
+    if missing:
+        raise ValueError(f"{raw_path} has no rows for months: {', '.join(f'{m:%Y-%m}' for m in missing)}")
+    _write_months(data_dir, PINCODE, pincode_month, touched)
+    _write_months(data_dir, DISTRICT, district_month, touched)
+    rewritten = _refresh_state(data_dir, touched)
+    export(data_dir)
+    return touched, rewritten
+
+
+def seed_from_csv(data_dir=DATA_DIR):
+    """
+    Split the exported CSVs back into partitions (bootstrap for `append`).
+    The pincode tier is only seeded when its CSV was exported too.
+    """
+    # round_trip: read back exactly the floats that were exported
+    dist = pd.read_csv(os.path.join(data_dir, DISTRICT_CSV), parse_dates=["month"], float_precision="round_trip")
+    state = pd.read_csv(os.path.join(data_dir, STATE_CSV), parse_dates=["month"], float_precision="round_trip")
+    if not set(ROLLING_COLS) <= set(state.columns):
+        state = derive_rolling(state, ["state"])
+    dist = dist[DISTRICT_KEYS + COUNT_COLS]   # derived columns are re-derived on export
+    _write_months(data_dir, DISTRICT, dist, sorted(dist["month"].unique()))
+    _write_months(data_dir, STATE, state, sorted(state["month"].unique()))
+    pin_path = os.path.join(data_dir, PINCODE_CSV)
+    if os.path.exists(pin_path):
+        pin = pd.read_csv(pin_path, parse_dates=["month"])
+        _write_months(data_dir, PINCODE, pin, sorted(pin["month"].unique()))
+
+
+def export(data_dir=DATA_DIR):
+    """
+    Write the dashboard CSVs (same layout as the notebook produced, plus the
+    derived columns). District spelling variants are merged here, across
+    every partition, and the district metrics are then derived from the
+    merged table in one vectorized pass (their z-scores compare districts
+    within a month, so they are not kept per partition). The pincode CSV is
+    written when every month has a pincode partition. The alerts table is
+    rescored from the exported tables.
+    """
+    dist = partitions.read_partitions(data_dir, DISTRICT)
+    dist = merge_district_variants(dist, COUNT_COLS, DISTRICT_KEYS)
+    dist = derive_district(dist).sort_values(DISTRICT_KEYS)
+    state = partitions.read_partitions(data_dir, STATE).sort_values(["state", "month"])
+    dist[COUNT_COLS] = dist[COUNT_COLS].astype("float64")
+    state[COUNT_COLS] = state[COUNT_COLS].astype("float64")
+    dist[DISTRICT_KEYS + COUNT_COLS + DISTRICT_DERIVED_COLS + ROLLING_COLS].to_csv(
+        os.path.join(data_dir, DISTRICT_CSV), index=False
+    )
+    state[STATE_KEYS + COUNT_COLS + DERIVED_COLS + ROLLING_COLS].to_csv(
+        os.path.join(data_dir, STATE_CSV), index=False
+    )
+
+    # Only a pincode tier that covers every month is exported, so it always
+    # rolls up to the district table (seeded partitions may lack it).
+    pin_months = partitions.list_months(data_dir, PINCODE)
+    if pin_months and pin_months == partitions.list_months(data_dir, DISTRICT):
+        pin = partitions.read_partitions(data_dir, PINCODE)
+        pin = merge_district_variants(pin, COUNT_COLS, PINCODE_KEYS).sort_values(PINCODE_KEYS)
+        pin[COUNT_COLS] = pin[COUNT_COLS].astype("float64")
+        pin[PINCODE_KEYS + COUNT_COLS].to_csv(os.path.join(data_dir, PINCODE_CSV), index=False)
+
+    write_alerts(data_dir, state, dist)
+
+
+def write_alerts(data_dir=DATA_DIR, state=None, dist=None):
+    """
+    Score every state and district month (see pipeline.anomaly) and write the
+    alerts CSV. Reads the exported CSVs unless the tables are passed in.
+    """
+    if state is None:
+        state = pd.read_csv(os.path.join(data_dir, STATE_CSV), parse_dates=["month"])
+    if dist is None:
+        dist = pd.read_csv(os.path.join(data_dir, DISTRICT_CSV), parse_dates=["month"])
+    alerts = build_alerts(state, dist)
+    alerts.to_csv(os.path.join(data_dir, ALERTS_CSV), index=False)
+    return alerts
@@ -0,0 +1,53 @@
+"""Vectorized name cleaning (replaces the row-by-row `clean_text` .apply)."""
+import numpy as np
+import pandas as pd
+
+from pipeline.names import canonical_states, clean_districts
+from pipeline.schema import UNKNOWN_PINCODE, VALID_STATES
+
+
+def clean_names(s):
+    """
+    Same result as the notebook's `s.apply(clean_text)`: strip, "&" -> "and",
+    collapse whitespace, title case. The string work runs once per distinct
+    value and is broadcast back through the factorized codes.
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=False)
+    u = pd.Series(uniques, dtype=object).map(str)
+    u = (
+        u.str.strip()
+        .str.replace("&", "and", regex=False)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .str.title()
+    )
+    return pd.Series(u.to_numpy(dtype=object)[codes], index=s.index, name=s.name)
+
+
+def clean_raw(df):
+    """
+    Canonicalize state names (see pipeline.names), clean district spellings,
+    make pincodes int32 (UNKNOWN_PINCODE when missing or not a 6-digit code)
+    and drop non-State/UT rows. District variants are merged at export,
+    once the whole table is known.
+    """
+    df = df.copy()
+    df["state"] = canonical_states(df["state"])
+    df["district"] = clean_districts(df["district"])
+    if "pincode" in df.columns:
+        pin = pd.to_numeric(df["pincode"], errors="coerce")
+        df["pincode"] = pin.where(pin.between(100000, 999999), UNKNOWN_PINCODE).astype(np.int32)
+    else:
+        df["pincode"] = np.int32(UNKNOWN_PINCODE)
+    return df[df["state"].isin(VALID_STATES)]
+
+
+def add_month(df, date_format=None):
+    df["date"] = pd.to_datetime(df["date"], errors="coerce", format=date_format)
+    df["month"] = df["date"].dt.to_period("M").dt.to_timestamp()
+    return df[df["month"].notna()]
+
+
+def to_month(values):
+    """Normalize month labels ("2025-03", "2025-03-01", Timestamps) to month starts."""
+    return pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(values))).to_period("M").to_timestamp()
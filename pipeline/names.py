@@ -0,0 +1,258 @@
+"""
+State / district name canonicalization, shared by the ETL and the dashboard.
+
+Raw extracts have tens of millions of rows but only thousands of distinct
+spellings, so every function here factorizes its input, resolves each
+distinct string once (memoized across calls) and broadcasts the result back
+through the integer codes.
+
+- States resolve through a fixed alias table (case, "&", punctuation,
+  old names such as Orissa / Uttaranchal / Pondicherry).
+- Districts are cleaned per string (dashes, mojibake, trailing "*", known
+  transliterations such as Bagpat / Baghpat), then spellings that only
+  differ in spacing or punctuation (Ahmed Nagar / Ahmednagar,
+  Janjgir - Champa / Janjgir-Champa) are merged within their state under
+  one display name.
+- `to_geo_state` maps dashboard names onto the boundary file's NAME_1
+  values, which still use older names for some States/UTs.
+"""
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from pipeline.schema import VALID_STATES
+
+
+def normalize_key(name):
+    """Lower-case, "&" -> "and", punctuation dropped, whitespace collapsed."""
+    n = str(name).lower().replace("&", " and ")
+    n = re.sub(r"[^a-z0-9 ]+", " ", n)
+    return " ".join(n.split())
+
+
+def clean_text(name):
+    """The notebook's original cleaning: strip, "&" -> "and", collapse spaces, title."""
+    n = str(name).strip().replace("&", "and")
+    return " ".join(n.split()).title()
+
+
+def _isna(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+# -----------------------------
+# States / UTs
+# -----------------------------
+# Variant spelling -> canonical name (matched on normalize_key)
+STATE_ALIASES = {
+    "andaman and nicobar": "Andaman and Nicobar Islands",
+    "andaman nicobar islands": "Andaman and Nicobar Islands",
+    "a and n islands": "Andaman and Nicobar Islands",
+    "dadra and nagar haveli": "Dadra and Nagar Haveli and Daman and Diu",
+    "daman and diu": "Dadra and Nagar Haveli and Daman and Diu",
+    "dadra nagar haveli": "Dadra and Nagar Haveli and Daman and Diu",
+    "the dadra and nagar haveli and daman and diu": "Dadra and Nagar Haveli and Daman and Diu",
+    "nct of delhi": "Delhi",
+    "delhi nct": "Delhi",
+    "new delhi": "Delhi",
+    "orissa": "Odisha",
+    "pondicherry": "Puducherry",
+    "uttaranchal": "Uttarakhand",
+    "chhatisgarh": "Chhattisgarh",
+    "tamilnadu": "Tamil Nadu",
+    "westbengal": "West Bengal",
+    "west bangal": "West Bengal",
+    "jammu kashmir": "Jammu and Kashmir",
+}
+
+_STATE_LOOKUP = {normalize_key(s): s for s in VALID_STATES}
+_STATE_LOOKUP.update(STATE_ALIASES)
+
+# Canonical name -> NAME_1 in india_states.geojson (older census naming).
+# Ladakh was carved out of J&K after the boundary file was drawn.
+GEO_STATE_ALIASES = {
+    "Andaman and Nicobar Islands": "Andaman and Nicobar",
+    "Dadra and Nagar Haveli and Daman and Diu": "Dadra and Nagar Haveli",
+    "Puducherry": "Pondicherry",
+    "Odisha": "Orissa",
+    "Uttarakhand": "Uttaranchal",
+    "Ladakh": "Jammu and Kashmir",
+}
+
+_cache_lock = threading.Lock()
+_state_cache = {}
+_district_cache = {}
+
+
+def canonical_state(name):
+    """Canonical State/UT name, or the cleaned spelling when unknown."""
+    if name is None:
+        return np.nan
+    key = normalize_key(name)
+    return _STATE_LOOKUP.get(key) or _STATE_LOOKUP.get(key.replace(" ", "")) or clean_text(name)
+
+
+def _map_unique(s, fn, cache):
+    # factorize -> resolve only unseen distinct values -> broadcast via codes
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes, uniques = s.cat.codes.to_numpy(), s.cat.categories
+        codes = np.where(codes < 0, len(uniques), codes)
+        uniques = list(uniques) + [np.nan]
+    else:
+        codes, uniques = pd.factorize(s, use_na_sentinel=False)
+    uniques = [None if _isna(u) else u for u in uniques]
+    with _cache_lock:
+        missing = [u for u in uniques if u not in cache]
+    if missing:
+        resolved = {u: fn(u) for u in missing}
+        with _cache_lock:
+            cache.update(resolved)
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [cache[u] for u in uniques]
+    return mapped, codes
+
+
+def canonical_states(s):
+    """Vectorized canonical_state over a Series (object, string or categorical)."""
+    mapped, codes = _map_unique(s, canonical_state, _state_cache)
+    return pd.Series(mapped[codes], index=s.index, name=s.name)
+
+
+def to_geo_state(names, geo_names=None):
+    """
+    Dashboard state names -> boundary-file NAME_1. When the set of NAME_1
+    values is given, a name that already exists there is kept as is.
+    """
+    def resolve(n):
+        if geo_names is not None and n in geo_names:
+            return n
+        return GEO_STATE_ALIASES.get(n, n)
+    names = pd.Series(names)
+    uniques = names.unique()
+    lookup = {u: resolve(canonical_state(u)) for u in uniques}
+    return names.map(lookup)
+
+
+# -----------------------------
+# Districts
+# -----------------------------
+# Transliteration / renamed-district variants -> preferred spelling
+# (matched on district_key, so spacing and punctuation don't matter).
+DISTRICT_ALIASES = {
+    "Ahmadabad": "Ahmedabad", "Ahmadnagar": "Ahmednagar", "Anantapur": "Ananthapuramu",
+    "Ananthapur": "Ananthapuramu", "Anugal": "Angul", "Anugul": "Angul", "Boudh": "Baudh", "Bagpat": "Baghpat", "Baleswar": "Baleshwar",
+    "Barddhaman": "Bardhaman", "Buldana": "Buldhana", "Bulandshahar": "Bulandshahr",
+    "Chamrajanagar": "Chamarajanagar", "Chamrajnagar": "Chamarajanagar",
+    "Chatrapati Sambhaji Nagar": "Chhatrapati Sambhajinagar", "Chickmagalur": "Chikkamagaluru",
+    "Chikmagalur": "Chikkamagaluru", "Chittaurgarh": "Chittorgarh", "Davangere": "Davanagere",
+    "East Midnapur": "East Midnapore", "East Singhbum": "East Singhbhum",
+    "Gaurella Pendra Marwahi": "Gaurela-Pendra-Marwahi", "Gondia": "Gondiya", "Hardwar": "Haridwar",
+    "Hasan": "Hassan", "Hazaribag": "Hazaribagh", "Hooghiy": "Hooghly",
+    "Jagatsinghapur": "Jagatsinghpur", "Jajapur": "Jajpur", "Jalor": "Jalore", "Jangoan": "Jangaon",
+    "Jhunjhunun": "Jhunjhunu", "K.V. Rangareddy": "Rangareddy", "Kancheepuram": "Kanchipuram",
+    "Kanniyakumari": "Kanyakumari", "Kasargod": "Kasaragod", "Khorda": "Khordha",
+    "Kodarma": "Koderma", "Lahul And Spiti": "Lahaul And Spiti", "Mahbubnagar": "Mahabubnagar",
+    "Mahrajganj": "Maharajganj", "Maldah": "Malda", "Mammit": "Mamit",
+    "Mohalla-Manpur-Ambagarh Chowki": "Mohla-Manpur-Ambagarh Chouki",
+    "Nabarangapur": "Nabarangpur", "Nicobar": "Nicobars", "Pakaur": "Pakur", "Palamau": "Palamu",
+    "Purba Champaran": "East Champaran", "Purbi Champaran": "East Champaran",
+    "Puruliya": "Purulia", "Ramanagar": "Ramanagara", "Sahebganj": "Sahibganj",
+    "Samstipur": "Samastipur", "Sheikpura": "Sheikhpura", "Shrawasti": "Shravasti", "Sonapur": "Subarnapur",
+    "Sundergarh": "Sundargarh", "Thiruvallur": "Tiruvallur", "Thiruvarur": "Tiruvarur",
+    "Tirupattur": "Tirupathur", "Tumkur": "Tumakuru", "Viluppuram": "Villupuram",
+    "Visakhapatanam": "Visakhapatnam",
+    "24 Paraganas North": "North 24 Parganas", "24 Paraganas South": "South 24 Parganas",
+    "North Twenty Four Parganas": "North 24 Parganas",
+    "South Twenty Four Parganas": "South 24 Parganas", "South 24 Pargana": "South 24 Parganas",
+}
+
+_DASHES = re.compile(r"[‐-―−]")
+_JOINERS = re.compile(r"(?<=[A-Za-z])\s*(?:\?|â\W*)\s*(?=[A-Za-z])")
+_HYPHEN_SPACING = re.compile(r"\s*-\s*")
+_TRAILING_MARK = re.compile(r"[\s*]+$")
+_JUNK = re.compile(r"[^A-Za-z0-9 .\-'()]")
+
+
+def clean_district(name):
+    """Per-string district cleanup: dashes, mojibake joiners, "*" marks, title case."""
+    if name is None:
+        return np.nan
+    n = str(name).strip().replace("&", "and")
+    n = _DASHES.sub("-", n)
+    n = _JOINERS.sub("-", n)
+    n = " ".join(n.split())
+    n = _HYPHEN_SPACING.sub("-", n)
+    n = _TRAILING_MARK.sub("", n).title()
+    return _DISTRICT_LOOKUP.get(district_key(n), n)
+
+
+def district_key(name):
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+_DISTRICT_LOOKUP = {district_key(k): v for k, v in DISTRICT_ALIASES.items()}
+
+
+def _display_rank(name):
+    # Prefer clean characters, fewer spaces (Ahmednagar over Ahmed Nagar),
+    # explicit hyphens (Janjgir-Champa), then the shorter / alphabetical one.
+    return (bool(_JUNK.search(name)), name.count(" "), -name.count("-"), len(name), name)
+
+
+def clean_districts(s):
+    """Vectorized clean_district over a Series."""
+    mapped, codes = _map_unique(s, clean_district, _district_cache)
+    return pd.Series(mapped[codes], index=s.index, name=s.name)
+
+
+def canonical_districts(states, districts):
+    """
+    Canonical district names for aligned state / district Series. Spelling
+    variants of the same district within a state collapse to one display
+    name, chosen deterministically from the variants present, so call it on
+    a whole table rather than on chunks.
+    """
+    cleaned, d_codes = _map_unique(districts, clean_district, _district_cache)
+    s_codes, _ = pd.factorize(pd.Series(np.asarray(states, dtype=object)), use_na_sentinel=False)
+
+    width = len(cleaned) + 1
+    p_codes, p_uniques = pd.factorize(s_codes.astype(np.int64) * width + d_codes)
+    p_state, p_name = p_uniques // width, cleaned[p_uniques % width]
+    p_key = [None if _isna(n) else district_key(n) for n in p_name]
+
+    best = {}
+    for st, key, name in zip(p_state, p_key, p_name):
+        if key is None:
+            continue
+        cur = best.get((st, key))
+        if cur is None or _display_rank(name) < _display_rank(cur):
+            best[(st, key)] = name
+    display = np.empty(len(p_name), dtype=object)
+    display[:] = [name if key is None else best[(st, key)] for st, key, name in zip(p_state, p_key, p_name)]
+    return pd.Series(display[p_codes], index=districts.index, name=districts.name)
+
+
+def merge_district_variants(df, count_cols, keys=("month", "state", "district"), derive=None):
+    """
+    Canonicalize a district table's names and sum rows that now share a key.
+    Every other column is kept: rows that merged get NaN there (values such
+    as ratios cannot be summed), and when anything merged the table is
+    passed through `derive`, if given, to recompute them from the sums.
+    """
+    df = df.copy()
+    df["state"] = canonical_states(df["state"])
+    df["district"] = canonical_districts(df["state"], df["district"])
+    keys = list(keys)
+    if not df.duplicated(keys).any():
+        return df
+    grouped = df.groupby(keys, sort=False, dropna=False, observed=True)
+    for col in count_cols:
+        df[col] = grouped[col].transform("sum", min_count=1)
+    other = [c for c in df.columns if c not in keys and c not in count_cols]
+    if other:
+        merged = grouped[keys[0]].transform("size").to_numpy() > 1
+        df.loc[merged, other] = np.nan
+    df = df.drop_duplicates(keys, ignore_index=True)
+    return derive(df) if derive is not None else df
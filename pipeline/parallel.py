@@ -0,0 +1,103 @@
+"""
+Multi-process aggregation of the raw extract.
+
+The raw CSV is cut into byte ranges aligned to line starts, one shard per
+worker. Every worker parses, cleans and folds its own range into partial
+month x state x district x pincode sums (the same streaming fold as the serial path),
+so the parent only merges a few small partial tables. Counts are whole
+numbers, which makes the merged sums exact and independent of shard order.
+The derived state columns are computed afterwards in the usual cheap pass.
+
+Assumes one record per line (no quoted newlines), as in the UIDAI extract.
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pipeline.aggregate import aggregate_pincode_month, aggregate_stream
+from pipeline.reader import DEFAULT_CHUNKSIZE, clean_chunks, open_raw
+from pipeline.schema import COUNT_COLS, PINCODE_KEYS
+
+MIN_SHARD_BYTES = 16 * 1024 * 1024
+
+
+class _RangeFile(io.RawIOBase):
+    """Read-only file view of `header` followed by bytes [start, end) of `path`."""
+
+    def __init__(self, path, start, end, header):
+        self._f = open(path, "rb")
+        self._f.seek(start)
+        self._left = end - start
+        self._head = header
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        if self._head:
+            n = min(len(buf), len(self._head))
+            buf[:n] = self._head[:n]
+            self._head = self._head[n:]
+            return n
+        if self._left <= 0:
+            return 0
+        data = self._f.read(min(len(buf), self._left))
+        self._left -= len(data)
+        buf[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+def shard_ranges(path, n):
+    """Split `path` after its header into <= n byte ranges that start on a line."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.readline()
+        body = f.tell()
+        cuts = [body]
+        for i in range(1, n):
+            f.seek(max(body + (size - body) * i // n - 1, cuts[-1]))
+            f.readline()
+            pos = f.tell()
+            if cuts[-1] < pos < size:
+                cuts.append(pos)
+    cuts.append(size)
+    return header, [(a, b) for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+
+
+def aggregate_shard(path, start, end, header, chunksize=DEFAULT_CHUNKSIZE, months=None, date_format=None):
+    """Partial month x state x district x pincode sums for one byte range (runs in a worker)."""
+    with io.BufferedReader(_RangeFile(path, start, end, header), buffer_size=1 << 20) as buf:
+        return aggregate_stream(clean_chunks(open_raw(buf, chunksize), months, date_format))
+
+
+def aggregate_parallel(path, workers=None, chunksize=DEFAULT_CHUNKSIZE, months=None, date_format=None,
+                       min_shard_bytes=MIN_SHARD_BYTES):
+    """
+    Raw file -> month x state x district x pincode sums using up to `workers`
+    processes (default: every core). Small files use fewer shards, since
+    each needs at least `min_shard_bytes` to pay for its process.
+    """
+    workers = workers or os.cpu_count() or 1
+    n = max(1, min(workers, os.path.getsize(path) // max(min_shard_bytes, 1)))
+    header, ranges = shard_ranges(path, n)
+    if len(ranges) <= 1:
+        partials = [aggregate_shard(path, a, b, header, chunksize, months, date_format) for a, b in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [
+                pool.submit(aggregate_shard, path, a, b, header, chunksize, months, date_format)
+                for a, b in ranges
+            ]
+            partials = [f.result() for f in futures]
+    partials = [p for p in partials if len(p)]
+    if not partials:
+        return pd.DataFrame(columns=PINCODE_KEYS + COUNT_COLS)
+    if len(partials) == 1:
+        return partials[0]
+    return aggregate_pincode_month(pd.concat(partials, ignore_index=True))
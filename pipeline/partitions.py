@@ -0,0 +1,47 @@
+"""
+Per-month Parquet partitions of the aggregated tables.
+
+    data/partitions/<table>/month=YYYY-MM.parquet
+
+Each file holds one month of one table, so re-ingesting or appending a month
+rewrites exactly that file.
+"""
+import glob
+import os
+import shutil
+
+import pandas as pd
+
+
+def table_dir(data_dir, table):
+    return os.path.join(data_dir, "partitions", table)
+
+
+def partition_path(data_dir, table, month):
+    return os.path.join(table_dir(data_dir, table), f"month={pd.Timestamp(month):%Y-%m}.parquet")
+
+
+def list_months(data_dir, table):
+    paths = glob.glob(os.path.join(table_dir(data_dir, table), "month=*.parquet"))
+    stems = [os.path.basename(p)[len("month="):-len(".parquet")] for p in paths]
+    return sorted(pd.Timestamp(s + "-01") for s in stems)
+
+
+def write_partition(data_dir, table, month, df):
+    path = partition_path(data_dir, table, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def read_partitions(data_dir, table, months=None):
+    months = list_months(data_dir, table) if months is None else months
+    frames = [pd.read_parquet(partition_path(data_dir, table, m)) for m in months]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def clear(data_dir, table):
+    shutil.rmtree(table_dir(data_dir, table), ignore_errors=True)
@@ -0,0 +1,44 @@
+"""Chunked reader for the raw merged UIDAI CSV."""
+import pandas as pd
+
+from pipeline.clean import add_month, clean_raw
+from pipeline.schema import COUNT_COLS, OPTIONAL_RAW_COLS, RAW_COLS
+
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def iter_raw_chunks(path, chunksize=DEFAULT_CHUNKSIZE, months=None, date_format=None):
+    """
+    Yield cleaned raw chunks with a `month` column.
+
+    Only the columns the aggregation needs are parsed; counts are read as
+    float64 (as in the merged extract, which has gaps). When `months` is
+    given, rows from other months are dropped as each chunk is read, so an
+    incremental run only holds the months it is rebuilding.
+    """
+    return clean_chunks(open_raw(path, chunksize), months, date_format)
+
+
+def open_raw(path_or_buffer, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Chunked pandas reader over the raw columns the aggregation needs.
+    OPTIONAL_RAW_COLS (pincode) may be absent, as in older extracts.
+    """
+    return pd.read_csv(
+        path_or_buffer,
+        usecols=lambda c: c in RAW_COLS,
+        dtype={"state": str, "district": str, "pincode": "float64", **{c: "float64" for c in COUNT_COLS}},
+        chunksize=chunksize,
+    )
+
+
+def clean_chunks(reader, months=None, date_format=None):
+    for chunk in reader:
+        missing = [c for c in RAW_COLS if c not in chunk.columns and c not in OPTIONAL_RAW_COLS]
+        if missing:
+            raise ValueError(f"raw extract is missing columns: {missing}")
+        chunk = add_month(chunk, date_format)
+        if months is not None:
+            chunk = chunk[chunk["month"].isin(months)]
+        if len(chunk):
+            yield clean_raw(chunk)
@@ -0,0 +1,97 @@
+"""
+Rolling / smoothed migration-index signals, updated one month at a time.
+
+Per key (state, or state + district), over that key's rows in month order
+(the same row-based notion of "previous" as prev_activity):
+
+    mi_roll3 / mi_roll6 / mi_roll12   mean of the last 3 / 6 / 12 values
+    mi_ewma                           exponentially weighted mean (span 6)
+    mi_vol6                           standard deviation of the last 6 values
+
+NaN values are skipped (a window of only NaN gives NaN, the volatility
+needs two values), as in groupby().rolling(w, min_periods=1).mean(),
+.rolling(6, min_periods=2).std() and .ewm(span=6, adjust=False,
+ignore_na=True).mean(). The windows come from lagged copies of the column
+(one grouped shift per lag), so every key is handled in one pass. A new
+month needs only each key's last 11 values and its previous mi_ewma, both
+read back from the stored rows, so appending a month costs O(keys)
+regardless of history length; a full build does the same arithmetic per
+row, so both paths produce identical values.
+"""
+import numpy as np
+import pandas as pd
+
+ROLL_WINDOWS = (3, 6, 12)
+VOL_WINDOW = 6
+EWMA_SPAN = 6
+EWMA_ALPHA = 2.0 / (EWMA_SPAN + 1)
+
+ROLLING_COLS = [f"mi_roll{w}" for w in ROLL_WINDOWS] + ["mi_ewma", f"mi_vol{VOL_WINDOW}"]
+HISTORY = max(ROLL_WINDOWS + (VOL_WINDOW,)) - 1
+
+
+def _window_stats(mat):
+    """NaN-skipping mean and sample std of each row of `mat`."""
+    ok = ~np.isnan(mat)
+    n = ok.sum(axis=1)
+    vals = np.where(ok, mat, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n > 0, vals.sum(axis=1) / np.maximum(n, 1), np.nan)
+        dev = np.where(ok, mat - mean[:, None], 0.0)
+        std = np.where(n > 1, np.sqrt((dev * dev).sum(axis=1) / np.maximum(n - 1, 1)), np.nan)
+    return mean, std
+
+
+def derive_rolling(df, keys, col="migration_index", history=None):
+    """
+    Add ROLLING_COLS to every row of `df`, in one grouped pass over all keys.
+    `history` holds stored rows (with ROLLING_COLS) from before the first
+    month of `df`, for appends; None starts from scratch.
+    """
+    keys = list(keys)
+    past = None
+    if history is not None and len(history):
+        past = history.sort_values(keys + ["month"]).groupby(keys, observed=True, sort=False).tail(HISTORY)
+    rows = pd.concat(
+        [past[keys + ["month", col, "mi_ewma"]] if past is not None else None, df[keys + ["month", col]]],
+        keys=["past", "new"], names=["part", "pos"],
+    ).reset_index(level="part")
+    rows["pos"] = np.r_[np.full(len(rows) - len(df), -1), np.arange(len(df))]
+    rows = rows.sort_values(keys + ["month"], kind="stable", ignore_index=True)
+
+    # Right-aligned (n, HISTORY + 1) matrix per row: the key's earlier values, then its own
+    grouped = rows.groupby(keys, observed=True, sort=False)[col]
+    window = np.empty((len(rows), HISTORY + 1))
+    for lag in range(HISTORY + 1):
+        window[:, HISTORY - lag] = grouped.shift(lag).to_numpy(dtype=np.float64, na_value=np.nan)
+
+    out = {}
+    for w in ROLL_WINDOWS:
+        out[f"mi_roll{w}"], _ = _window_stats(window[:, -w:])
+    _, out[f"mi_vol{VOL_WINDOW}"] = _window_stats(window[:, -VOL_WINDOW:])
+
+    # The EWMA is a recurrence along each key's rows; step all keys at once,
+    # one row position at a time (rows are sorted by key, so a row's
+    # predecessor is the row above it).
+    x = window[:, -1]
+    ewma = np.full(len(rows), np.nan)
+    is_new = (rows["part"] == "new").to_numpy()
+    if not is_new.all():
+        ewma[~is_new] = rows.loc[~is_new, "mi_ewma"].to_numpy(dtype=np.float64, na_value=np.nan)
+    nth = rows.groupby(keys, observed=True, sort=False).cumcount().to_numpy()
+    for k in range(int(nth.max()) + 1 if len(rows) else 0):
+        at = np.flatnonzero(is_new & (nth == k))
+        prev = ewma[at - 1] if k else np.full(len(at), np.nan)
+        ewma[at] = np.where(
+            np.isnan(x[at]), prev,
+            np.where(np.isnan(prev), x[at], (1 - EWMA_ALPHA) * prev + EWMA_ALPHA * x[at]),
+        )
+    out["mi_ewma"] = ewma
+
+    # Back to the row order of `df`
+    pos = rows["pos"].to_numpy()
+    order = np.argsort(np.where(is_new, pos, -1), kind="stable")[len(rows) - len(df):]
+    result = df.reset_index(drop=True).copy()
+    for c in ROLLING_COLS:
+        result[c] = out[c][order]
+    return result
@@ -0,0 +1,40 @@
+"""Column sets and reference lists shared by the pipeline steps."""
+import os
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+
+COUNT_COLS = [
+    "activity_total", "enrol_total", "demo_total", "bio_total",
+    "age_0_5", "age_5_17", "age_18_greater",
+]
+DERIVED_COLS = ["prev_activity", "growth_pct", "migration_index"]
+DISTRICT_DERIVED_COLS = DERIVED_COLS + ["migration_index_national"]
+
+RAW_COLS = ["date", "state", "district", "pincode"] + COUNT_COLS
+# Older extracts have no pincode; their rows go under UNKNOWN_PINCODE.
+OPTIONAL_RAW_COLS = ["pincode"]
+
+PINCODE_KEYS = ["month", "state", "district", "pincode"]
+DISTRICT_KEYS = ["month", "state", "district"]
+STATE_KEYS = ["month", "state"]
+
+# Rows without a usable pincode keep their counts under this code, so the
+# pincode tier still sums to the district totals.
+UNKNOWN_PINCODE = 0
+
+STATE_CSV = "dashboard_state_month.csv"
+DISTRICT_CSV = "dashboard_district_month.csv"
+PINCODE_CSV = "dashboard_pincode_month.csv"
+ALERTS_CSV = "dashboard_alerts.csv"
+
+# Official States/UTs; anything else left after cleaning is junk.
+VALID_STATES = {
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh", "Goa", "Gujarat",
+    "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka", "Kerala", "Madhya Pradesh",
+    "Maharashtra", "Manipur", "Meghalaya", "Mizoram", "Nagaland", "Odisha", "Punjab", "Rajasthan",
+    "Sikkim", "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand", "West Bengal",
+    "Delhi", "Jammu and Kashmir", "Ladakh",
+    "Andaman and Nicobar Islands", "Chandigarh",
+    "Dadra and Nagar Haveli and Daman and Diu", "Lakshadweep", "Puducherry",
+}